@@ -12,6 +12,7 @@ Requirements:
 
 import asyncio
 import argparse
+import os
 import sys
 from pathlib import Path
 from typing import Optional
@@ -21,14 +22,21 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.telegram_multi.config import TranslationConfig
 from src.telegram_multi.translator import TranslatorFactory, register_builtin_providers
-from src.telegram_multi.message_interceptor import MessageInterceptor
+from src.telegram_multi.message_interceptor import (
+    DRAFT_BINDING,
+    MessageInterceptor,
+    NEW_MESSAGES_BINDING,
+    TRANSLATE_BINDING,
+    parse_page_messages,
+)
+from src.telegram_multi.batching import BatchScheduler
 from src.telegram_multi.settings import settings
 
 # Register providers
 register_builtin_providers()
 
 from src.telegram_multi.pages.telegram_web import TelegramWebPage
-from src.telegram_multi.automation.auto_responder import AutoResponder, ResponseRule, Message, MessageType
+from src.telegram_multi.automation.auto_responder import AutoResponder, ResponseRule, MessageType
 from src.telegram_multi.automation.contact_manager import ContactManager
 
 
@@ -69,35 +77,41 @@ async def launch_instance(
         tg_page = TelegramWebPage(page)
 
         # --- Auto-Reply Logic ---
-        async def handle_new_message(source, msg_data):
+        # The page delivers message events in batches (one per frame)
+        async def handle_new_message(source, events):
             if not auto_responder:
                 return
 
-            # Convert dict to Message object
+            # One validation pass for the whole batch
             try:
-                msg = Message(
-                    message_type=MessageType.INCOMING if msg_data['type'] == 'incoming' else MessageType.OUTGOING,
-                    content=msg_data['content'],
-                    sender=msg_data['sender'],
-                    timestamp=msg_data['timestamp']
-                )
-                
+                messages = parse_page_messages(events)
+            except Exception as e:
+                print(f"[{instance_id}] Error in auto-reply: {e}")
+                return
+
+            for msg in messages:
                 # Only reply to incoming messages
-                if msg.message_type == MessageType.INCOMING:
+                if msg.message_type != MessageType.INCOMING:
+                    continue
+                try:
                     result = auto_responder.auto_reply(msg)
                     if result:
                         reply_text, delay = result
                         print(f"[{instance_id}] Auto-replying to '{msg.content}' in {delay:.1f}s: {reply_text}")
-                        
+
                         # 1. Mark as read (optional, but requested)
                         await tg_page.mark_as_read()
-                        
+
                         # 2. Type and send with random delay
                         await tg_page.type_and_send_human_like(reply_text, delay_override=delay)
-            except Exception as e:
-                print(f"[{instance_id}] Error in auto-reply: {e}")
+                except Exception as e:
+                    print(f"[{instance_id}] Error in auto-reply: {e}")
 
-        await context.expose_binding("onNewMessage", handle_new_message)
+        await context.expose_binding(NEW_MESSAGES_BINDING, handle_new_message)
+        # In-page translations go through the shared Python pipeline
+        await context.expose_binding(TRANSLATE_BINDING, interceptor.translate_binding)
+        # Composer drafts are translated while typing and substituted on send
+        await context.expose_binding(DRAFT_BINDING, interceptor.translate_draft)
 
     # --- Contact Remark Logic ---
     async def handle_contact_update(source, data):
@@ -150,6 +164,9 @@ async def main(
         provider="google",
         source_lang=source_lang,
         target_lang=target_lang,
+        # Persist translations across restarts (shared by all instances)
+        store_path=settings.translation_store_path
+        or os.path.join(profile_base, "translations.db"),
     )
 
     # Create translator
@@ -162,8 +179,14 @@ async def main(
     # Initialize ContactManager
     contact_manager = ContactManager()
 
-    # Create interceptor
-    interceptor = MessageInterceptor(config=translation_config, translator=translator)
+    # Create interceptor; page translations from all instances share one
+    # micro-batching scheduler
+    scheduler = (
+        BatchScheduler.from_config(translator, translation_config) if translator else None
+    )
+    interceptor = MessageInterceptor(
+        config=translation_config, translator=translator, scheduler=scheduler
+    )
 
     # Prepare instance configs
     tasks = []
@@ -204,6 +227,12 @@ async def main(
         await asyncio.gather(*tasks)
     except KeyboardInterrupt:
         print("\n⏹️ Shutting down all instances...")
+    finally:
+        # Release pooled provider connections
+        if scheduler:
+            await scheduler.close()
+        if translator:
+            await translator.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+"""
+Benchmark overlay rendering of the injected script on a local fixture page.
+
+Builds a Telegram-like page with N message bubbles, injects the
+translation script (translations answered instantly by a Python
+binding), scrolls through the history and reports Chromium's style and
+layout counters plus long tasks.
+
+Usage:
+    python scripts/bench_overlay_render.py [num_messages] [--reduced-motion]
+
+Requirements:
+    pip install playwright
+    playwright install chromium
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.telegram_multi.config import TranslationConfig  # noqa: E402
+from src.telegram_multi.message_interceptor import (  # noqa: E402
+    TRANSLATE_BINDING,
+    MessageInterceptor,
+)
+
+METRICS = ("RecalcStyleCount", "RecalcStyleDuration", "LayoutCount", "LayoutDuration", "TaskDuration")
+
+
+def fixture_page(num_messages: int) -> str:
+    """Chat column with alternating incoming/outgoing bubbles."""
+    bubbles = "\n".join(
+        f'<div class="Message{" own" if i % 3 == 0 else ""}" data-message-id="{i}">'
+        f'<div class="text-content">Message number {i}: see you tomorrow at the station, ok?</div>'
+        f"</div>"
+        for i in range(num_messages)
+    )
+    return f"""<!doctype html>
+<html><head><style>
+  body {{ margin: 0; font: 14px sans-serif; }}
+  #MiddleColumn {{ height: 100vh; overflow-y: auto; }}
+  .Message {{ margin: 8px; padding: 8px; border-radius: 12px; background: #eef; max-width: 60%; }}
+  .Message.own {{ margin-left: auto; background: #dfd; }}
+</style></head>
+<body><div id="MiddleColumn">{bubbles}</div></body></html>"""
+
+
+async def run(num_messages: int, reduced_motion: bool) -> None:
+    from playwright.async_api import async_playwright
+
+    config = TranslationConfig(enabled=True, js_reduced_motion=reduced_motion)
+    interceptor = MessageInterceptor(config)
+
+    async def translate(source, items):
+        return [item["text"].upper() for item in items]
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page(viewport={"width": 1000, "height": 800})
+        await page.expose_binding(TRANSLATE_BINDING, translate)
+        await page.add_init_script(
+            "window.__longTasks = [];"
+            "new PerformanceObserver(l => l.getEntries().forEach("
+            "e => window.__longTasks.push(e.duration))).observe({entryTypes: ['longtask']});"
+        )
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        await page.set_content(fixture_page(num_messages))
+        await page.add_script_tag(content=interceptor.get_injection_script())
+        before = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+
+        # Let the script start, then scroll through the whole history
+        await page.wait_for_timeout(1000)
+        for _ in range(40):
+            await page.mouse.wheel(0, 1500)
+            await page.wait_for_timeout(50)
+        await page.wait_for_timeout(1000)
+
+        after = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+        overlays = await page.evaluate("document.querySelectorAll('.tg-apple-overlay').length")
+        long_tasks = await page.evaluate("window.__longTasks")
+        await browser.close()
+
+    print(f"messages={num_messages} overlays={overlays} reduced_motion={reduced_motion}")
+    for name in METRICS:
+        delta = after.get(name, 0) - before.get(name, 0)
+        unit = "ms" if name.endswith("Duration") else ""
+        print(f"  {name:20s} {delta * 1e3 if unit else delta:10.1f}{unit}")
+    print(f"  long tasks           {len(long_tasks):10d} (total {sum(long_tasks):.0f}ms)")
+
+
+def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    num_messages = int(args[0]) if args else 500
+    asyncio.run(run(num_messages, "--reduced-motion" in sys.argv))
+
+
+if __name__ == "__main__":
+    main()
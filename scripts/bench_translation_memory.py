@@ -0,0 +1,83 @@
+"""
+Benchmark TranslationMemory lookups on a large synthetic memory.
+
+Fills the memory with N random chat-like sentences, then times lookups
+of near-duplicates (one word changed) and of unrelated sentences.
+
+Usage:
+    python scripts/bench_translation_memory.py [num_entries] [num_lookups]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.telegram_multi.translation_memory import TranslationMemory  # noqa: E402
+
+VOCABULARY = 5000
+
+
+def make_words(rng: random.Random):
+    """Pseudo-words with a Zipf-like frequency distribution."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(2, 9))) for _ in range(VOCABULARY)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+    return words, weights
+
+
+def sentence(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, WEIGHTS, k=rng.randint(6, 14)))
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def main() -> None:
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    rng = random.Random(42)
+    global WORDS, WEIGHTS
+    WORDS, WEIGHTS = make_words(rng)
+    memory = TranslationMemory(threshold=0.9, max_entries=entries)
+
+    stored = []
+    start = time.perf_counter()
+    for i in range(entries):
+        text = sentence(rng)
+        memory.add(text, f"t{i}", "en", "zh")
+        if i % max(1, entries // lookups) == 0:
+            stored.append(text)
+    build = time.perf_counter() - start
+    print(f"built {len(memory)} entries in {build:.1f}s ({build / entries * 1e6:.1f} us/add)")
+
+    def near(text: str) -> str:
+        # Casing, punctuation and a small typo
+        chars = list(text.capitalize() + "?")
+        i = rng.randrange(1, len(chars) - 1)
+        chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        return "".join(chars)
+
+    for label, queries in (
+        ("near-duplicate", [near(t) for t in stored[:lookups]]),
+        ("unrelated", [sentence(rng) + " xyzzy" for _ in range(lookups)]),
+    ):
+        timings, hits = [], 0
+        for query in queries:
+            t0 = time.perf_counter()
+            match = memory.lookup(query, "en", "zh")
+            timings.append(time.perf_counter() - t0)
+            hits += match is not None
+        print(
+            f"{label:15s} lookups={len(queries)} hits={hits} "
+            f"p50={percentile(timings, 0.5) * 1e3:.3f}ms "
+            f"p99={percentile(timings, 0.99) * 1e3:.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compile TSV/JSONL phrase lists into a phrase table for the local provider.
+
+Input formats:
+- TSV: "phrase<TAB>translation" (needs --src and --dest) or
+  "src<TAB>dest<TAB>phrase<TAB>translation"
+- JSONL (.jsonl/.ndjson): {"source": ..., "target": ..., "src": ..., "dest": ...};
+  src/dest fall back to --src/--dest
+
+Later inputs win over earlier ones for the same phrase.
+
+Usage:
+    python scripts/build_phrase_table.py -o phrases.tgpt [--src zh --dest en] INPUT [INPUT ...]
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.telegram_multi.phrase_table import build_phrase_table, load_entries  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("inputs", nargs="+", help="TSV or JSONL phrase files")
+    parser.add_argument("-o", "--output", required=True, help="Phrase table to write")
+    parser.add_argument("--src", help="Source language for 2-column TSV / JSONL without src")
+    parser.add_argument("--dest", help="Destination language for 2-column TSV / JSONL without dest")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    entries = itertools.chain.from_iterable(
+        load_entries(path, args.src, args.dest) for path in args.inputs
+    )
+    try:
+        count = build_phrase_table(entries, args.output)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    size = os.path.getsize(args.output)
+    print(
+        f"wrote {count} phrases to {args.output} "
+        f"({size / 1024:.1f} KiB) in {time.perf_counter() - start:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
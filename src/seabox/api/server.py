@@ -1,6 +1,7 @@
 import os
 import re
 import sys
+from contextlib import asynccontextmanager
 from functools import lru_cache
 
 import uvicorn
@@ -13,8 +14,22 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from src.telegram_multi.translator import TranslatorFactory
 from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.langdetect import SkipClassifier
+from src.telegram_multi.settings import settings
 
-app = FastAPI()
+# Local pre-check: texts needing no translation never reach the provider
+skip_classifier = SkipClassifier()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the translator's pooled connections on shutdown
+    if get_translator.cache_info().currsize:
+        await get_translator().aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -59,6 +74,7 @@ def get_stats():
         "chars_available": 99818,
         "expiry_date": "2025-06-23",
         "active_instances": 3,
+        "skipped_translations": skip_classifier.stats().model_dump(),
     }
 
 
@@ -86,26 +102,46 @@ def get_translator():
         provider="google",
         source_lang="auto",
         target_lang="en",  # Default, overridden in call
+        # Persist translations across API restarts
+        store_path=settings.translation_store_path
+        or os.path.expanduser("~/.telegram_profiles/translations.db"),
     )
     return TranslatorFactory.create(config)
 
 
 @app.post("/translate")
-def translate(req: TranslationRequest):
+async def translate(req: TranslationRequest):
     try:
         # 1. PII Redaction (Governance)
         clean_text = redact_pii(req.text)
 
-        # 2. Translation (Using Singleton)
+        # 2. Fast path: emoji/number/URL-only or already in target language
+        skipped = skip_classifier.classify(clean_text, req.target_lang)
+        if skipped:
+            return {
+                "translated": clean_text,
+                "original": req.text,
+                "clean_text": clean_text,
+                "blocked": False,
+                "reason": None,
+                "skipped": skipped,
+            }
+
+        # 3. Translation (Using Singleton)
         translator = get_translator()
         # Note: We pass target_lang dynamically here, overriding config
         # defaults if needed. But wait, Translator.translate() takes
         # dest_lang! The Translator instance has a config, but translate()
         # method args override it. So we can reuse the SAME instance for
         # different target langs.
-        result = translator.translate(clean_text, "auto", req.target_lang)
-
-        # 3. Quality Check (Outgoing Governance)
+        if translator.config.segment_messages:
+            result = await translator.translate_segmented_async(
+                clean_text, "auto", req.target_lang
+            )
+        else:
+            result = await translator.translate_async(clean_text, "auto", req.target_lang)
+
+        # 4. Quality Check (Outgoing Governance)
         # If target is English-like but result still has Chinese, flag it
         blocked = False
         if req.target_lang in ("en", "en-US", "en-GB") and has_chinese(result):
@@ -117,6 +153,7 @@ def translate(req: TranslationRequest):
             "clean_text": clean_text,
             "blocked": blocked,
             "reason": "Translation incomplete (Chinese detected)" if blocked else None,
+            "skipped": None,
         }
     except Exception as e:
         return {"error": str(e), "translated": req.text}
@@ -39,3 +39,11 @@ def test_translate_endpoint():
     json_data = response.json()
     # It should return either translation or fallback
     assert "translated" in json_data
+
+def test_translate_skips_text_without_words():
+    # Emoji/number-only texts are answered locally without a provider call
+    response = client.post("/translate", json={"text": "👍 12:30", "target_lang": "en"})
+    assert response.status_code == 200
+    json_data = response.json()
+    assert json_data["translated"] == "👍 12:30"
+    assert json_data["skipped"] == "no_text"
@@ -0,0 +1,228 @@
+"""
+Micro-batching translation scheduler.
+
+Contract:
+- BatchScheduler collects translate requests for a short window (or until
+  max_batch items queue up for one language pair) and flushes them per
+  (src, dest) pair through Translator.batch_translate_async
+- Each caller gets a future resolving to its own translation
+- Queue depth is bounded; submissions beyond it raise QueueFullError
+- Pairs are served round-robin, at most max_batch items per pair per
+  round, so a busy chat cannot starve other language pairs
+- Batch size and queueing delay are exposed via metrics()
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+Pair = Tuple[str, str]
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the scheduler queue is at max_queue."""
+
+
+class BatchMetrics(BaseModel):
+    """Snapshot of scheduler counters."""
+
+    batches: int = 0
+    items: int = 0
+    rejected: int = 0
+    queued: int = 0
+    max_batch_size: int = 0
+    avg_batch_size: float = 0.0
+    avg_queue_delay_ms: float = 0.0
+    max_queue_delay_ms: float = 0.0
+    # batch size upper bound -> number of batches (1, 2, 4, 8, ...)
+    batch_size_histogram: Dict[int, int] = Field(default_factory=dict)
+
+
+class _Request:
+    __slots__ = ("text", "future", "enqueued_at")
+
+    def __init__(self, text: str, future: asyncio.Future, enqueued_at: float):
+        self.text = text
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class BatchScheduler:
+    """Groups concurrent translate calls into per-pair batches."""
+
+    def __init__(
+        self,
+        translator,
+        window_ms: float = 20,
+        max_batch: int = 32,
+        max_queue: int = 1000,
+        max_concurrent_batches: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize scheduler.
+
+        Args:
+            translator: Translator whose batch_translate_async is used
+            window_ms: How long the first queued item waits for company
+            max_batch: Items per batch; a full pair is flushed immediately
+            max_queue: Max items waiting across all pairs
+            max_concurrent_batches: Batches dispatched upstream at once
+            clock: Monotonic time source
+        """
+        self.translator = translator
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self._clock = clock
+        self._queues: "OrderedDict[Pair, Deque[_Request]]" = OrderedDict()
+        self._queued = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushing: Optional[asyncio.Task] = None
+        self._semaphore = asyncio.Semaphore(max_concurrent_batches)
+        self._inflight: set = set()
+
+        self._batches = 0
+        self._items = 0
+        self._rejected = 0
+        self._max_batch_size = 0
+        self._delay_total = 0.0
+        self._delay_max = 0.0
+        self._histogram: Dict[int, int] = {}
+
+    @classmethod
+    def from_config(cls, translator, config) -> "BatchScheduler":
+        """Build a scheduler from TranslationConfig batching fields."""
+        return cls(
+            translator,
+            window_ms=config.batch_window_ms,
+            max_batch=config.batch_max_items,
+            max_queue=config.batch_max_queue,
+        )
+
+    def submit(self, text: str, src_lang: str, dest_lang: str) -> asyncio.Future:
+        """Queue a translation and return a future for its result.
+
+        Raises:
+            QueueFullError: If max_queue items are already waiting
+        """
+        if self._queued >= self.max_queue:
+            self._rejected += 1
+            raise QueueFullError(f"translation queue full ({self.max_queue} items)")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pair = (src_lang, dest_lang)
+        queue = self._queues.get(pair)
+        if queue is None:
+            queue = self._queues[pair] = deque()
+        queue.append(_Request(text, future, self._clock()))
+        self._queued += 1
+
+        if len(queue) >= self.max_batch:
+            self._schedule_flush(loop, 0)
+        elif self._timer is None:
+            self._schedule_flush(loop, self.window)
+        return future
+
+    async def translate(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Queue a translation and wait for its result."""
+        return await self.submit(text, src_lang, dest_lang)
+
+    async def flush(self) -> None:
+        """Dispatch everything queued now and wait for those batches."""
+        self._cancel_timer()
+        await self._drain()
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Flush pending work; further submissions still work."""
+        await self.flush()
+
+    def metrics(self) -> BatchMetrics:
+        """Return a snapshot of batching metrics."""
+        return BatchMetrics(
+            batches=self._batches,
+            items=self._items,
+            rejected=self._rejected,
+            queued=self._queued,
+            max_batch_size=self._max_batch_size,
+            avg_batch_size=self._items / self._batches if self._batches else 0.0,
+            avg_queue_delay_ms=(self._delay_total / self._items * 1000) if self._items else 0.0,
+            max_queue_delay_ms=self._delay_max * 1000,
+            batch_size_histogram=dict(sorted(self._histogram.items())),
+        )
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        self._cancel_timer()
+        self._timer = loop.call_later(delay, self._start_flush)
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _start_flush(self) -> None:
+        self._timer = None
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self) -> None:
+        """Take batches round-robin across pairs until the queue is empty."""
+        while self._queues:
+            for pair in list(self._queues):
+                queue = self._queues.get(pair)
+                if queue is None:
+                    continue
+                batch: List[_Request] = []
+                while queue and len(batch) < self.max_batch:
+                    batch.append(queue.popleft())
+                if not queue:
+                    del self._queues[pair]
+                else:
+                    # Served pairs go to the back of the rotation
+                    self._queues.move_to_end(pair)
+                self._queued -= len(batch)
+
+                await self._semaphore.acquire()
+                task = asyncio.get_running_loop().create_task(self._run_batch(pair, batch))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, pair: Pair, batch: List[_Request]) -> None:
+        try:
+            now = self._clock()
+            self._record(batch, now)
+            live = [r for r in batch if not r.future.done()]
+            if not live:
+                return
+            try:
+                results = await self.translator.batch_translate_async(
+                    [r.text for r in live], pair[0], pair[1]
+                )
+            except Exception as e:
+                for request in live:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                return
+            for request, result in zip(live, results):
+                if not request.future.done():
+                    request.future.set_result(result)
+        finally:
+            self._semaphore.release()
+
+    def _record(self, batch: List[_Request], now: float) -> None:
+        size = len(batch)
+        self._batches += 1
+        self._items += size
+        self._max_batch_size = max(self._max_batch_size, size)
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        self._histogram[bucket] = self._histogram.get(bucket, 0) + 1
+        for request in batch:
+            delay = now - request.enqueued_at
+            self._delay_total += delay
+            self._delay_max = max(self._delay_max, delay)
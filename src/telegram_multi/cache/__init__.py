@@ -0,0 +1,18 @@
+"""
+Translation cache implementations.
+"""
+
+from .memory import CacheStats, TranslationCache
+from .redis_cache import RedisTranslationCache
+from .sqlite_store import SQLiteTranslationStore, open_translation_store
+from .tiered import TieredTranslationCache, build_translation_cache
+
+__all__ = [
+    "CacheStats",
+    "TranslationCache",
+    "RedisTranslationCache",
+    "SQLiteTranslationStore",
+    "open_translation_store",
+    "TieredTranslationCache",
+    "build_translation_cache",
+]
@@ -0,0 +1,225 @@
+"""
+In-process translation cache.
+
+Contract:
+- TranslationCache: bounded by entry count and byte budget
+- Least-recently-used entries are evicted first
+- Entries expire lazily after ttl seconds (checked on access)
+- With stale_ttl, expired entries are kept that much longer and remain
+  readable through get_stale() (stale-while-revalidate)
+- Hit/miss/eviction/expiration counters exposed via stats()
+- Thread-safe (FastAPI runs sync handlers in a worker pool)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    """Snapshot of cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    stale_hits: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+def _entry_size(key: str, value: str) -> int:
+    """Approximate resident size of an entry in bytes (UTF-8 payload)."""
+    return len(key.encode("utf-8")) + len(value.encode("utf-8"))
+
+
+class TranslationCache:
+    """Bounded LRU cache with lazy TTL expiry."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: Optional[float] = 3600,
+        clock: Callable[[], float] = time.monotonic,
+        stale_ttl: Optional[float] = 0,
+    ):
+        """Initialize cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            max_bytes: Maximum total UTF-8 size of keys and values
+            ttl: Seconds an entry stays valid (None or <= 0 disables expiry)
+            clock: Monotonic time source (injectable for tests)
+            stale_ttl: Seconds an expired entry is still served by
+                get_stale() (None or <= 0 drops entries at expiry)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.stale_ttl = stale_ttl if stale_ttl and stale_ttl > 0 else 0
+        self._clock = clock
+        # key -> (value, stored_at, size)
+        self._data: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._stale_hits = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached value, or None on miss or expiry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            value, stored_at, size = entry
+            if self.ttl is not None:
+                age = self._clock() - stored_at
+                if age >= self.ttl:
+                    # Stale entries stay for get_stale() until the grace ends
+                    if age >= self.ttl + self.stale_ttl:
+                        self._remove(key, size)
+                        self._expirations += 1
+                    self._misses += 1
+                    return None
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def get_stale(self, key: str) -> Optional[str]:
+        """Return an expired value still within stale_ttl, else None.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The stale value, or None if the key is fresh, absent, or past
+            its grace period
+        """
+        if self.ttl is None or not self.stale_ttl:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, stored_at, size = entry
+            age = self._clock() - stored_at
+            if age < self.ttl:
+                return None
+            if age >= self.ttl + self.stale_ttl:
+                self._remove(key, size)
+                self._expirations += 1
+                return None
+            self._stale_hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting least-recently-used entries if needed.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        size = _entry_size(key, value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+            # Values larger than the whole budget are never cached
+            if size > self.max_bytes:
+                return
+
+            self._data[key] = (value, self._clock(), size)
+            self._bytes += size
+            self._evict()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Look up several keys at once.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found keys to values (misses are omitted)
+        """
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, items: Dict[str, str]) -> None:
+        """Store several values at once.
+
+        Args:
+            items: Mapping of keys to values
+        """
+        for key, value in items.items():
+            self.set(key, value)
+
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._remove(key, entry[2])
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                stale_hits=self._stale_hits,
+                entries=len(self._data),
+                bytes=self._bytes,
+            )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        """Membership test without touching LRU order or counters."""
+        entry = self._data.get(key)
+        if entry is None:
+            return False
+        return self.ttl is None or self._clock() - entry[1] < self.ttl
+
+    def _remove(self, key: str, size: int) -> None:
+        """Drop an entry (caller holds the lock)."""
+        del self._data[key]
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        """Evict LRU entries until both budgets hold (caller holds the lock)."""
+        while self._data and (
+            len(self._data) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, _, size) = self._data.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
@@ -0,0 +1,168 @@
+"""
+Redis-backed shared translation cache.
+
+Contract:
+- RedisTranslationCache: shared cache tier, TTL enforced server-side (SET EX)
+- get_many uses a single MGET round trip, set_many a pipeline
+- Redis failures degrade to cache misses (never break translation)
+- One client (connection pool) per Redis URL per process
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+from src.telegram_multi.cache.memory import CacheStats
+
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_redis_client(url: str) -> Any:
+    """Return a process-wide Redis client for url.
+
+    Clients are shared so every translator in the process reuses one
+    connection pool per Redis server.
+
+    Args:
+        url: Redis URL (redis://host:port/db)
+
+    Returns:
+        redis.Redis client
+
+    Raises:
+        ImportError: If the redis package is not installed
+    """
+    with _clients_lock:
+        client = _clients.get(url)
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError(
+                    "redis package is required when redis_url is set. "
+                    "Run: pip install redis"
+                ) from e
+            client = redis.Redis.from_url(
+                url,
+                decode_responses=True,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+            _clients[url] = client
+        return client
+
+
+def _decode(value: Any) -> Optional[str]:
+    """Normalize a Redis reply to str (clients may return bytes)."""
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+class RedisTranslationCache:
+    """Shared translation cache tier stored in Redis."""
+
+    def __init__(self, client: Any, ttl: Optional[int] = 3600, prefix: str = "tgtr:"):
+        """Initialize Redis cache tier.
+
+        Args:
+            client: redis.Redis-compatible client
+            ttl: Seconds before Redis expires a key (None or <= 0 disables)
+            prefix: Namespace prepended to every key
+        """
+        self.client = client
+        self.ttl = int(ttl) if ttl and ttl > 0 else None
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached value or None on miss or Redis failure."""
+        try:
+            value = _decode(self.client.get(self.prefix + key))
+        except Exception:
+            self._count(errors=1, misses=1)
+            return None
+        if value is None:
+            self._count(misses=1)
+        else:
+            self._count(hits=1)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value with server-side expiry."""
+        try:
+            self.client.set(self.prefix + key, value, ex=self.ttl)
+        except Exception:
+            self._count(errors=1)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Fetch several keys in one MGET round trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found keys to values (misses are omitted)
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            values = self.client.mget([self.prefix + k for k in keys])
+        except Exception:
+            self._count(errors=1, misses=len(keys))
+            return {}
+
+        found = {}
+        for key, value in zip(keys, values):
+            value = _decode(value)
+            if value is not None:
+                found[key] = value
+        self._count(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def set_many(self, items: Dict[str, str]) -> None:
+        """Store several values through one pipeline round trip."""
+        if not items:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self.prefix + key, value, ex=self.ttl)
+            pipe.execute()
+        except Exception:
+            self._count(errors=1)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from Redis."""
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception:
+            self._count(errors=1)
+
+    def clear(self) -> None:
+        """No-op: the shared tier is left to expire via TTL.
+
+        Clearing one process's view must not wipe translations that other
+        browser instances and the API process are still using.
+        """
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the counters (errors counted as misses)."""
+        with self._lock:
+            return CacheStats(hits=self._hits, misses=self._misses)
+
+    @property
+    def errors(self) -> int:
+        """Number of failed Redis operations."""
+        return self._errors
+
+    def _count(self, hits: int = 0, misses: int = 0, errors: int = 0) -> None:
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._errors += errors
@@ -0,0 +1,311 @@
+"""
+Persistent SQLite translation store.
+
+Contract:
+- SQLiteTranslationStore: on-disk cache tier that survives restarts
+- Rows keyed by (provider, src, dest, text_hash), parsed from cache keys
+- WAL journal so readers in other processes never block the writer
+- Write-behind: set() only buffers; a background thread commits batches,
+  so the translation hot path never waits on fsync
+- Reads query on demand; nothing is preloaded at startup
+- One store (and one writer thread) per database path per process
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+from src.telegram_multi.cache.memory import CacheStats
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    provider TEXT NOT NULL,
+    src_lang TEXT NOT NULL,
+    dest_lang TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (provider, src_lang, dest_lang, text_hash)
+) WITHOUT ROWID
+"""
+
+# SQLite's default limit on host parameters per statement is 999
+_MAX_QUERY_PARAMS = 900
+
+_stores: Dict[str, "SQLiteTranslationStore"] = {}
+_stores_lock = threading.Lock()
+
+
+def _split_key(key: str) -> Tuple[str, str, str, str]:
+    """Split "<provider>:<src>:<dest>:<hash>" into its columns."""
+    provider, src_lang, dest_lang, text_hash = key.split(":", 3)
+    return provider, src_lang, dest_lang, text_hash
+
+
+def open_translation_store(path: str, ttl: Optional[int] = None) -> "SQLiteTranslationStore":
+    """Return the process-wide store for path, creating it on first use.
+
+    Args:
+        path: SQLite database file
+        ttl: Seconds a stored translation stays valid (None keeps forever)
+
+    Returns:
+        Shared SQLiteTranslationStore
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None or store.closed:
+            store = SQLiteTranslationStore(path, ttl=ttl)
+            _stores[path] = store
+        return store
+
+
+@atexit.register
+def _close_all_stores() -> None:
+    """Flush pending writes of every open store at interpreter exit."""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
+
+
+class SQLiteTranslationStore:
+    """On-disk translation cache tier with write-behind batching."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[int] = None,
+        flush_interval: float = 0.2,
+        max_batch: int = 500,
+    ):
+        """Initialize store and start the writer thread.
+
+        Args:
+            path: SQLite database file (parent directory is created)
+            ttl: Seconds a stored translation stays valid (None or <= 0 keeps forever)
+            flush_interval: Max seconds a write waits before being committed
+            max_batch: Pending writes that trigger an immediate flush
+        """
+        self.path = path
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Writer connection: owns schema setup and all commits
+        self._writer = self._connect(check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute(_SCHEMA)
+        self._writer.commit()
+        self._write_lock = threading.Lock()
+
+        self._local = threading.local()
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._flushed = 0
+
+        self._thread = threading.Thread(
+            target=self._writer_loop, name="translation-store-writer", daemon=True
+        )
+        self._thread.start()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a stored translation or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Look up several keys; pending (unflushed) writes are visible.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found keys to values (misses are omitted)
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys or self.closed:
+            return {}
+
+        found: Dict[str, str] = {}
+        with self._pending_lock:
+            for key in keys:
+                entry = self._pending.get(key)
+                if entry is not None:
+                    found[key] = entry[0]
+
+        # Group remaining keys by (provider, src, dest) for IN queries
+        groups: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+        for key in keys:
+            if key in found:
+                continue
+            try:
+                provider, src_lang, dest_lang, text_hash = _split_key(key)
+            except ValueError:
+                continue
+            groups.setdefault((provider, src_lang, dest_lang), {})[text_hash] = key
+
+        if groups:
+            cutoff = time.time() - self.ttl if self.ttl is not None else None
+            try:
+                conn = self._reader()
+                for (provider, src_lang, dest_lang), by_hash in groups.items():
+                    hashes = list(by_hash)
+                    for start in range(0, len(hashes), _MAX_QUERY_PARAMS):
+                        chunk = hashes[start:start + _MAX_QUERY_PARAMS]
+                        rows = conn.execute(
+                            "SELECT text_hash, translation, created_at FROM translations "
+                            "WHERE provider = ? AND src_lang = ? AND dest_lang = ? "
+                            f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                            (provider, src_lang, dest_lang, *chunk),
+                        ).fetchall()
+                        for text_hash, translation, created_at in rows:
+                            if cutoff is None or created_at >= cutoff:
+                                found[by_hash[text_hash]] = translation
+            except sqlite3.Error:
+                pass
+
+        with self._stats_lock:
+            self._hits += len(found)
+            self._misses += len(keys) - len(found)
+        return found
+
+    def set(self, key: str, value: str) -> None:
+        """Buffer a write; it is committed by the writer thread."""
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, str]) -> None:
+        """Buffer several writes."""
+        if not items or self.closed:
+            return
+        now = time.time()
+        with self._pending_lock:
+            for key, value in items.items():
+                self._pending[key] = (value, now)
+            size = len(self._pending)
+        if size >= self.max_batch:
+            self._wakeup.set()
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the store (synchronously)."""
+        with self._pending_lock:
+            self._pending.pop(key, None)
+        try:
+            provider, src_lang, dest_lang, text_hash = _split_key(key)
+            conn = self._reader()
+            conn.execute(
+                "DELETE FROM translations WHERE provider = ? AND src_lang = ? "
+                "AND dest_lang = ? AND text_hash = ?",
+                (provider, src_lang, dest_lang, text_hash),
+            )
+            conn.commit()
+        except (ValueError, sqlite3.Error):
+            pass
+
+    def clear(self) -> None:
+        """No-op: persisted translations outlive a single translator.
+
+        Use purge_expired() to reclaim space.
+        """
+
+    def flush(self) -> int:
+        """Commit pending writes now.
+
+        Returns:
+            Number of rows written
+        """
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = {}
+        if not pending:
+            return 0
+
+        rows = []
+        for key, (value, created_at) in pending.items():
+            try:
+                rows.append((*_split_key(key), value, created_at))
+            except ValueError:
+                continue
+        try:
+            with self._write_lock, self._writer:
+                self._writer.executemany(
+                    "INSERT OR REPLACE INTO translations "
+                    "(provider, src_lang, dest_lang, text_hash, translation, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error:
+            return 0
+        with self._stats_lock:
+            self._flushed += len(rows)
+        return len(rows)
+
+    def purge_expired(self) -> int:
+        """Delete rows older than ttl.
+
+        Returns:
+            Number of rows removed
+        """
+        if self.ttl is None:
+            return 0
+        with self._write_lock, self._writer:
+            cursor = self._writer.execute(
+                "DELETE FROM translations WHERE created_at < ?",
+                (time.time() - self.ttl,),
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self.closed:
+            return
+        self.closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        self._writer.close()
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss counters."""
+        with self._stats_lock:
+            return CacheStats(hits=self._hits, misses=self._misses)
+
+    @property
+    def flushed(self) -> int:
+        """Total rows committed by this store."""
+        return self._flushed
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path, timeout=5, check_same_thread=check_same_thread
+        )
+        # WAL + NORMAL: commits don't fsync the main database file
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _writer_loop(self) -> None:
+        while not self.closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
@@ -0,0 +1,155 @@
+"""
+Tiered translation cache composition.
+
+Contract:
+- TieredTranslationCache: L1 (in-process) in front of slower shared tiers
+- Lower-tier hits are backfilled into the tiers above them
+- build_translation_cache(): assembles the tiers for a TranslationConfig:
+  in-process LRU, then the SQLite store (config.store_path), then Redis
+  (settings.redis_url)
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from src.telegram_multi.cache.memory import CacheStats, TranslationCache
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.settings import settings
+
+
+class TieredTranslationCache:
+    """Cache composed of an in-process L1 and one or more shared tiers."""
+
+    def __init__(self, tiers: List[Any]):
+        """Initialize tiered cache.
+
+        Args:
+            tiers: Cache tiers ordered fastest first; tiers[0] is the L1
+        """
+        if not tiers:
+            raise ValueError("TieredTranslationCache needs at least one tier")
+        self.tiers = tiers
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def l1(self) -> Any:
+        """The in-process tier."""
+        return self.tiers[0]
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self.l1.ttl
+
+    @property
+    def max_entries(self) -> int:
+        return self.l1.max_entries
+
+    @property
+    def max_bytes(self) -> int:
+        return self.l1.max_bytes
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the first hit walking down the tiers, backfilling above."""
+        for depth, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for upper in self.tiers[:depth]:
+                    upper.set(key, value)
+                self._count(hits=1)
+                return value
+        self._count(misses=1)
+        return None
+
+    def get_stale(self, key: str) -> Optional[str]:
+        """Stale value from the L1 (shared tiers expire on their own)."""
+        return self.l1.get_stale(key)
+
+    def set(self, key: str, value: str) -> None:
+        """Write through to every tier."""
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Batch lookup; each tier is asked only for keys still missing."""
+        missing = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        for depth, tier in enumerate(self.tiers):
+            if not missing:
+                break
+            hits = tier.get_many(missing)
+            if hits:
+                for upper in self.tiers[:depth]:
+                    upper.set_many(hits)
+                found.update(hits)
+                missing = [k for k in missing if k not in hits]
+        self._count(hits=len(found), misses=len(missing))
+        return found
+
+    def set_many(self, items: Dict[str, str]) -> None:
+        """Write several values through to every tier."""
+        for tier in self.tiers:
+            tier.set_many(items)
+
+    def delete(self, key: str) -> None:
+        for tier in self.tiers:
+            tier.delete(key)
+
+    def clear(self) -> None:
+        """Clear the tiers owned by this process (shared tiers ignore it)."""
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> CacheStats:
+        """Overall hit/miss counts plus L1 occupancy and evictions."""
+        l1 = self.l1.stats()
+        with self._lock:
+            return l1.model_copy(update={"hits": self._hits, "misses": self._misses})
+
+    def __len__(self) -> int:
+        return len(self.l1)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.l1
+
+    def _count(self, hits: int = 0, misses: int = 0) -> None:
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+
+
+def build_translation_cache(config: TranslationConfig) -> Any:
+    """Build the cache used by a Translator.
+
+    Args:
+        config: TranslationConfig with cache limits and TTL
+
+    Returns:
+        TranslationCache, or TieredTranslationCache when shared tiers
+        are configured
+    """
+    l1 = TranslationCache(
+        max_entries=config.cache_max_entries,
+        max_bytes=config.cache_max_bytes,
+        ttl=config.cache_ttl,
+        stale_ttl=config.cache_stale_ttl,
+    )
+    tiers: List[Any] = [l1]
+
+    if config.store_path:
+        from src.telegram_multi.cache.sqlite_store import open_translation_store
+
+        tiers.append(open_translation_store(config.store_path, ttl=config.store_ttl))
+
+    if settings.redis_url:
+        from src.telegram_multi.cache.redis_cache import (
+            RedisTranslationCache,
+            get_redis_client,
+        )
+
+        client = get_redis_client(settings.redis_url)
+        tiers.append(RedisTranslationCache(client, ttl=config.cache_ttl))
+
+    if len(tiers) == 1:
+        return l1
+    return TieredTranslationCache(tiers)
@@ -3,7 +3,7 @@ Configuration management for telegram-multi instances.
 
 Contract:
 - InstanceConfig: instance_id, profile_path, translation settings
-- TranslationConfig: language pairs, providers (google, deepl, local)
+- TranslationConfig: language pairs, providers (google, deepl, local, hedged)
 - BrowserConfig: headless, executable_path
 - TelegramConfig: multiple instances, browser settings, YAML loading
 """
@@ -24,13 +24,47 @@ class TranslationConfig(BaseModel):
     display_mode: str = "bilingual"
     show_header: bool = True
     cache_ttl: int = Field(default=settings.translate_cache_ttl)
+    cache_max_entries: int = Field(default=settings.translate_cache_max_entries)
+    cache_max_bytes: int = Field(default=settings.translate_cache_max_bytes)
+    cache_stale_ttl: int = Field(default=settings.translate_cache_stale_ttl)
+    cache_negative_ttl: int = Field(default=settings.translate_cache_negative_ttl)
+    store_path: Optional[str] = Field(default=settings.translation_store_path)
+    store_ttl: int = Field(default=settings.translation_store_ttl)
+    phrase_table_path: Optional[str] = Field(default=settings.phrase_table_path)
+    memory_enabled: bool = Field(default=settings.translation_memory_enabled)
+    memory_threshold: float = Field(default=settings.translation_memory_threshold)
+    memory_max_entries: int = Field(default=settings.translation_memory_max_entries)
+    skip_enabled: bool = Field(default=settings.translation_skip_enabled)
+    segment_messages: bool = Field(default=settings.segment_messages)
+    max_chunk_chars: int = Field(default=settings.translate_max_chunk_chars)
     js_debounce_ms: int = Field(default=settings.js_debounce_ms)
+    js_slice_max_nodes: int = Field(default=settings.js_slice_max_nodes)
+    js_prefetch_margin_px: int = Field(default=settings.js_prefetch_margin_px)
+    js_max_concurrent_translations: int = Field(
+        default=settings.js_max_concurrent_translations
+    )
+    js_transport: str = Field(default=settings.js_translate_transport)
+    js_cache_max_entries: int = Field(default=settings.js_cache_max_entries)
+    js_reduced_motion: bool = Field(default=settings.js_reduced_motion)
+    js_draft_translation: bool = Field(default=settings.js_draft_translation)
+    js_draft_debounce_ms: int = Field(default=settings.js_draft_debounce_ms)
+    request_timeout: float = Field(default=settings.translate_request_timeout)
+    http_pool_size: int = Field(default=settings.http_pool_size)
+    http_keepalive_expiry: float = Field(default=settings.http_keepalive_expiry)
+    http2: bool = Field(default=settings.http2)
+    # Optional cap on characters per upstream batch request
+    batch_max_chars: Optional[int] = None
+    batch_window_ms: int = Field(default=settings.batch_window_ms)
+    batch_max_items: int = Field(default=settings.batch_max_items)
+    batch_max_queue: int = Field(default=settings.batch_max_queue)
+    hedge_providers: List[str] = Field(default_factory=lambda: list(settings.hedge_providers))
+    hedge_delay_ms: int = Field(default=settings.hedge_delay_ms)
 
     @field_validator("provider")
     @classmethod
     def validate_provider(cls, v: str) -> str:
         """Validate that provider is one of supported types."""
-        valid_providers = {"google", "deepl", "local"}
+        valid_providers = {"google", "deepl", "local", "hedged"}
         if v not in valid_providers:
             raise ValueError(f"provider must be one of {valid_providers}, got {v}")
         return v
@@ -44,6 +78,15 @@ class TranslationConfig(BaseModel):
             raise ValueError(f"display_mode must be one of {valid_modes}, got {v}")
         return v
 
+    @field_validator("js_transport")
+    @classmethod
+    def validate_js_transport(cls, v: str) -> str:
+        """Validate that js_transport is one of supported types."""
+        valid_transports = {"binding", "fetch"}
+        if v not in valid_transports:
+            raise ValueError(f"js_transport must be one of {valid_transports}, got {v}")
+        return v
+
 
 class BrowserConfig(BaseModel):
     """Browser configuration settings."""
@@ -0,0 +1,121 @@
+"""
+Pooled HTTP clients for translation providers.
+
+Contract:
+- HttpPool: one keep-alive connection pool per provider instance
+- Sync side: requests.Session with a sized HTTPAdapter
+- Async side: httpx.AsyncClient with matching limits, HTTP/2 when the
+  h2 package is installed
+- Async clients are bound to the event loop that created them; a
+  client replaced for another loop is kept until aclose()
+- close()/aclose() release every pooled connection deterministically
+"""
+
+import asyncio
+import importlib.util
+from typing import Any, List, Optional
+
+
+def http2_available() -> bool:
+    """Return True if httpx can negotiate HTTP/2 (h2 installed)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpPool:
+    """Keep-alive connection pools (sync and async) owned by a translator."""
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 10.0,
+    ):
+        """Initialize pool settings; connections are opened lazily.
+
+        Args:
+            pool_size: Max connections kept per host
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Use HTTP/2 for async requests when available
+            timeout: Default request timeout in seconds
+        """
+        self.pool_size = pool_size
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and http2_available()
+        self.timeout = timeout
+        self._session: Optional[Any] = None
+        self._async_client: Optional[Any] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._replaced_clients: List[Any] = []
+        self.closed = False
+
+    def session(self) -> Any:
+        """Return the shared requests.Session (created on first use)."""
+        if self.closed:
+            raise RuntimeError("HttpPool is closed")
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_size, pool_maxsize=self.pool_size
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def async_client(self) -> Any:
+        """Return the httpx.AsyncClient for the running event loop.
+
+        A client cannot be shared across loops, so a new one is created
+        if the pool is used from another loop; the old one is kept for
+        aclose() to close.
+        """
+        if self.closed:
+            raise RuntimeError("HttpPool is closed")
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            import httpx
+
+            if self._async_client is not None:
+                self._replaced_clients.append(self._async_client)
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    def close(self) -> None:
+        """Close the sync session.
+
+        The async clients need an event loop to close cleanly; use
+        aclose() from async code. Here they are only dropped.
+        """
+        self.closed = True
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self._async_client = None
+        self._async_loop = None
+        self._replaced_clients = []
+
+    async def aclose(self) -> None:
+        """Close the async clients and the sync session."""
+        client = self._async_client
+        if client is not None and self._async_loop is asyncio.get_running_loop():
+            await client.aclose()
+        for replaced in self._replaced_clients:
+            try:
+                await replaced.aclose()
+            except RuntimeError:
+                # Connections still tied to a loop that has since closed
+                pass
+        self.close()
@@ -0,0 +1,315 @@
+"""
+Skip-translation fast path based on Unicode script detection.
+
+Contract:
+- script_histogram(text) counts letters per Unicode script using a
+  precomputed ASCII table and a sorted range table for the rest;
+  letters of other scripts are counted under OTHER_SCRIPT
+- detect_language(text) names the language when the script is decisive
+  (han, kana, hangul, ...) or when function words of one language make
+  up FUNCTION_WORD_SHARE of a Latin/Cyrillic text (at least two of them
+  unless the text is one word); otherwise None, so text in a language
+  without a word list is not mistaken for one that has one
+- SkipClassifier.classify() returns why a text needs no translation
+  ("no_text": no letters at all, only emoji/numbers/punctuation/
+  URLs/mentions;
+  "same_language": already in the destination language), or None
+- Short or ambiguous texts fall back to the language last detected in
+  the same chat (bounded per-chat cache), if the scripts agree
+- Every check and skip is counted; stats() reports skips by reason
+"""
+
+import bisect
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from pydantic import BaseModel
+
+NO_TEXT = "no_text"
+SAME_LANGUAGE = "same_language"
+# Script name for letters outside _SCRIPT_RANGES; never decides a language
+OTHER_SCRIPT = "other"
+
+# (first, last, script), sorted by first code point
+_SCRIPT_RANGES = [
+    (0x00C0, 0x024F, "latin"),
+    (0x0370, 0x03FF, "greek"),
+    (0x0400, 0x052F, "cyrillic"),
+    (0x0590, 0x05FF, "hebrew"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0750, 0x077F, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0E00, 0x0E7F, "thai"),
+    (0x1100, 0x11FF, "hangul"),
+    (0x1E00, 0x1EFF, "latin"),
+    (0x3040, 0x30FF, "kana"),
+    (0x3130, 0x318F, "hangul"),
+    (0x3400, 0x4DBF, "han"),
+    (0x4E00, 0x9FFF, "han"),
+    (0xAC00, 0xD7AF, "hangul"),
+    (0xF900, 0xFAFF, "han"),
+    (0x20000, 0x2FA1F, "han"),
+]
+_RANGE_STARTS = [first for first, _, _ in _SCRIPT_RANGES]
+_ASCII_SCRIPTS = [
+    "latin" if ("A" <= chr(cp) <= "Z" or "a" <= chr(cp) <= "z") else None
+    for cp in range(128)
+]
+
+# Scripts that identify a single language on their own
+_SCRIPT_LANGUAGE = {
+    "han": "zh",
+    "kana": "ja",
+    "hangul": "ko",
+    "greek": "el",
+    "hebrew": "he",
+    "arabic": "ar",
+    "devanagari": "hi",
+    "thai": "th",
+}
+
+# Frequent function words for languages sharing a script
+_FUNCTION_WORDS: Dict[str, Dict[str, frozenset]] = {
+    "latin": {
+        "en": frozenset(
+            "the a an and is are was to of in on for it you i we this that with "
+            "have has be not do can will my your what how".split()
+        ),
+        "de": frozenset(
+            "der die das und ist nicht ich du wir sie ein eine zu mit auf für "
+            "den dem es ja nein bitte danke wie was".split()
+        ),
+        "fr": frozenset(
+            "le la les et est un une des je tu vous nous pas de du pour avec "
+            "que qui dans ce merci oui non".split()
+        ),
+        "es": frozenset(
+            "el la los las y es un una de que en por para con no yo tu usted "
+            "gracias hola como está".split()
+        ),
+        "pt": frozenset(
+            "o a os as e é um uma de que em para com não eu você obrigado "
+            "olá como está".split()
+        ),
+        "it": frozenset(
+            "il la lo gli le e è un una di che in per con non io tu grazie "
+            "ciao come sono".split()
+        ),
+    },
+    "cyrillic": {
+        "ru": frozenset(
+            "и в не на я что он с как это по но вы мы ты да нет спасибо "
+            "привет у меня есть".split()
+        ),
+        "uk": frozenset(
+            "і в не на я що він з як це по але ви ми ти так ні дякую "
+            "привіт у мене є".split()
+        ),
+    },
+}
+_UKRAINIAN_LETTERS = frozenset("іїєґІЇЄҐ")
+
+_NON_TEXT_RE = re.compile(r"https?://\S+|www\.\S+|\S+@\S+\.\w+|[@#]\w+")
+_WORD_RE = re.compile(r"[^\W\d_]+")
+# Share of letters the dominant script needs before the text counts as
+# written in one language (mixed-script text is translated)
+DOMINANT_SHARE = 0.8
+# Share of words that must be function words of the detected language;
+# below it most words are unknown and the text is left undecided
+FUNCTION_WORD_SHARE = 0.3
+
+
+def script_of(char: str) -> Optional[str]:
+    """Unicode script of a letter, or None for anything else.
+
+    Letters of scripts missing from the range table (Georgian, Tamil,
+    ...) are OTHER_SCRIPT, so they still count as text.
+    """
+    cp = ord(char)
+    if cp < 128:
+        return _ASCII_SCRIPTS[cp]
+    if not char.isalpha():
+        return None
+    i = bisect.bisect_right(_RANGE_STARTS, cp) - 1
+    if i >= 0 and cp <= _SCRIPT_RANGES[i][1]:
+        return _SCRIPT_RANGES[i][2]
+    return OTHER_SCRIPT
+
+
+def script_histogram(text: str) -> Dict[str, int]:
+    """Count letters of text per script."""
+    counts: Dict[str, int] = {}
+    for char in text:
+        script = script_of(char)
+        if script is not None:
+            counts[script] = counts.get(script, 0) + 1
+    return counts
+
+
+def strip_non_text(text: str) -> str:
+    """Remove URLs, e-mail addresses, @mentions and #hashtags."""
+    return _NON_TEXT_RE.sub(" ", text)
+
+
+def base_language(lang: str) -> str:
+    """Primary subtag of a language code ("zh-CN" -> "zh")."""
+    return lang.replace("_", "-").split("-")[0].lower()
+
+
+def dominant_script(histogram: Dict[str, int]) -> Optional[str]:
+    """Script of at least DOMINANT_SHARE of the letters, if any."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    # Japanese mixes kanji with kana; any kana makes it Japanese
+    if histogram.get("kana") and (
+        histogram["kana"] + histogram.get("han", 0) >= DOMINANT_SHARE * total
+    ):
+        return "kana"
+    script = max(histogram, key=histogram.get)
+    return script if histogram[script] >= DOMINANT_SHARE * total else None
+
+
+def _best_function_word_language(script: str, words: Iterable[str]) -> Optional[str]:
+    words = [w.lower() for w in words]
+    if not words:
+        return None
+    best, best_hits = None, 0
+    for lang, vocabulary in _FUNCTION_WORDS[script].items():
+        hits = sum(1 for w in words if w in vocabulary)
+        if hits > best_hits:
+            best, best_hits = lang, hits
+        elif hits == best_hits:
+            best = None  # tie: undecided
+    # A single hit only decides a one-word text ("merci"): "To jest dobry
+    # dom" (Polish) or "Is het goed?" (Dutch) share one word with English
+    if best is None or best_hits < min(2, len(words)):
+        return None
+    if best_hits < FUNCTION_WORD_SHARE * len(words):
+        return None
+    return best
+
+
+def detect_language(text: str) -> Optional[str]:
+    """Language of text when the evidence is unambiguous, else None.
+
+    Args:
+        text: Text to inspect (URLs and mentions are ignored)
+
+    Returns:
+        Base language code ("zh", "ru", ...) or None
+    """
+    stripped = strip_non_text(text)
+    return _detect(stripped, script_histogram(stripped))
+
+
+def _detect(text: str, histogram: Dict[str, int]) -> Optional[str]:
+    script = dominant_script(histogram)
+    if script is None:
+        return None
+    if script in _SCRIPT_LANGUAGE:
+        return _SCRIPT_LANGUAGE[script]
+    if script == "cyrillic" and any(c in _UKRAINIAN_LETTERS for c in text):
+        return "uk"
+    if script in _FUNCTION_WORDS:
+        return _best_function_word_language(script, _WORD_RE.findall(text))
+    return None
+
+
+def _language_script(lang: str) -> Optional[str]:
+    for script, language in _SCRIPT_LANGUAGE.items():
+        if language == lang:
+            return script
+    for script, languages in _FUNCTION_WORDS.items():
+        if lang in languages:
+            return script
+    return None
+
+
+class SkipStats(BaseModel):
+    """Snapshot of skip classifier counters."""
+
+    checked: int = 0
+    skipped: int = 0
+    by_reason: Dict[str, int] = {}
+    chats: int = 0
+
+
+class SkipClassifier:
+    """Decides locally whether a text needs translating at all."""
+
+    def __init__(self, max_chats: int = 10_000):
+        """Initialize the classifier.
+
+        Args:
+            max_chats: Chats whose detected language is remembered
+        """
+        self.max_chats = max_chats
+        self._lock = threading.Lock()
+        self._chat_languages: "OrderedDict[str, str]" = OrderedDict()
+        self._checked = 0
+        self._by_reason: Dict[str, int] = {}
+
+    def classify(
+        self, text: str, dest_lang: str, chat_id: Optional[str] = None
+    ) -> Optional[str]:
+        """Reason why text needs no translation into dest_lang, or None.
+
+        Args:
+            text: Text to be translated
+            dest_lang: Destination language code
+            chat_id: Chat the text belongs to, for the per-chat fallback
+
+        Returns:
+            NO_TEXT, SAME_LANGUAGE, or None when the text must be translated
+        """
+        stripped = strip_non_text(text)
+        histogram = script_histogram(stripped)
+        reason = None
+        if not histogram:
+            reason = NO_TEXT
+        else:
+            language = self._detect_in_chat(stripped, histogram, chat_id)
+            dest = base_language(dest_lang) if dest_lang else ""
+            if language is not None and language == dest:
+                reason = SAME_LANGUAGE
+        with self._lock:
+            self._checked += 1
+            if reason is not None:
+                self._by_reason[reason] = self._by_reason.get(reason, 0) + 1
+        return reason
+
+    def chat_language(self, chat_id: str) -> Optional[str]:
+        """Language last detected in a chat."""
+        with self._lock:
+            return self._chat_languages.get(chat_id)
+
+    def stats(self) -> SkipStats:
+        """Return a snapshot of classifier counters."""
+        with self._lock:
+            return SkipStats(
+                checked=self._checked,
+                skipped=sum(self._by_reason.values()),
+                by_reason=dict(self._by_reason),
+                chats=len(self._chat_languages),
+            )
+
+    def _detect_in_chat(
+        self, text: str, histogram: Dict[str, int], chat_id: Optional[str]
+    ) -> Optional[str]:
+        language = _detect(text, histogram)
+        if chat_id is None:
+            return language
+        with self._lock:
+            if language is not None:
+                self._chat_languages[chat_id] = language
+                self._chat_languages.move_to_end(chat_id)
+                while len(self._chat_languages) > self.max_chats:
+                    self._chat_languages.popitem(last=False)
+                return language
+            cached = self._chat_languages.get(chat_id)
+        # Undecided text inherits the chat's language if written in its script
+        if cached is not None and dominant_script(histogram) == _language_script(cached):
+            return cached
+        return None
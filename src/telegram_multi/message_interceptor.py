@@ -6,13 +6,70 @@ Contract:
 - MessageInterceptor: Captures and modifies messages with translation
 - Preserves metadata (sender, timestamp)
 - Provides JavaScript injection for DOM integration
+- Multi-sentence messages are translated per segment (config
+  segment_messages) so repeated sentences hit the cache on their own
+- Texts that need no translation (emoji/numbers/URLs only, or already in
+  the destination language) are returned untranslated without a provider
+  call when config.skip_enabled; skips are counted in skip_stats()
+- The page script translates through the TRANSLATE_BINDING Playwright
+  binding (handled by translate_binding) in per-frame batches, so every
+  tab shares the Python cache, batching and rate limits;
+  config.js_transport="fetch" keeps direct calls to Google as a fallback
+- The page keeps translations in a bounded LRU persisted to IndexedDB
+  (per browser profile) with config.cache_ttl, so reopened chats paint
+  without a network round trip; translate_binding answers None for texts
+  it left unchanged, and the page never caches those
+- Added DOM nodes are queued without loss (deduplicated) and processed
+  in idle-time slices of at most config.js_slice_max_nodes nodes;
+  page_queue_stats() reads the page's queue counters
+- Messages are translated when an IntersectionObserver reports them:
+  visible ones first, those within config.js_prefetch_margin_px next,
+  at most config.js_max_concurrent_translations at a time; queued work
+  for messages scrolled out of range is cancelled
+- Messages are keyed by chat and DOM id (content hash as a fallback); a
+  re-rendered node of a translated message is painted synchronously
+  from a bounded index, and the auto-reply hook fires once per message
+- Message events are buffered by the page and delivered once per frame
+  as an array to the NEW_MESSAGES_BINDING binding; parse_page_messages()
+  validates a whole batch in one pass
+- The script body is minified and cached once per process; only the
+  small config payload differs per call. push_config() applies new
+  config values to a running page without a reload (chat switches keep
+  them; only panel edits are stored per chat), and a second injection
+  into the same page only applies its config
+- Overlays are cloned from templates, filled off-document and attached
+  in one write phase per animation frame; CSS containment isolates
+  them. config.js_reduced_motion (or the OS reduced-motion setting)
+  turns animations off
+- Composer drafts are translated speculatively while the user types
+  (DRAFT_BINDING, handled by translate_draft; superseded drafts of a
+  chat are cancelled). Send substitutes the ready translation at once
+  and only waits for a translation when the draft changed since
 """
 
+import asyncio
+import functools
 import json
+from collections import OrderedDict
 from enum import Enum
-from typing import Optional, Callable
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Any, Dict, List, Optional, Callable, Tuple
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, ValidationError
 from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.langdetect import SkipClassifier, SkipStats
+from src.telegram_multi.segmentation import SegmentedText, split_segments
+
+# Name of the Playwright binding the page script translates through
+TRANSLATE_BINDING = "tgTranslateBatch"
+# Global the page script keeps its DOM queue counters in
+PAGE_QUEUE_STATS = "__tgTranslateQueueStats"
+# Name of the Playwright binding receiving batches of message events
+NEW_MESSAGES_BINDING = "onNewMessages"
+# Page function that merges a config payload into the running script
+APPLY_CONFIG_FN = "__tgTranslateApplyConfig"
+# Name of the Playwright binding translating composer drafts
+DRAFT_BINDING = "tgTranslateDraft"
+# Chats whose latest draft translation is remembered
+MAX_DRAFT_CHATS = 256
 
 
 class MessageType(str, Enum):
@@ -36,22 +93,82 @@ class Message(BaseModel):
     translated_content: Optional[str] = Field(
         default=None, description="Translated message content"
     )
+    chat_id: Optional[str] = Field(
+        default=None, description="Chat the message belongs to"
+    )
+
+
+_MESSAGES = TypeAdapter(List[Message])
+
+
+def parse_page_messages(events: List[Dict[str, Any]]) -> List[Message]:
+    """Validate a batch of page message events in one pass.
+
+    Malformed events are dropped; the rest keep their order.
+
+    Args:
+        events: Event dicts ({"type", "content", "sender", "timestamp",
+            "chatId"}) delivered through NEW_MESSAGES_BINDING
+
+    Returns:
+        Messages in event order
+    """
+    fields = [
+        {
+            "message_type": event.get("type"),
+            "content": event.get("content"),
+            "sender": event.get("sender"),
+            "timestamp": event.get("timestamp"),
+            "chat_id": event.get("chatId"),
+        }
+        for event in events
+        if isinstance(event, dict)
+    ]
+    try:
+        return _MESSAGES.validate_python(fields)
+    except ValidationError as e:
+        bad = {err["loc"][0] for err in e.errors() if err["loc"]}
+        return _MESSAGES.validate_python(
+            [item for i, item in enumerate(fields) if i not in bad]
+        )
+
+
+class PageQueueStats(BaseModel):
+    """Snapshot of the page script's DOM processing queue counters."""
+
+    queued: int = 0
+    deduplicated: int = 0
+    processed: int = 0
+    dropped: int = 0
+    slices: int = 0
+    pending: int = 0
+    visible: int = 0
+    prefetched: int = 0
+    cancelled: int = 0
+    reused: int = 0
 
 
 class MessageInterceptor:
     """Message interceptor for capturing and translating messages."""
 
-    def __init__(self, config: TranslationConfig, translator=None):
+    def __init__(self, config: TranslationConfig, translator=None, scheduler=None):
         """Initialize message interceptor.
 
         Args:
             config: TranslationConfig with language pair and provider
             translator: Optional Translator instance for translations
+            scheduler: Optional BatchScheduler; async translations are then
+                micro-batched per language pair instead of sent one by one
         """
         self.config = config
         self.translator = translator
+        self.scheduler = scheduler
+        self.skipper = SkipClassifier() if config.skip_enabled else None
         self._on_message_received_callback: Optional[Callable] = None
         self._on_message_sending_callback: Optional[Callable] = None
+        # chat_id -> in-flight speculative translation / latest result
+        self._draft_tasks: Dict[str, "asyncio.Task[Message]"] = {}
+        self._drafts: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
 
     def on_message_received(self, callback: Callable[[Message], None]) -> None:
         """Register callback for incoming messages.
@@ -84,11 +201,12 @@ class MessageInterceptor:
         if not self.config.enabled or not self.translator:
             return message
 
+        if self._skip(message, self.config.target_lang):
+            return message
+
         try:
-            translated = self.translator.translate(
-                message.content,
-                src_lang=self.config.source_lang,
-                dest_lang=self.config.target_lang,
+            translated = self._translate(
+                message.content, self.config.source_lang, self.config.target_lang
             )
             message.translated_content = translated
         except Exception:
@@ -115,48 +233,356 @@ class MessageInterceptor:
         if not self.config.enabled or not self.translator:
             return message
 
+        src_lang, dest_lang = self._direction_langs(message)
+        if self._skip(message, dest_lang):
+            return message
+
         try:
-            if message.message_type == MessageType.INCOMING:
-                # Received message: translate TO user's language
-                translated = self.translator.translate(
-                    message.content,
-                    src_lang=self.config.target_lang,  # From foreign
-                    dest_lang=self.config.source_lang,  # To user's lang
-                )
-            else:
-                # Sending message: translate FROM user's language
-                translated = self.translator.translate(
-                    message.content,
-                    src_lang=self.config.source_lang,  # From user's lang
-                    dest_lang=self.config.target_lang,  # To foreign
-                )
-            message.translated_content = translated
+            message.translated_content = self._translate(
+                message.content, src_lang, dest_lang
+            )
         except Exception:
             pass
 
         return message
 
-    def get_injection_script(self) -> str:
-        """Get JavaScript injection script for DOM integration.
+    async def translate_message_async(self, message: Message) -> Message:
+        """Async counterpart of translate_message (does not block the loop).
+
+        Args:
+            message: Message to translate
 
         Returns:
-            JavaScript code to inject into Telegram Web A
+            Message with translated_content field populated
+        """
+        if not self.config.enabled or not self.translator:
+            return message
+
+        if self._skip(message, self.config.target_lang):
+            return message
+
+        try:
+            message.translated_content = await self._translate_async(
+                message.content, self.config.source_lang, self.config.target_lang
+            )
+        except Exception:
+            # Graceful fallback: keep original translation field as None
+            pass
+
+        return message
+
+    async def translate_bidirectional_async(self, message: Message) -> Message:
+        """Async counterpart of translate_bidirectional.
+
+        Args:
+            message: Message to translate
+
+        Returns:
+            Message with translated_content field populated
+        """
+        if not self.config.enabled or not self.translator:
+            return message
+
+        src_lang, dest_lang = self._direction_langs(message)
+        if self._skip(message, dest_lang):
+            return message
+
+        try:
+            message.translated_content = await self._translate_async(
+                message.content, src_lang, dest_lang
+            )
+        except Exception:
+            pass
+
+        return message
+
+    async def translate_texts_async(
+        self, requests: List[Tuple[str, str, str]]
+    ) -> List[str]:
+        """Translate (text, src_lang, dest_lang) requests concurrently.
+
+        Requests go through the skip check, segmentation and the scheduler
+        like messages do. Skipped or failed texts come back unchanged.
+
+        Args:
+            requests: (text, src_lang, dest_lang) tuples
+
+        Returns:
+            Translations in request order
+        """
+
+        async def translate_one(text: str, src_lang: str, dest_lang: str) -> str:
+            if not self.config.enabled or not self.translator:
+                return text
+            if self.skipper is not None and self.skipper.classify(text, dest_lang):
+                return text
+            try:
+                return await self._translate_async(text, src_lang, dest_lang)
+            except Exception:
+                return text
+
+        return list(await asyncio.gather(*(translate_one(*r) for r in requests)))
+
+    async def translate_binding(
+        self, source: Any, items: List[Dict[str, Any]]
+    ) -> List[Optional[str]]:
+        """Playwright binding handler for the page script's batches.
+
+        Args:
+            source: Binding source (page/frame), unused
+            items: [{"text", "sourceLang", "targetLang"}, ...] collected by
+                the page during one animation frame
+
+        Returns:
+            Translations in item order; None where the text came back
+            unchanged (skipped, disabled or failed), so the page does not
+            cache the original as its translation
+        """
+        requests = [
+            (
+                str(item.get("text") or ""),
+                item.get("sourceLang") or self.config.source_lang,
+                item.get("targetLang") or self.config.target_lang,
+            )
+            for item in items
+        ]
+        results = await self.translate_texts_async(requests)
+        return [
+            None if result == text else result
+            for (text, _, _), result in zip(requests, results)
+        ]
+
+    def skip_stats(self) -> Optional[SkipStats]:
+        """Counters of the skip fast path (None when it is disabled)."""
+        return self.skipper.stats() if self.skipper is not None else None
+
+    async def translate_draft(self, source: Any, draft: Dict[str, Any]) -> Optional[str]:
+        """Playwright binding handler translating a composer draft.
+
+        The draft is translated as an outgoing message (after the
+        on_message_sending callback). A newer draft for the same chat
+        cancels this one unless this one is final (the user pressed send).
+
+        Args:
+            source: Binding source (page/frame), unused
+            draft: {"text", "chatId", "final"} from the page script
+
+        Returns:
+            Text to send, or None if the draft was superseded
+        """
+        text = str(draft.get("text") or "")
+        chat_id = str(draft.get("chatId") or "")
+        cached = self.draft_translation(chat_id, text)
+        if cached is not None:
+            return cached
+
+        previous = self._draft_tasks.get(chat_id)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        task = asyncio.ensure_future(self._translate_outgoing(text, chat_id))
+        if not draft.get("final"):
+            self._draft_tasks[chat_id] = task
+        try:
+            message = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return None  # superseded by a newer draft
+            raise
+        finally:
+            if self._draft_tasks.get(chat_id) is task:
+                del self._draft_tasks[chat_id]
+
+        result = message.translated_content or message.content
+        self._drafts[chat_id] = (text, result)
+        self._drafts.move_to_end(chat_id)
+        while len(self._drafts) > MAX_DRAFT_CHATS:
+            self._drafts.popitem(last=False)
+        return result
+
+    def draft_translation(self, chat_id: str, text: str) -> Optional[str]:
+        """Latest speculative translation of a chat, if it is for text."""
+        entry = self._drafts.get(chat_id)
+        if entry is None or entry[0] != text:
+            return None
+        return entry[1]
+
+    async def _translate_outgoing(self, text: str, chat_id: str) -> Message:
+        message = Message(
+            message_type=MessageType.OUTGOING, content=text, chat_id=chat_id or None
+        )
+        if self._on_message_sending_callback is not None:
+            message = self._on_message_sending_callback(message) or message
+        return await self.translate_bidirectional_async(message)
+
+    async def page_queue_stats(self, page: Any) -> PageQueueStats:
+        """Read the DOM queue counters of a page running the injection script.
+
+        Args:
+            page: Playwright Page (or Frame) the script was injected into
+
+        Returns:
+            PageQueueStats; all zero if the script is not running
         """
-        # Build dynamic CONFIG from self.config
-        config_dict = {
+        stats = await page.evaluate(f"() => window.{PAGE_QUEUE_STATS} || null")
+        return PageQueueStats(**(stats or {}))
+
+    def _skip(self, message: Message, dest_lang: str) -> bool:
+        """Return the message untranslated if it needs no translation."""
+        if self.skipper is None:
+            return False
+        if self.skipper.classify(message.content, dest_lang, message.chat_id) is None:
+            return False
+        message.translated_content = message.content
+        return True
+
+    def _segments(self, text: str) -> Optional[SegmentedText]:
+        """Segmentation of text if it should be translated per segment."""
+        if not self.config.segment_messages:
+            return None
+        segmented = split_segments(text)
+        if segmented.segments == [text]:
+            return None
+        return segmented
+
+    def _translate(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Translate text, per segment when it has several."""
+        if self._segments(text) is not None:
+            return self.translator.translate_segmented(text, src_lang, dest_lang)
+        return self.translator.translate(text, src_lang=src_lang, dest_lang=dest_lang)
+
+    async def _translate_async(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Translate through the scheduler when present, else directly."""
+        segmented = self._segments(text)
+        if self.scheduler is not None:
+            if segmented is None:
+                return await self.scheduler.translate(text, src_lang, dest_lang)
+            # Segments join the scheduler's batches like separate messages
+            translations = await asyncio.gather(
+                *(
+                    self.scheduler.translate(segment, src_lang, dest_lang)
+                    for segment in segmented.segments
+                )
+            )
+            return segmented.join(list(translations))
+        if segmented is not None:
+            return await self.translator.translate_segmented_async(
+                text, src_lang, dest_lang
+            )
+        return await self.translator.translate_async(
+            text, src_lang=src_lang, dest_lang=dest_lang
+        )
+
+    def _direction_langs(self, message: Message) -> Tuple[str, str]:
+        """Return (src_lang, dest_lang) for a message's direction."""
+        if message.message_type == MessageType.INCOMING:
+            # Received message: translate FROM foreign TO user's language
+            return self.config.target_lang, self.config.source_lang
+        # Sending message: translate FROM user's language TO foreign
+        return self.config.source_lang, self.config.target_lang
+
+    def config_payload(self) -> Dict[str, Any]:
+        """Config values the page script runs with.
+
+        Returns:
+            JSON-serializable dict (the page's DEFAULT_CONFIG)
+        """
+        return {
             "enabled": self.config.enabled,
             "sourceLang": self.config.source_lang,
             "targetLang": self.config.target_lang,
             "displayMode": self.config.display_mode,
             "showHeader": self.config.show_header,
             "jsDebounceMs": self.config.js_debounce_ms,
-            "translateUrl": "https://translate.googleapis.com/translate_a/single"
+            "sliceMaxNodes": self.config.js_slice_max_nodes,
+            "queueStatsGlobal": PAGE_QUEUE_STATS,
+            "prefetchMarginPx": self.config.js_prefetch_margin_px,
+            "maxConcurrentTranslations": self.config.js_max_concurrent_translations,
+            "transport": self.config.js_transport,
+            "cacheTtl": self.config.cache_ttl,
+            "cacheMaxEntries": self.config.js_cache_max_entries,
+            "translateBinding": TRANSLATE_BINDING,
+            "messagesBinding": NEW_MESSAGES_BINDING,
+            "applyConfigFn": APPLY_CONFIG_FN,
+            "reducedMotion": self.config.js_reduced_motion,
+            "draftTranslation": self.config.js_draft_translation,
+            "draftDebounceMs": self.config.js_draft_debounce_ms,
+            "draftBinding": DRAFT_BINDING,
+            "translateUrl": "https://translate.googleapis.com/translate_a/single",
         }
-        config_json = json.dumps(config_dict, indent=2)
+
+    def get_injection_script(self) -> str:
+        """Get JavaScript injection script for DOM integration.
+
+        Returns:
+            JavaScript code to inject into Telegram Web A
+        """
+        config_json = json.dumps(self.config_payload(), separators=(",", ":"))
         return _get_injection_script(config_json)
 
+    async def push_config(
+        self, page: Any, config: Optional[TranslationConfig] = None
+    ) -> bool:
+        """Apply config values to a running page without reloading it.
+
+        Language pair, display mode, debounce and the other payload values
+        take effect for the next messages the page processes.
+
+        Args:
+            page: Playwright Page (or Frame) the script was injected into
+            config: New TranslationConfig; replaces this interceptor's
+                config when given
+
+        Returns:
+            True if the page script applied the values, False if it is
+            not running in the page
+        """
+        if config is not None:
+            self.config = config
+        applied = await page.evaluate(
+            f"(payload) => typeof window.{APPLY_CONFIG_FN} === 'function'"
+            f" && window.{APPLY_CONFIG_FN}(payload)",
+            self.config_payload(),
+        )
+        return bool(applied)
+
+
+# Stands in for the config JSON in the cached script template
+_CONFIG_PLACEHOLDER = "__TG_TRANSLATE_CONFIG__"
+
+
+def _minify_js(source: str) -> str:
+    """Strip indentation, blank lines and whole-line // comments.
+
+    Line breaks are kept, so automatic semicolon insertion and template
+    literals behave as in the source.
+    """
+    lines = (line.strip() for line in source.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+@functools.lru_cache(maxsize=1)
+def _script_template() -> Tuple[str, str]:
+    """Minified script body split around the config, built once per process."""
+    prefix, suffix = _minify_js(_build_injection_script(_CONFIG_PLACEHOLDER)).split(
+        _CONFIG_PLACEHOLDER
+    )
+    return prefix, suffix
+
 
 def _get_injection_script(config_json: str) -> str:
+    """Injection script for a config payload.
+
+    Args:
+        config_json: JSON string of configuration object
+
+    Returns:
+        Cached minified script body with config_json as DEFAULT_CONFIG
+    """
+    prefix, suffix = _script_template()
+    return prefix + config_json + suffix
+
+
+def _build_injection_script(config_json: str) -> str:
     """Generate JavaScript injection script for message interception.
 
     Args:
@@ -178,6 +604,15 @@ def _get_injection_script(config_json: str) -> str:
         + config_json
         + """;
 
+  // The script can be injected twice into one page (init script plus an
+  // explicit injection); the second copy only applies its config
+  if (window.__tgTranslateLoaded) {
+    const apply = window[DEFAULT_CONFIG.applyConfigFn];
+    if (typeof apply === 'function') apply(DEFAULT_CONFIG);
+    return;
+  }
+  window.__tgTranslateLoaded = true;
+
   // Load config from localStorage or use defaults
   function getChatId() {
     const hash = window.location.hash;
@@ -189,13 +624,27 @@ def _get_injection_script(config_json: str) -> str:
 
   let CONFIG = { ...DEFAULT_CONFIG };
 
+  // Only settings edited in the panel are stored per chat; everything
+  // else comes from DEFAULT_CONFIG, so values pushed from Python are not
+  // reverted by a stored snapshot (older full snapshots are filtered too)
+  const USER_CONFIG_KEYS = ['displayMode'];
+
+  function savedSessionConfig(chatId) {
+    const saved = localStorage.getItem('tg_apple_translate_config_' + chatId);
+    const parsed = saved ? JSON.parse(saved) : {};
+    const edits = {};
+    USER_CONFIG_KEYS.forEach(key => {
+      if (key in parsed) edits[key] = parsed[key];
+    });
+    return edits;
+  }
+
   function loadConfig() {
     const chatId = getChatId();
     const savedGlobal = localStorage.getItem('tg_apple_translate_config');
-    const savedSession = localStorage.getItem('tg_apple_translate_config_' + chatId);
     
     const globalConfig = savedGlobal ? JSON.parse(savedGlobal) : DEFAULT_CONFIG;
-    const sessionConfig = savedSession ? JSON.parse(savedSession) : {};
+    const sessionConfig = savedSessionConfig(chatId);
     
     // Merge: Default < Global < Session
     CONFIG = { ...DEFAULT_CONFIG, ...globalConfig, ...sessionConfig };
@@ -203,11 +652,24 @@ def _get_injection_script(config_json: str) -> str:
     updateSettingsUI();
   }
 
-  function saveConfig() {
+  function saveConfig(key) {
     const chatId = getChatId();
-    // Save to session-specific storage
-    localStorage.setItem('tg_apple_translate_config_' + chatId, JSON.stringify(CONFIG));
+    // Save the edited key to session-specific storage
+    const edits = { ...savedSessionConfig(chatId), [key]: CONFIG[key] };
+    localStorage.setItem('tg_apple_translate_config_' + chatId, JSON.stringify(edits));
+  }
+
+  // Values pushed from Python replace the defaults and apply to the
+  // current chat at once; later chat switches merge them like defaults
+  function applyConfig(update) {
+    Object.assign(DEFAULT_CONFIG, update);
+    CONFIG = { ...CONFIG, ...update };
+    updateSettingsUI();
+    applyMotionMode();
+    rebuildNearObserver();
+    return true;
   }
+  window[DEFAULT_CONFIG.applyConfigFn || '__tgTranslateApplyConfig'] = applyConfig;
 
   loadConfig();
   window.addEventListener('hashchange', () => {
@@ -290,6 +752,8 @@ def _get_injection_script(config_json: str) -> str:
       animation: applePopIn 0.4s cubic-bezier(0.2, 0.8, 0.2, 1) forwards;
       pointer-events: auto;
       user-select: text;
+      /* Overlay changes never relayout or repaint the rest of the chat */
+      contain: layout style paint;
     }
 
     @keyframes applePopIn {
@@ -466,28 +930,325 @@ def _get_injection_script(config_json: str) -> str:
     }
     input:checked + .tg-apple-slider { background-color: var(--apple-blue); }
     input:checked + .tg-apple-slider:before { transform: translateX(20px); }
+
+    /* Reduced motion: no entrance/shimmer animations */
+    @media (prefers-reduced-motion: reduce) {
+      .tg-apple-overlay, .tg-apple-settings-panel { animation: none; opacity: 1; transform: none; }
+      .tg-apple-loading { animation: none; }
+    }
+
+    /* Lite mode for low-end hosts: no animations and no backdrop blur */
+    .tg-apple-lite .tg-apple-overlay,
+    .tg-apple-lite .tg-apple-settings-panel {
+      animation: none;
+      opacity: 1;
+      transform: none;
+      backdrop-filter: none;
+      -webkit-backdrop-filter: none;
+    }
+    .tg-apple-lite .tg-apple-loading { animation: none; }
   `;
   document.head.appendChild(style);
 
-  // --- Utilities ---
-  function debounce(fn, delay) {
-    let timeout;
-    return (...args) => {
-      clearTimeout(timeout);
-      timeout = setTimeout(() => fn(...args), delay);
-    };
+  function applyMotionMode() {
+    document.documentElement.classList.toggle('tg-apple-lite', !!CONFIG.reducedMotion);
+  }
+
+  function motionReduced() {
+    return !!CONFIG.reducedMotion ||
+      !!(window.matchMedia && window.matchMedia('(prefers-reduced-motion: reduce)').matches);
+  }
+
+  applyMotionMode();
+
+  // --- DOM Write Phase ---
+  // DOM reads happen when work is scheduled; writes are batched into the
+  // next animation frame so each frame recalculates style and layout once
+  let domWrites = [];
+
+  function scheduleWrite(fn) {
+    if (!domWrites.length) onNextFrame(flushWrites);
+    domWrites.push(fn);
+  }
+
+  function flushWrites() {
+    const writes = domWrites;
+    domWrites = [];
+    writes.forEach(fn => fn());
   }
 
   const processedMessages = new WeakSet();
 
+  // --- Skip Fast Path ---
+  // Emoji/number/URL-only texts and texts already written in the target
+  // language's script never reach the translation API
+  const NON_TEXT_RE = /https?:\\/\\/\\S+|www\\.\\S+|\\S+@\\S+\\.\\w+|[@#][\\p{L}\\p{N}_]+/gu;
+  const LETTER_RE = /\\p{L}/gu;
+  const KANA_RE = /[\\p{Script=Hiragana}\\p{Script=Katakana}]/u;
+  // Only scripts used by a single language decide on their own
+  const LANGUAGE_SCRIPTS = {
+    zh: /\\p{Script=Han}/gu,
+    ja: /[\\p{Script=Han}\\p{Script=Hiragana}\\p{Script=Katakana}]/gu,
+    ko: /\\p{Script=Hangul}/gu,
+    el: /\\p{Script=Greek}/gu,
+    he: /\\p{Script=Hebrew}/gu,
+    ar: /\\p{Script=Arabic}/gu,
+    hi: /\\p{Script=Devanagari}/gu,
+    th: /\\p{Script=Thai}/gu
+  };
+  const skipStats = { checked: 0, skipped: 0, noText: 0, sameLanguage: 0 };
+  window.__tgTranslateSkipStats = skipStats;
+
+  function skipReason(text, targetLang) {
+    skipStats.checked++;
+    const stripped = text.replace(NON_TEXT_RE, ' ');
+    const letters = (stripped.match(LETTER_RE) || []).length;
+    let reason = null;
+    if (letters === 0) {
+      reason = 'noText';
+    } else {
+      const lang = (targetLang || '').split('-')[0].toLowerCase();
+      const scriptRe = LANGUAGE_SCRIPTS[lang];
+      const hasKana = KANA_RE.test(stripped);
+      if (scriptRe && (lang === 'ja') === hasKana &&
+          (stripped.match(scriptRe) || []).length >= 0.8 * letters) {
+        reason = 'sameLanguage';
+      }
+    }
+    if (reason) {
+      skipStats.skipped++;
+      skipStats[reason]++;
+    }
+    return reason;
+  }
+
+  // --- Translation Cache ---
+  // Bounded LRU in memory, persisted to IndexedDB (one database per
+  // browser profile) so translations survive reloads and restarts
+  const CACHE_DB_NAME = 'tg-apple-translate';
+  const CACHE_STORE = 'translations';
+  const CACHE_FLUSH_MS = 500;
+  const CACHE_PRELOAD = 200;
+  const translationCache = new Map(); // key -> { value, storedAt }
+  const pendingCacheWrites = new Map(); // key -> record
+  let cacheFlushTimer = null;
+  let cacheDbPromise = null;
+
+  function cacheMaxEntries() {
+    return CONFIG.cacheMaxEntries || 5000;
+  }
+
+  function cacheTtlMs() {
+    // cache_ttl <= 0 means no expiry, as in the Python cache
+    return CONFIG.cacheTtl > 0 ? CONFIG.cacheTtl * 1000 : Infinity;
+  }
+
+  function isFresh(storedAt) {
+    return Date.now() - storedAt < cacheTtlMs();
+  }
+
+  // A value equal to its source text is a failed or skipped translation
+  // (entries written before those were kept out of the cache)
+  function isEcho(key, value) {
+    return key.slice(key.indexOf(':', key.indexOf(':') + 1) + 1) === value;
+  }
+
+  function openCacheDb() {
+    if (cacheDbPromise) return cacheDbPromise;
+    cacheDbPromise = new Promise(resolve => {
+      if (!window.indexedDB) return resolve(null);
+      let request;
+      try {
+        request = window.indexedDB.open(CACHE_DB_NAME, 1);
+      } catch (e) {
+        return resolve(null);
+      }
+      request.onupgradeneeded = () => {
+        const store = request.result.createObjectStore(CACHE_STORE, { keyPath: 'key' });
+        store.createIndex('usedAt', 'usedAt');
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => resolve(null);
+      request.onblocked = () => resolve(null);
+    });
+    return cacheDbPromise;
+  }
+
+  function memoryGet(key) {
+    const entry = translationCache.get(key);
+    if (!entry) return undefined;
+    if (!isFresh(entry.storedAt)) {
+      translationCache.delete(key);
+      return undefined;
+    }
+    // Re-insert to mark as most recently used
+    translationCache.delete(key);
+    translationCache.set(key, entry);
+    return entry.value;
+  }
+
+  function memoryPut(key, value, storedAt) {
+    translationCache.delete(key);
+    translationCache.set(key, { value, storedAt });
+    while (translationCache.size > cacheMaxEntries()) {
+      translationCache.delete(translationCache.keys().next().value);
+    }
+  }
+
+  async function persistentGet(key) {
+    const db = await openCacheDb();
+    if (!db) return null;
+    return new Promise(resolve => {
+      try {
+        const request = db.transaction(CACHE_STORE, 'readonly').objectStore(CACHE_STORE).get(key);
+        request.onsuccess = () => resolve(request.result || null);
+        request.onerror = () => resolve(null);
+      } catch (e) {
+        resolve(null);
+      }
+    });
+  }
+
+  function queueCacheWrite(record) {
+    pendingCacheWrites.set(record.key, record);
+    if (!cacheFlushTimer) cacheFlushTimer = setTimeout(flushCacheWrites, CACHE_FLUSH_MS);
+  }
+
+  // Writes (new entries and LRU touches) go out in one transaction,
+  // followed by trimming the least recently used beyond the bound
+  async function flushCacheWrites() {
+    cacheFlushTimer = null;
+    const records = Array.from(pendingCacheWrites.values());
+    pendingCacheWrites.clear();
+    const db = await openCacheDb();
+    if (!db || !records.length) return;
+    try {
+      const tx = db.transaction(CACHE_STORE, 'readwrite');
+      const store = tx.objectStore(CACHE_STORE);
+      records.forEach(record => store.put(record));
+      const countRequest = store.count();
+      countRequest.onsuccess = () => {
+        let excess = countRequest.result - cacheMaxEntries();
+        if (excess <= 0) return;
+        store.index('usedAt').openCursor().onsuccess = (event) => {
+          const cursor = event.target.result;
+          if (!cursor || excess <= 0) return;
+          cursor.delete();
+          excess--;
+          cursor.continue();
+        };
+      };
+    } catch (e) {
+      console.warn('[Translation] Cache write failed:', e);
+    }
+  }
+
+  // Warm the memory LRU with the most recently used translations and
+  // drop expired ones
+  async function preloadCache() {
+    const db = await openCacheDb();
+    if (!db) return;
+    try {
+      const tx = db.transaction(CACHE_STORE, 'readwrite');
+      const recent = [];
+      tx.objectStore(CACHE_STORE).index('usedAt').openCursor(null, 'prev').onsuccess = (event) => {
+        const cursor = event.target.result;
+        if (!cursor) {
+          // Insert oldest first so the memory LRU order matches usedAt
+          recent.reverse().forEach(record => {
+            if (!translationCache.has(record.key)) {
+              memoryPut(record.key, record.value, record.storedAt);
+            }
+          });
+          return;
+        }
+        const record = cursor.value;
+        if (!isFresh(record.storedAt) || isEcho(record.key, record.value)) {
+          cursor.delete();
+        } else if (recent.length < CACHE_PRELOAD) {
+          recent.push(record);
+        }
+        cursor.continue();
+      };
+    } catch (e) {
+      console.warn('[Translation] Cache preload failed:', e);
+    }
+  }
+
+  async function cacheGet(key) {
+    const value = memoryGet(key);
+    if (value !== undefined) return value;
+    const record = await persistentGet(key);
+    if (!record) return null;
+    if (!isFresh(record.storedAt) || isEcho(key, record.value)) return null;
+    memoryPut(key, record.value, record.storedAt);
+    queueCacheWrite({ ...record, usedAt: Date.now() });
+    return record.value;
+  }
+
+  function cachePut(key, value) {
+    const now = Date.now();
+    memoryPut(key, value, now);
+    queueCacheWrite({ key, value, storedAt: now, usedAt: now });
+  }
+
+  preloadCache();
+
   // --- Translation Logic ---
-  const translationCache = new Map();
+  // Identical texts requested together share one request
+  const inflightTranslations = new Map();
+
+  // Binding transport: requests made during one animation frame are sent
+  // to Python as a single batch
+  let pendingTranslations = [];
+  let flushScheduled = false;
+
+  function onNextFrame(fn) {
+    // rAF does not fire in background tabs
+    if (document.hidden || !window.requestAnimationFrame) {
+      setTimeout(fn, 16);
+    } else {
+      window.requestAnimationFrame(fn);
+    }
+  }
 
-  async function translateText(text, targetLang) {
-    if (!text || text.length < 2) return null;
-    const cacheKey = `${text}:${targetLang}`;
-    if (translationCache.has(cacheKey)) return translationCache.get(cacheKey);
+  function scheduleFlush() {
+    if (flushScheduled) return;
+    flushScheduled = true;
+    onNextFrame(flushTranslations);
+  }
+
+  async function flushTranslations() {
+    flushScheduled = false;
+    const batch = pendingTranslations;
+    pendingTranslations = [];
+    if (!batch.length) return;
+    try {
+      const results = await window[CONFIG.translateBinding](batch.map(item => ({
+        text: item.text,
+        sourceLang: item.sourceLang,
+        targetLang: item.targetLang
+      })));
+      batch.forEach((item, i) => item.resolve(results && results[i] != null ? results[i] : null));
+    } catch (e) {
+      console.warn('[Translation] Binding error:', e);
+      batch.forEach(item => item.resolve(null));
+    }
+  }
+
+  function translateViaBinding(text, targetLang) {
+    return new Promise(resolve => {
+      pendingTranslations.push({
+        text,
+        sourceLang: CONFIG.sourceLang || 'auto',
+        targetLang,
+        resolve
+      });
+      scheduleFlush();
+    });
+  }
 
+  async function translateViaFetch(text, targetLang) {
     try {
       const params = new URLSearchParams({
         client: 'gtx',
@@ -499,9 +1260,7 @@ def _get_injection_script(config_json: str) -> str:
       const response = await fetch(`${CONFIG.translateUrl}?${params}`);
       const data = await response.json();
       if (data && data[0]) {
-        const translated = data[0].map(item => item[0]).join('');
-        translationCache.set(cacheKey, translated);
-        return translated;
+        return data[0].map(item => item[0]).join('');
       }
     } catch (e) {
       console.warn('[Translation] API error:', e);
@@ -509,8 +1268,38 @@ def _get_injection_script(config_json: str) -> str:
     return null;
   }
 
+  async function translateText(text, targetLang) {
+    if (!text || text.length < 2) return null;
+    if (skipReason(text, targetLang)) return null;
+    const cacheKey = `${CONFIG.sourceLang || 'auto'}:${targetLang}:${text}`;
+    const memoized = memoryGet(cacheKey);
+    if (memoized !== undefined) return memoized;
+    if (inflightTranslations.has(cacheKey)) return inflightTranslations.get(cacheKey);
+
+    const request = (async () => {
+      // A reopened chat paints from IndexedDB without a network call
+      const stored = await cacheGet(cacheKey);
+      if (stored) return stored;
+      // Direct fetch is the fallback when the binding is not exposed
+      const useBinding = CONFIG.transport !== 'fetch' &&
+        typeof window[CONFIG.translateBinding] === 'function';
+      const translated = useBinding
+        ? await translateViaBinding(text, targetLang)
+        : await translateViaFetch(text, targetLang);
+      // Failures and skips come back as null (or the text itself) and are
+      // never cached, so a later attempt can still translate them
+      if (!translated || translated === text) return null;
+      cachePut(cacheKey, translated);
+      return translated;
+    })().finally(() => inflightTranslations.delete(cacheKey));
+    inflightTranslations.set(cacheKey, request);
+    return request;
+  }
+
   // --- Bilingual Display Logic ---
   function renderBilingualContent(content, originalText, translatedText) {
+    // Built off-document and swapped in with one mutation
+    const fragment = document.createDocumentFragment();
     // For bilingual mode, show both original and translated
     if (CONFIG.displayMode === 'bilingual') {
       const originalDiv = document.createElement('div');
@@ -521,129 +1310,552 @@ def _get_injection_script(config_json: str) -> str:
       translatedDiv.className = 'tg-apple-bilingual-translated';
       translatedDiv.textContent = translatedText;
 
-      content.innerHTML = '';
-      content.appendChild(originalDiv);
-      content.appendChild(translatedDiv);
+      fragment.appendChild(originalDiv);
+      fragment.appendChild(translatedDiv);
     } else {
       // Replace mode: just show translated
-      content.textContent = translatedText;
+      fragment.appendChild(document.createTextNode(translatedText));
     }
+    content.replaceChildren(fragment);
   }
 
   // --- Overlay Injection ---
-  async function addTranslationOverlay(element) {
-    if (!CONFIG.enabled) return;
-    if (processedMessages.has(element)) return;
-    if (element.querySelector('.tg-apple-overlay')) return;
-
-    // Find text node
+  function messageText(element) {
     const textNode = element.querySelector('.text-content, .message-content') || element;
-    const originalText = (textNode.textContent || '').trim();
-    if (!originalText || originalText.length < 2) return;
+    return (textNode.textContent || '').trim();
+  }
 
-    processedMessages.add(element);
+  // --- Message Identity ---
+  // Virtual scrolling recreates message nodes, so messages are keyed by
+  // the id in their data attributes (content hash as a fallback) and
+  // finished translations are indexed by that key
+  const MESSAGE_INDEX_MAX = 2000;
+  const messageIndex = new Map(); // key -> { text, lang, translated }
+  const notifiedKeys = new Map(); // key -> true, insertion-ordered
+
+  function hashText(text) {
+    // 32-bit FNV-1a
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < text.length; i++) {
+      hash ^= text.charCodeAt(i);
+      hash = Math.imul(hash, 0x01000193);
+    }
+    return (hash >>> 0).toString(36);
+  }
+
+  function messageKey(element, text) {
+    const holder = element.closest
+      ? element.closest('[data-message-id], [data-mid], [id^="message"]') || element
+      : element;
+    const id = holder.dataset?.messageId || holder.dataset?.mid ||
+      (holder.id && holder.id.startsWith('message') ? holder.id : '');
+    // Both forms are chat-scoped: the same text in another chat is
+    // another message (and fires the auto-reply hook again)
+    const chatId = getChatId();
+    return id ? `${chatId}:${id}` : `${chatId}:h:${text.length}:${hashText(text)}`;
+  }
+
+  function boundedSet(map, key, value) {
+    map.delete(key);
+    map.set(key, value);
+    while (map.size > MESSAGE_INDEX_MAX) map.delete(map.keys().next().value);
+  }
 
-    // Create container
-    const overlay = document.createElement('div');
-    overlay.className = 'tg-apple-overlay';
+  function indexedTranslation(key, text) {
+    const entry = messageIndex.get(key);
+    // An edited message keeps its id but needs a new translation, as does
+    // a message after the target language changed
+    if (!entry || entry.text !== text || entry.lang !== CONFIG.targetLang) return null;
+    boundedSet(messageIndex, key, entry);
+    return entry.translated;
+  }
+
+  // Overlay skeletons are built once and cloned
+  const overlayTemplates = new Map();
+
+  function overlayTemplate(showHeader) {
+    let template = overlayTemplates.get(showHeader);
+    if (template) return template;
+    template = document.createElement('div');
+    template.className = 'tg-apple-overlay';
 
     // Header (conditional based on showHeader config)
-    if (CONFIG.showHeader) {
+    if (showHeader) {
       const header = document.createElement('div');
       header.className = 'tg-apple-header';
       header.innerHTML = '<span class="tg-apple-icon">🌐</span> TRANSPARENT TRANSLATE';
-      overlay.appendChild(header);
+      template.appendChild(header);
     }
 
-    // Content (Loading State)
     const content = document.createElement('div');
     content.className = 'tg-apple-content';
+    template.appendChild(content);
+    overlayTemplates.set(showHeader, template);
+    return template;
+  }
+
+  // Detached overlay; the caller appends it in the write phase
+  function createOverlay() {
+    const overlay = overlayTemplate(!!CONFIG.showHeader).cloneNode(true);
+    return { overlay, content: overlay.lastChild };
+  }
+
+  // Re-rendered nodes of known messages are painted without a request
+  function paintKnownMessage(element, text) {
+    const translated = indexedTranslation(messageKey(element, text), text);
+    if (!translated || !CONFIG.enabled) return false;
+    processedMessages.add(element);
+    if (!element.querySelector('.tg-apple-overlay')) {
+      const { overlay, content } = createOverlay();
+      renderBilingualContent(content, text, translated);
+      scheduleWrite(() => element.appendChild(overlay));
+    }
+    queueStats.reused++;
+    return true;
+  }
+
+  async function addTranslationOverlay(element) {
+    if (!CONFIG.enabled) return;
+    if (processedMessages.has(element)) return;
+    if (element.querySelector('.tg-apple-overlay')) return;
+
+    // Read phase
+    const originalText = messageText(element);
+    if (!originalText || originalText.length < 2) return;
+
+    processedMessages.add(element);
+    unobserveMessage(element);
+    const key = messageKey(element, originalText);
+
+    // Content (Loading State), appended to the bubble in the write phase
+    const { overlay, content } = createOverlay();
     const loader = document.createElement('div');
     loader.className = 'tg-apple-loading';
     content.appendChild(loader);
-    overlay.appendChild(content);
-
-    // Append to message bubble
-    element.appendChild(overlay);
+    scheduleWrite(() => element.appendChild(overlay));
 
     const translated = await translateText(originalText, CONFIG.targetLang);
 
     if (translated && translated !== originalText) {
+      boundedSet(messageIndex, key, { text: originalText, lang: CONFIG.targetLang, translated });
       // Handle bilingual vs replace mode
-      renderBilingualContent(content, originalText, translated);
+      scheduleWrite(() => renderBilingualContent(content, originalText, translated));
+    } else if (motionReduced()) {
+      scheduleWrite(() => overlay.remove());
     } else {
       // Translation failed or same language -> Remove overlay gracefully
-      overlay.style.opacity = '0';
-      setTimeout(() => overlay.remove(), 300);
+      scheduleWrite(() => {
+        overlay.style.opacity = '0';
+        setTimeout(() => overlay.remove(), 300);
+      });
     }
+  }
 
-    // --- Auto-Reply Hook ---
-    if (window.onNewMessage) {
-      const isOutgoing = element.classList.contains('own') || 
-                         element.classList.contains('message-out') ||
-                         !!element.closest('.message-out');
-      
-      window.onNewMessage({
-        content: originalText,
-        sender: element.querySelector('.sender-title')?.textContent || 'Unknown',
-        type: isOutgoing ? 'outgoing' : 'incoming',
-        timestamp: new Date().toISOString()
+  // --- Auto-Reply Hook ---
+  // Fires once per message when it is discovered, whether or not it is
+  // ever scrolled into view, translated, or re-rendered. Events are sent
+  // to Python as one array per frame; a page without the batched binding
+  // falls back to one onNewMessage call per event.
+  let pendingMessageEvents = [];
+  let eventsFlushScheduled = false;
+
+  function hasMessageHook() {
+    return typeof window[CONFIG.messagesBinding] === 'function' ||
+      typeof window.onNewMessage === 'function';
+  }
+
+  function flushMessageEvents() {
+    eventsFlushScheduled = false;
+    const batch = pendingMessageEvents;
+    pendingMessageEvents = [];
+    if (!batch.length) return;
+    const deliver = window[CONFIG.messagesBinding];
+    if (typeof deliver === 'function') {
+      Promise.resolve(deliver(batch)).catch(e => console.warn('[AppleTranslate] Event delivery failed:', e));
+    } else if (typeof window.onNewMessage === 'function') {
+      batch.forEach(event => window.onNewMessage(event));
+    }
+  }
+
+  function notifyNewMessage(element, text) {
+    if (!hasMessageHook()) return;
+    if (!text || text.length < 2) return;
+    const key = messageKey(element, text);
+    if (notifiedKeys.has(key)) return;
+    boundedSet(notifiedKeys, key, true);
+    const isOutgoing = element.classList.contains('own') ||
+                       element.classList.contains('message-out') ||
+                       !!element.closest('.message-out');
+
+    pendingMessageEvents.push({
+      content: text,
+      sender: element.querySelector('.sender-title')?.textContent || 'Unknown',
+      type: isOutgoing ? 'outgoing' : 'incoming',
+      timestamp: new Date().toISOString(),
+      chatId: getChatId()
+    });
+    if (!eventsFlushScheduled) {
+      eventsFlushScheduled = true;
+      onNextFrame(flushMessageEvents);
+    }
+  }
+
+  // --- Viewport Priority ---
+  // Messages are translated when they come into view: visible ones first,
+  // those within prefetchMarginPx of the viewport afterwards. Queued work
+  // for messages that leave the prefetch band is cancelled.
+  const PRIORITY_VISIBLE = 0;
+  const PRIORITY_NEAR = 1;
+  const translationQueues = [new Set(), new Set()];
+  let activeTranslations = 0;
+
+  function enqueueTranslation(element, priority) {
+    if (processedMessages.has(element)) return;
+    const other = translationQueues[1 - priority];
+    if (translationQueues[priority].has(element)) return;
+    // Moves between bands; visible work is counted even when promoted
+    const moved = other.delete(element);
+    if (priority === PRIORITY_VISIBLE) {
+      queueStats.visible++;
+    } else if (!moved) {
+      queueStats.prefetched++;
+    }
+    translationQueues[priority].add(element);
+    pumpTranslations();
+  }
+
+  function cancelTranslation(element) {
+    if (translationQueues[PRIORITY_VISIBLE].delete(element) ||
+        translationQueues[PRIORITY_NEAR].delete(element)) {
+      queueStats.cancelled++;
+    }
+  }
+
+  function nextQueuedElement() {
+    for (const queue of translationQueues) {
+      for (const element of queue) {
+        queue.delete(element);
+        return element;
+      }
+    }
+    return null;
+  }
+
+  function pumpTranslations() {
+    const limit = CONFIG.maxConcurrentTranslations || 8;
+    while (activeTranslations < limit) {
+      const element = nextQueuedElement();
+      if (!element) return;
+      activeTranslations++;
+      addTranslationOverlay(element).finally(() => {
+        activeTranslations--;
+        pumpTranslations();
       });
     }
   }
 
+  const supportsIntersection = typeof window.IntersectionObserver === 'function';
+  let visibleObserver = null;
+  let nearObserver = null;
+  let nearMargin = 0;
+  if (supportsIntersection) {
+    visibleObserver = new IntersectionObserver((entries) => {
+      entries.forEach(entry => {
+        if (entry.isIntersecting) enqueueTranslation(entry.target, PRIORITY_VISIBLE);
+      });
+    });
+    nearObserver = createNearObserver();
+  }
+
+  function createNearObserver() {
+    nearMargin = CONFIG.prefetchMarginPx || 0;
+    return new IntersectionObserver((entries) => {
+      entries.forEach(entry => {
+        if (entry.isIntersecting) {
+          if (!translationQueues[PRIORITY_VISIBLE].has(entry.target)) {
+            enqueueTranslation(entry.target, PRIORITY_NEAR);
+          }
+        } else {
+          cancelTranslation(entry.target);
+        }
+      });
+    }, { rootMargin: `${nearMargin}px 0px ${nearMargin}px 0px` });
+  }
+
+  // rootMargin is fixed when an observer is created, so a new prefetch
+  // margin takes a new observer over the messages still awaiting translation
+  function rebuildNearObserver() {
+    if (!nearObserver || nearMargin === (CONFIG.prefetchMarginPx || 0)) return;
+    nearObserver.disconnect();
+    nearObserver = createNearObserver();
+    document.querySelectorAll(MESSAGE_SELECTOR).forEach(element => {
+      if (!processedMessages.has(element) && !pendingNodes.has(element)) {
+        nearObserver.observe(element);
+      }
+    });
+  }
+
+  function observeMessage(element) {
+    const text = messageText(element);
+    notifyNewMessage(element, text);
+    if (paintKnownMessage(element, text)) return;
+    if (!supportsIntersection) {
+      addTranslationOverlay(element);
+      return;
+    }
+    visibleObserver.observe(element);
+    nearObserver.observe(element);
+  }
+
+  // Once translated, a message no longer needs watching
+  function unobserveMessage(element) {
+    if (!supportsIntersection) return;
+    visibleObserver.unobserve(element);
+    nearObserver.unobserve(element);
+  }
+
   // --- Observer Logic ---
-  const processNewNodes = debounce((nodes) => {
+  // Added nodes accumulate in an insertion-ordered Set (so nothing from
+  // earlier mutation batches is lost and repeats are queued once) and are
+  // drained in idle-time slices instead of one long task
+  const MESSAGE_SELECTOR = '.message, .Message, [class*="message-content"]';
+  const FALLBACK_SLICE_MS = 8;
+  const pendingNodes = new Set();
+  const queueStats = {
+    queued: 0, deduplicated: 0, processed: 0, dropped: 0, slices: 0, pending: 0,
+    visible: 0, prefetched: 0, cancelled: 0, reused: 0
+  };
+  window[CONFIG.queueStatsGlobal || '__tgTranslateQueueStats'] = queueStats;
+  let drainScheduled = false;
+
+  function enqueueNodes(nodes) {
     nodes.forEach(node => {
       if (node.nodeType !== Node.ELEMENT_NODE) return;
+      if (pendingNodes.has(node)) {
+        queueStats.deduplicated++;
+        return;
+      }
+      pendingNodes.add(node);
+      queueStats.queued++;
+    });
+    queueStats.pending = pendingNodes.size;
+    if (pendingNodes.size && !drainScheduled) {
+      drainScheduled = true;
+      setTimeout(scheduleDrain, CONFIG.jsDebounceMs || 100);
+    }
+  }
 
-      if (node.matches('.message, .Message, [class*="message-content"]')) {
-        addTranslationOverlay(node);
-      } else {
-        const messages = node.querySelectorAll('.message, .Message, [class*="message-content"]');
-        messages.forEach(msg => addTranslationOverlay(msg));
+  function scheduleDrain() {
+    if (window.requestIdleCallback) {
+      window.requestIdleCallback(drainQueue, { timeout: 1000 });
+    } else {
+      const start = performance.now();
+      setTimeout(() => drainQueue({
+        didTimeout: false,
+        timeRemaining: () => Math.max(0, FALLBACK_SLICE_MS - (performance.now() - start))
+      }), 0);
+    }
+  }
+
+  function processNode(node) {
+    // Nodes removed again before their turn (e.g. chat switched) are dropped
+    if (!node.isConnected) {
+      queueStats.dropped++;
+      return;
+    }
+    if (node.matches(MESSAGE_SELECTOR)) {
+      observeMessage(node);
+      queueStats.processed++;
+      return;
+    }
+    // Containers expand into their messages at the back of the queue
+    node.querySelectorAll(MESSAGE_SELECTOR).forEach(msg => {
+      if (!pendingNodes.has(msg)) {
+        pendingNodes.add(msg);
+        queueStats.queued++;
       }
     });
-  }, CONFIG.jsDebounceMs || 100);
+  }
+
+  function drainQueue(deadline) {
+    queueStats.slices++;
+    const maxNodes = CONFIG.sliceMaxNodes || 50;
+    // Every node counts, so slices of containers (whose expansion is the
+    // expensive part) respect the deadline and the cap too
+    let handled = 0;
+    for (const node of pendingNodes) {
+      // Always make progress; stop once the idle period or the cap is used up
+      if (handled > 0 && (handled >= maxNodes ||
+          (!deadline.didTimeout && deadline.timeRemaining() < 1))) break;
+      pendingNodes.delete(node);
+      processNode(node);
+      handled++;
+    }
+    queueStats.pending = pendingNodes.size;
+    if (pendingNodes.size) {
+      scheduleDrain();
+    } else {
+      drainScheduled = false;
+    }
+  }
 
   const observer = new MutationObserver((mutations) => {
     const addedNodes = [];
     mutations.forEach((mutation) => {
       mutation.addedNodes.forEach(node => addedNodes.push(node));
     });
-    if (addedNodes.length > 0) {
-      if (window.requestIdleCallback) {
-        window.requestIdleCallback(() => processNewNodes(addedNodes));
-      } else {
-        processNewNodes(addedNodes);
-      }
-    }
+    if (addedNodes.length > 0) enqueueNodes(addedNodes);
   });
 
   // --- Input Area Monitoring (for outgoing messages) ---
-  function setupInputMonitoring() {
-    // Monitor textarea or contenteditable input for message composition
-    const inputSelectors = [
-      'textarea',
-      '[contenteditable="true"]',
-      'input[type="text"]',
-      '.composer-input',
-      '.message-input'
-    ];
-
-    inputSelectors.forEach(selector => {
-      document.querySelectorAll(selector).forEach(input => {
-        if (input.dataset.translationMonitor) return;
-        input.dataset.translationMonitor = 'true';
-
-        // Add subtle indicator that translation is active
-        input.addEventListener('focus', () => {
-          console.log('[AppleTranslate] Input focused, translation active');
-        });
+  // Drafts are translated speculatively while the user types (debounced,
+  // through the Python pipeline). Send substitutes a ready translation
+  // synchronously and only waits when the draft changed since.
+  // Only the chat's message composer: search fields, captions and other
+  // inputs elsewhere on the page are left alone
+  const COMPOSER_CONTAINER_SELECTOR = '.Composer, #message-compose';
+  const COMPOSER_SELECTOR = '#editable-message-text';
+  const SEND_BUTTON_SELECTOR = 'button.send, .btn-send, .composer-send, [aria-label="Send Message"]';
+  const DRAFT_CACHE_MAX = 20;
+  const draftTranslations = new Map(); // draft text -> text to send
+  const draftStats = { requested: 0, ready: 0, waited: 0 };
+  window.__tgTranslateDraftStats = draftStats;
+  let draftTimer = null;
+  let lastComposer = null;
+  let resending = false;
+  let substituting = false;
+
+  function draftsEnabled() {
+    return CONFIG.enabled && CONFIG.draftTranslation !== false &&
+      typeof window[CONFIG.draftBinding] === 'function';
+  }
+
+  function composerOf(target) {
+    const input = target && target.closest ? target.closest(COMPOSER_SELECTOR) : null;
+    if (!input || !input.closest(COMPOSER_CONTAINER_SELECTOR)) return null;
+    return input;
+  }
+
+  function sendButtonOf(target) {
+    const button = target && target.closest ? target.closest(SEND_BUTTON_SELECTOR) : null;
+    return button && button.closest(COMPOSER_CONTAINER_SELECTOR) ? button : null;
+  }
+
+  function composerText(input) {
+    const text = input.value !== undefined ? input.value : (input.innerText || input.textContent || '');
+    return text.trim();
+  }
+
+  function setComposerText(input, text) {
+    if (input.value !== undefined) {
+      input.value = text;
+    } else {
+      input.textContent = text;
+    }
+    // Let the app pick up the new text (not a draft to translate)
+    substituting = true;
+    try {
+      input.dispatchEvent(new Event('input', { bubbles: true }));
+    } finally {
+      substituting = false;
+    }
+  }
+
+  function needsTranslation(text) {
+    return text.length >= 2 && !skipReason(text, CONFIG.targetLang);
+  }
+
+  function requestDraft(text, final) {
+    draftStats.requested++;
+    return Promise.resolve(window[CONFIG.draftBinding]({ text, chatId: getChatId(), final: !!final }))
+      .then(result => {
+        // null: superseded by a newer draft
+        if (typeof result === 'string') {
+          draftTranslations.delete(text);
+          draftTranslations.set(text, result);
+          while (draftTranslations.size > DRAFT_CACHE_MAX) {
+            draftTranslations.delete(draftTranslations.keys().next().value);
+          }
+        }
+        return result;
+      })
+      .catch(e => {
+        console.warn('[AppleTranslate] Draft translation failed:', e);
+        return null;
       });
+  }
+
+  function onComposerInput(event) {
+    if (resending || substituting || !draftsEnabled()) return;
+    const input = composerOf(event.target);
+    if (!input) return;
+    lastComposer = input;
+    clearTimeout(draftTimer);
+    const text = composerText(input);
+    if (!needsTranslation(text) || draftTranslations.has(text)) return;
+    draftTimer = setTimeout(() => requestDraft(text, false), CONFIG.draftDebounceMs || 400);
+  }
+
+  function resend(input, sendEvent) {
+    resending = true;
+    try {
+      if (sendEvent.type === 'keydown') {
+        input.dispatchEvent(new KeyboardEvent('keydown', {
+          key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true, cancelable: true
+        }));
+      } else {
+        const button = sendButtonOf(sendEvent.target);
+        if (button) button.click();
+      }
+    } finally {
+      resending = false;
+    }
+  }
+
+  function onSend(event, input) {
+    if (resending || !draftsEnabled() || !input) return;
+    const text = composerText(input);
+    if (!needsTranslation(text)) return;
+    clearTimeout(draftTimer);
+
+    const ready = draftTranslations.get(text);
+    if (ready !== undefined) {
+      // Speculative result is current: substitute and let the send proceed
+      draftStats.ready++;
+      if (ready !== text) setComposerText(input, ready);
+      return;
+    }
+
+    // Draft changed since the last speculative translation: hold the send
+    draftStats.waited++;
+    event.preventDefault();
+    event.stopImmediatePropagation();
+    requestDraft(text, true).then(result => {
+      if (typeof result === 'string' && result !== text) setComposerText(input, result);
+      resend(input, event);
     });
   }
 
+  let inputMonitoring = false;
+
+  function setupInputMonitoring() {
+    // Delegated listeners also cover composers rendered later
+    if (inputMonitoring) return;
+    inputMonitoring = true;
+
+    document.addEventListener('input', onComposerInput, true);
+    document.addEventListener('keydown', (event) => {
+      if (event.key !== 'Enter' || event.shiftKey || event.isComposing) return;
+      onSend(event, composerOf(event.target));
+    }, true);
+    document.addEventListener('click', (event) => {
+      const button = sendButtonOf(event.target);
+      if (!button) return;
+      const container = button.closest(COMPOSER_CONTAINER_SELECTOR);
+      onSend(event, container.querySelector(COMPOSER_SELECTOR) || lastComposer);
+    }, true);
+  }
+
   // --- Settings UI Implementation ---
   function createSettingsUI() {
     // Floating Button
@@ -710,7 +1922,7 @@ def _get_injection_script(config_json: str) -> str:
 
     panel.querySelector('#tg-apple-display-mode').onchange = (e) => {
       CONFIG.displayMode = e.target.value;
-      saveConfig();
+      saveConfig('displayMode');
     };
 
     panel.querySelector('#tg-apple-save-remark').onclick = async () => {
@@ -757,7 +1969,7 @@ def _get_injection_script(config_json: str) -> str:
     if (container) {
       observer.observe(container, { childList: true, subtree: true });
       // Process existing
-      document.querySelectorAll('.message, .Message, [class*="message-content"]').forEach(addTranslationOverlay);
+      enqueueNodes(Array.from(document.querySelectorAll(MESSAGE_SELECTOR)));
       console.log('[AppleTranslate] Active');
       setupInputMonitoring();
       createSettingsUI();
@@ -0,0 +1,298 @@
+"""
+Memory-mapped phrase table for offline translation.
+
+Contract:
+- build_phrase_table(entries, path) compiles (src, dest, phrase,
+  translation) entries into one read-only binary file; keys are
+  normalized (tokenized, case-folded) and sorted
+- PhraseTable maps the file with mmap and binary-searches the sorted
+  index in place, so processes sharing a table share its page cache
+  instead of each loading it into their own heap
+- PhraseTable.translate tries an exact match for the whole text, then
+  segments it greedily into the longest known phrases; unknown tokens
+  are kept as-is
+- load_entries reads TSV (2 or 4 columns) and JSONL sources
+- open_phrase_table(path) returns one shared table per file
+
+File layout (little endian):
+    header  "TGPHRS01", count u32, max_tokens u32, pairs_len u32
+    pairs   JSON list of [src, dest] language pairs in the table
+    index   count x (key_offset u32, key_len u32, value_offset u32, value_len u32)
+    blob    UTF-8 keys ("<src>\\0<dest>\\0<phrase>") and translations
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b"TGPHRS01"
+_HEADER = struct.Struct("<8sIII")
+_ENTRY = struct.Struct("<IIII")
+
+# Han and kana are matched one character per token; other scripts by word
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_TOKEN_RE = re.compile(rf"[{_CJK}]|[^\W{_CJK}]+|[^\w\s]")
+# Languages written without spaces between words
+_UNSPACED_LANGS = {"zh", "zh-cn", "zh-tw", "ja", "th"}
+
+Entry = Tuple[str, str, str, str]
+
+
+def tokenize(text: str) -> List[re.Match]:
+    """Split text into word / CJK character / punctuation tokens."""
+    return list(_TOKEN_RE.finditer(text))
+
+
+def normalize(text: str) -> str:
+    """Lookup form of a phrase: tokens case-folded and space-joined."""
+    return " ".join(m.group().casefold() for m in tokenize(text))
+
+
+def _key(src_lang: str, dest_lang: str, phrase: str) -> bytes:
+    return f"{src_lang.lower()}\0{dest_lang.lower()}\0{phrase}".encode("utf-8")
+
+
+def build_phrase_table(entries: Iterable[Entry], path: str) -> int:
+    """Compile entries into a phrase table file.
+
+    Later entries win over earlier ones with the same normalized phrase.
+    The file is written next to path and renamed into place, so readers
+    never see a partial table.
+
+    Args:
+        entries: (src_lang, dest_lang, phrase, translation) tuples
+        path: Output file
+
+    Returns:
+        Number of entries written
+    """
+    table: Dict[bytes, bytes] = {}
+    pairs = set()
+    max_tokens = 0
+    for src_lang, dest_lang, phrase, translation in entries:
+        normalized = normalize(phrase)
+        if not normalized:
+            continue
+        max_tokens = max(max_tokens, normalized.count(" ") + 1)
+        pairs.add((src_lang.lower(), dest_lang.lower()))
+        table[_key(src_lang, dest_lang, normalized)] = translation.encode("utf-8")
+
+    keys = sorted(table)
+    pairs_blob = json.dumps(sorted(pairs)).encode("utf-8")
+    index = bytearray()
+    blob = bytearray()
+    for key in keys:
+        value = table[key]
+        index += _ENTRY.pack(len(blob), len(key), len(blob) + len(key), len(value))
+        blob += key
+        blob += value
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(keys), max_tokens, len(pairs_blob)))
+        f.write(pairs_blob)
+        f.write(index)
+        f.write(blob)
+    os.replace(tmp_path, path)
+    return len(keys)
+
+
+def load_entries(
+    path: str, src_lang: Optional[str] = None, dest_lang: Optional[str] = None
+) -> Iterator[Entry]:
+    """Read phrase entries from a TSV or JSONL file.
+
+    TSV lines are "phrase<TAB>translation" (src_lang/dest_lang required)
+    or "src<TAB>dest<TAB>phrase<TAB>translation". JSONL objects have
+    "source" and "target" plus optional "src"/"dest". Blank lines and
+    lines starting with "#" are skipped.
+
+    Raises:
+        ValueError: On a malformed line or a missing language pair
+    """
+    jsonl = path.endswith((".jsonl", ".ndjson"))
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            if jsonl:
+                item = json.loads(line)
+                fields = (
+                    item.get("src", src_lang),
+                    item.get("dest", dest_lang),
+                    item.get("source"),
+                    item.get("target"),
+                )
+            else:
+                columns = line.split("\t")
+                if len(columns) == 2:
+                    fields = (src_lang, dest_lang, columns[0], columns[1])
+                elif len(columns) == 4:
+                    fields = tuple(columns)
+                else:
+                    raise ValueError(f"{path}:{lineno}: expected 2 or 4 tab-separated columns")
+            if not all(fields):
+                raise ValueError(f"{path}:{lineno}: missing language pair, phrase or translation")
+            yield fields
+
+
+class PhraseTable:
+    """Read-only, memory-mapped phrase table."""
+
+    def __init__(self, path: str):
+        """Map a table built by build_phrase_table.
+
+        Args:
+            path: Phrase table file
+
+        Raises:
+            ValueError: If the file is not a phrase table
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            # Zero-length files cannot be mapped
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"Not a phrase table: {path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.max_tokens, pairs_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a phrase table: {path}")
+        pairs_start = _HEADER.size
+        self.pairs = [tuple(p) for p in json.loads(self._mm[pairs_start : pairs_start + pairs_len])]
+        self._index = pairs_start + pairs_len
+        self._blob = self._index + self.count * _ENTRY.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mm.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._mm.closed
+
+    def lookup(self, phrase: str, src_lang: str, dest_lang: str) -> Optional[str]:
+        """Exact match of a phrase (normalized before lookup)."""
+        return self._find(_key(src_lang, dest_lang, normalize(phrase)))
+
+    def translate(self, text: str, src_lang: str, dest_lang: str) -> Optional[str]:
+        """Translate text from the table.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language ("auto" tries every source paired
+                with dest_lang)
+            dest_lang: Destination language
+
+        Returns:
+            Translation, or None if no phrase of the text is known
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+        best: Optional[Tuple[int, str]] = None
+        for src in self._sources(src_lang, dest_lang):
+            exact = self._find(_key(src, dest_lang, " ".join(t.group().casefold() for t in tokens)))
+            if exact is not None:
+                return exact
+            matched, translated = self._segment(text, tokens, src, dest_lang)
+            if matched and (best is None or matched > best[0]):
+                best = (matched, translated)
+        return best[1] if best else None
+
+    def _sources(self, src_lang: str, dest_lang: str) -> List[str]:
+        dest_lang = dest_lang.lower()
+        if src_lang and src_lang.lower() != "auto":
+            return [src_lang.lower()]
+        return [src for src, dest in self.pairs if dest == dest_lang]
+
+    def _segment(
+        self, text: str, tokens: List[re.Match], src_lang: str, dest_lang: str
+    ) -> Tuple[int, str]:
+        """Greedy longest-phrase segmentation.
+
+        Returns:
+            (number of tokens covered by known phrases, translated text)
+        """
+        words = [t.group().casefold() for t in tokens]
+        spaced = dest_lang.lower() not in _UNSPACED_LANGS
+        out: List[str] = []
+        matched = 0
+        prev_end = 0
+        prev_translated = False
+        i = 0
+        while i < len(tokens):
+            translation = None
+            for j in range(min(len(tokens), i + self.max_tokens), i, -1):
+                translation = self._find(_key(src_lang, dest_lang, " ".join(words[i:j])))
+                if translation is not None:
+                    break
+            start = tokens[i].start()
+            gap = text[prev_end:start]
+            if translation is None:
+                out.append(gap + tokens[i].group())
+                prev_end = tokens[i].end()
+                prev_translated = False
+                i += 1
+                continue
+            # Source scripts without spaces still need them in the target
+            if not gap and prev_translated and spaced:
+                gap = " "
+            out.append(gap + translation)
+            matched += j - i
+            prev_end = tokens[j - 1].end()
+            prev_translated = True
+            i = j
+        out.append(text[prev_end:])
+        return matched, "".join(out)
+
+    def _find(self, key: bytes) -> Optional[str]:
+        """Binary search the sorted index for key."""
+        mm = self._mm
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_off, key_len, val_off, val_len = _ENTRY.unpack_from(mm, self._index + mid * _ENTRY.size)
+            start = self._blob + key_off
+            probe = mm[start : start + key_len]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                start = self._blob + val_off
+                return mm[start : start + val_len].decode("utf-8")
+        return None
+
+
+_tables: Dict[str, PhraseTable] = {}
+_tables_lock = threading.Lock()
+
+
+def open_phrase_table(path: str) -> PhraseTable:
+    """Return the process-wide table for path, mapping it on first use.
+
+    Args:
+        path: Phrase table file
+
+    Returns:
+        Shared PhraseTable
+
+    Raises:
+        OSError: If the file cannot be opened
+        ValueError: If the file is not a phrase table
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    with _tables_lock:
+        table = _tables.get(path)
+        if table is None or table.closed:
+            table = _tables[path] = PhraseTable(path)
+        return table
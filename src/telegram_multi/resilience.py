@@ -0,0 +1,358 @@
+"""
+Per-provider rate limiting and circuit breaking.
+
+Contract:
+- TokenBucket: refills at `rate` tokens/s up to `capacity`; callers
+  reserve a token in FIFO order and sleep until it is due (smoothing
+  bursts); a caller is only turned away (RateLimitedError) when the
+  queue ahead of it is longer than max_wait, never after joining it
+- CircuitBreaker: closed -> open after failure_threshold consecutive
+  failures; open rejects calls with CircuitOpenError until
+  recovery_timeout has passed; then half-open lets a probe through,
+  which closes the circuit on success or re-opens it on failure
+- ProviderGuard bundles both; get_provider_guard(name) returns the one
+  guard shared by every translator of that provider in the process.
+  Rate limiting is off unless settings.provider_rate_limit is set; the
+  circuit breaker is always on
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional
+from pydantic import BaseModel
+from src.telegram_multi.settings import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class RateLimitedError(RuntimeError):
+    """Raised when the rate-limit queue is longer than the allowed wait."""
+
+
+class GuardStats(BaseModel):
+    """Snapshot of a provider guard."""
+
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    opened: int = 0
+    rejected: int = 0
+    rate_limited: int = 0
+    waited_seconds: float = 0.0
+    tokens: float = 0.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second (<= 0 disables limiting)
+            capacity: Maximum burst size
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.capacity = max(1.0, float(capacity))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            0.0 if a token was taken, otherwise seconds until one will be
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def reserve(self, max_wait: float) -> float:
+        """Reserve the next token in line.
+
+        The bucket may go into debt, so every reservation lands behind
+        the ones before it and callers are served in arrival order.
+
+        Returns:
+            Seconds until the reserved token is due
+
+        Raises:
+            RateLimitedError: If the token would be due after max_wait
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            delay = max(0.0, (1.0 - self._tokens) / self.rate)
+            if delay > max_wait:
+                raise RateLimitedError(f"rate-limit queue longer than {max_wait:.2f}s")
+            self._tokens -= 1.0
+            return delay
+
+    def release(self) -> None:
+        """Give back a reserved token that was never used."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + 1.0)
+
+    def acquire(self, max_wait: float) -> float:
+        """Reserve a token and block until it is due.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitedError: If the queue is longer than max_wait
+        """
+        delay = self.reserve(max_wait)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, max_wait: float) -> float:
+        """Async acquire(); waits with asyncio.sleep and gives the token
+        back if cancelled while queued."""
+        delay = self.reserve(max_wait)
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.release()
+                raise
+        return delay
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open circuit breaker."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a closed circuit.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Concurrent probes allowed while half-open
+            clock: Monotonic time source
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving open -> half-open once recovery_timeout passed."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    @property
+    def consecutive_failures(self) -> int:
+        return self._failures
+
+    def before_call(self) -> None:
+        """Admit a call or reject it.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with
+                all probe slots taken
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+            self.rejected += 1
+            retry_in = max(0.0, self._opened_at + self.recovery_timeout - self._clock())
+            raise CircuitOpenError(f"circuit open, retry in {retry_in:.1f}s")
+
+    def cancel_call(self) -> None:
+        """Give back an admitted call that never reached the provider."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probes = 0
+            self._state = CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probes = 0
+                self.opened += 1
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+
+class ProviderGuard:
+    """Rate limiter plus circuit breaker for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        limiter: TokenBucket,
+        breaker: CircuitBreaker,
+        max_wait: float = 30.0,
+    ):
+        """Initialize guard.
+
+        Args:
+            name: Provider name (for error messages)
+            limiter: Token bucket shared by the provider's calls
+            breaker: Circuit breaker shared by the provider's calls
+            max_wait: Longest rate-limit queue a call may join, in seconds
+        """
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_wait = max_wait
+        self._rate_limited = 0
+        self._waited = 0.0
+
+    @classmethod
+    def from_settings(cls, name: str) -> "ProviderGuard":
+        """Build a guard from the provider_* / circuit_* settings."""
+        return cls(
+            name,
+            TokenBucket(settings.provider_rate_limit, settings.provider_burst),
+            CircuitBreaker(
+                failure_threshold=settings.circuit_failure_threshold,
+                recovery_timeout=settings.circuit_recovery_timeout,
+            ),
+            max_wait=settings.provider_max_wait,
+        )
+
+    def admit(self) -> None:
+        """Block until the call may go upstream.
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+            RateLimitedError: If the rate-limit queue is longer than max_wait
+        """
+        self.breaker.before_call()
+        try:
+            self._waited += self.limiter.acquire(self.max_wait)
+        except RateLimitedError:
+            self.breaker.cancel_call()
+            self._rate_limited += 1
+            raise
+
+    async def admit_async(self) -> None:
+        """Async admit()."""
+        self.breaker.before_call()
+        try:
+            self._waited += await self.limiter.acquire_async(self.max_wait)
+        except (RateLimitedError, asyncio.CancelledError) as e:
+            self.breaker.cancel_call()
+            if isinstance(e, RateLimitedError):
+                self._rate_limited += 1
+            raise
+
+    def record_success(self) -> None:
+        self.breaker.record_success()
+
+    def record_failure(self) -> None:
+        self.breaker.record_failure()
+
+    def cancel_call(self) -> None:
+        self.breaker.cancel_call()
+
+    def stats(self) -> GuardStats:
+        """Return a snapshot of limiter and breaker state."""
+        return GuardStats(
+            state=self.breaker.state,
+            consecutive_failures=self.breaker.consecutive_failures,
+            opened=self.breaker.opened,
+            rejected=self.breaker.rejected,
+            rate_limited=self._rate_limited,
+            waited_seconds=self._waited,
+            tokens=self.limiter.tokens,
+        )
+
+
+_guards: Dict[str, ProviderGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_provider_guard(name: str) -> ProviderGuard:
+    """Process-wide guard for a provider, created on first use.
+
+    Args:
+        name: Provider name (the translator's cache_namespace)
+
+    Returns:
+        The guard shared by all translators of that provider
+    """
+    with _guards_lock:
+        guard = _guards.get(name)
+        if guard is None:
+            guard = _guards[name] = ProviderGuard.from_settings(name)
+        return guard
+
+
+def reset_provider_guards(name: Optional[str] = None) -> None:
+    """Forget shared guards (all, or one provider's) so they start fresh."""
+    with _guards_lock:
+        if name is None:
+            _guards.clear()
+        else:
+            _guards.pop(name, None)
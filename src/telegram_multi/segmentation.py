@@ -0,0 +1,160 @@
+"""
+Sentence and line segmentation for per-segment translation.
+
+Contract:
+- split_segments(text) cuts a message at line breaks and sentence ends
+  (. ! ? … followed by whitespace, CJK 。！？ directly)
+- Whitespace and line breaks between segments are kept as separators, so
+  SegmentedText.join() restores the original layout around translations
+- Segments without letters (numbers, emoji, bare punctuation) are folded
+  into the separators and never sent for translation
+- Common abbreviations ("Mr.", "e.g.") and single initials do not end a
+  sentence
+- chunk_text(text, max_chars) packs consecutive segments into chunks of
+  at most max_chars for providers with request size limits; a single
+  longer sentence is cut at a space (or hard-cut as a last resort)
+"""
+
+import re
+from typing import List, Optional, Tuple
+from pydantic import BaseModel
+
+_LINE_RE = re.compile(r"(\s*\n\s*)")
+# Sentence end: Latin terminators (plus closing quotes/brackets) before
+# whitespace, or CJK terminators anywhere
+_SENTENCE_END_RE = re.compile(
+    r"[.!?…]+[\"'”’)\]]*(?=\s)|[。！？]+[”’」』）)]*"
+)
+_LETTER_RE = re.compile(r"[^\W\d_]")
+_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr", "vs", "etc",
+    "e.g", "i.e", "no", "fig", "approx", "inc", "ltd", "co",
+}
+
+
+class SegmentedText(BaseModel):
+    """A text cut into translatable segments and the separators around them.
+
+    separators has one more item than segments:
+    text == separators[0] + segments[0] + separators[1] + ... + separators[-1]
+    """
+
+    segments: List[str]
+    separators: List[str]
+
+    def join(self, translations: List[str]) -> str:
+        """Rebuild the text with each segment replaced by its translation."""
+        parts = [self.separators[0]]
+        for translated, separator in zip(translations, self.separators[1:]):
+            parts.append(translated)
+            parts.append(separator)
+        return "".join(parts)
+
+
+def _sentence_ends(line: str) -> List[int]:
+    """Offsets just past each sentence terminator in a line."""
+    ends = []
+    for match in _SENTENCE_END_RE.finditer(line):
+        if match.group().startswith(".") and match.end() - match.start() == 1:
+            word = re.search(r"[\w.]*$", line[: match.start()]).group().lower()
+            if word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+                continue
+        ends.append(match.end())
+    return ends
+
+
+def split_segments(text: str) -> SegmentedText:
+    """Split text into sentence/line segments, keeping the separators.
+
+    Args:
+        text: Message text
+
+    Returns:
+        SegmentedText whose join() of the untranslated segments is text
+    """
+    segments: List[str] = []
+    separators: List[str] = [""]
+
+    def add_separator(value: str) -> None:
+        separators[-1] += value
+
+    def add_piece(piece: str) -> None:
+        stripped = piece.strip()
+        if not stripped or not _LETTER_RE.search(stripped):
+            add_separator(piece)
+            return
+        lead = piece[: len(piece) - len(piece.lstrip())]
+        trail = piece[len(piece.rstrip()) :]
+        add_separator(lead)
+        segments.append(stripped)
+        separators.append(trail)
+
+    for i, chunk in enumerate(_LINE_RE.split(text)):
+        if i % 2:
+            add_separator(chunk)
+            continue
+        start = 0
+        for end in _sentence_ends(chunk):
+            add_piece(chunk[start:end])
+            start = end
+        add_piece(chunk[start:])
+
+    return SegmentedText(segments=segments, separators=separators)
+
+
+def _split_long(segment: str, max_chars: int) -> Tuple[List[str], List[str]]:
+    """Cut one segment into pieces of at most max_chars.
+
+    Returns the pieces and the whitespace removed between them.
+    """
+    pieces: List[str] = []
+    gaps: List[str] = []
+    while len(segment) > max_chars:
+        cut = segment.rfind(" ", 1, max_chars + 1)
+        if cut <= 0:
+            pieces.append(segment[:max_chars])
+            gaps.append("")
+            segment = segment[max_chars:]
+            continue
+        rest = segment[cut:].lstrip()
+        pieces.append(segment[:cut])
+        gaps.append(segment[cut : len(segment) - len(rest)])
+        segment = rest
+    pieces.append(segment)
+    return pieces, gaps
+
+
+def chunk_text(text: str, max_chars: int) -> SegmentedText:
+    """Group sentences of text into chunks of at most max_chars.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        SegmentedText whose segments are the chunks, in order
+    """
+    segmented = split_segments(text)
+    units: List[str] = []
+    gaps: List[str] = [segmented.separators[0]]
+    for segment, after in zip(segmented.segments, segmented.separators[1:]):
+        pieces, inner = _split_long(segment, max_chars)
+        units.extend(pieces)
+        gaps.extend(inner)
+        gaps.append(after)
+
+    chunks: List[str] = []
+    separators: List[str] = [gaps[0]]
+    current: Optional[str] = None
+    for unit, before in zip(units, gaps):
+        if current is not None and len(current) + len(before) + len(unit) <= max_chars:
+            current += before + unit
+            continue
+        if current is not None:
+            chunks.append(current)
+            separators.append(before)
+        current = unit
+    if current is not None:
+        chunks.append(current)
+    separators.append(gaps[-1])
+    return SegmentedText(segments=chunks, separators=separators)
@@ -2,7 +2,7 @@
 Global settings management using pydantic-settings.
 """
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import SecretStr, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -29,14 +29,131 @@ class AppSettings(BaseSettings):
     translate_cache_ttl: int = Field(
         default=3600, description="Translation cache TTL in seconds"
     )
+    translate_cache_max_entries: int = Field(
+        default=10000, description="Maximum entries in the in-process translation cache"
+    )
+    translate_cache_max_bytes: int = Field(
+        default=16 * 1024 * 1024,
+        description="Maximum UTF-8 bytes held by the in-process translation cache",
+    )
+    translate_cache_stale_ttl: int = Field(
+        default=24 * 3600,
+        description="Seconds an expired translation is served while it is refreshed (0 disables)",
+    )
+    translate_cache_negative_ttl: int = Field(
+        default=30,
+        description="Seconds a failed translation is not retried upstream (0 disables)",
+    )
+    translation_store_path: Optional[str] = Field(
+        default=None, description="SQLite file for the persistent translation store"
+    )
+    translation_store_ttl: int = Field(
+        default=7 * 24 * 3600,
+        description="Persistent translation store TTL in seconds",
+    )
+    phrase_table_path: Optional[str] = Field(
+        default=None, description="Phrase table file for the offline local provider"
+    )
+    translation_memory_enabled: bool = Field(
+        default=False,
+        description="Reuse translations of near-duplicate texts (opt-in: a fuzzy "
+        "match is the translation of a different text)",
+    )
+    translation_memory_threshold: float = Field(
+        default=0.9, description="Minimum n-gram similarity for translation memory reuse"
+    )
+    translation_memory_max_entries: int = Field(
+        default=100_000, description="Entries kept in the translation memory"
+    )
+    translation_skip_enabled: bool = Field(
+        default=True,
+        description="Skip translating emoji/number/URL-only and same-language texts",
+    )
+    translate_max_chunk_chars: int = Field(
+        default=4500,
+        description="Longer texts are translated in sentence-aligned chunks (0 disables)",
+    )
+    segment_messages: bool = Field(
+        default=True, description="Translate and cache messages sentence by sentence"
+    )
     redis_url: Optional[str] = Field(
         default=None, description="Redis URL for distributed caching"
     )
 
     # Performance Settings
+    translate_request_timeout: float = Field(
+        default=10.0, description="Per-call upstream translation timeout in seconds"
+    )
+    http_pool_size: int = Field(
+        default=10, description="Keep-alive connections per translation provider"
+    )
+    http_keepalive_expiry: float = Field(
+        default=30.0, description="Seconds an idle provider connection stays open"
+    )
+    http2: bool = Field(
+        default=True, description="Use HTTP/2 for async provider calls when available"
+    )
+    batch_window_ms: int = Field(
+        default=20, description="Micro-batching window for translation requests"
+    )
+    batch_max_items: int = Field(
+        default=32, description="Max texts per micro-batch"
+    )
+    batch_max_queue: int = Field(
+        default=1000, description="Max translation requests waiting to be batched"
+    )
+    provider_rate_limit: float = Field(
+        default=0.0,
+        description="Upstream requests per second per provider (0, the default, disables)",
+    )
+    provider_burst: int = Field(
+        default=10, description="Requests a provider may burst above its rate"
+    )
+    provider_max_wait: float = Field(
+        default=30.0, description="Longest rate-limit queue in seconds a call may join"
+    )
+    circuit_failure_threshold: int = Field(
+        default=5, description="Consecutive provider failures that open its circuit"
+    )
+    circuit_recovery_timeout: float = Field(
+        default=30.0, description="Seconds an open circuit waits before a probe call"
+    )
+    hedge_providers: List[str] = Field(
+        default=["google", "deepl"],
+        description="Providers raced by the hedged translator, in preference order",
+    )
+    hedge_delay_ms: int = Field(
+        default=300,
+        description="Hedge delay used until a provider has enough latency samples",
+    )
     js_debounce_ms: int = Field(
         default=100, description="Debounce delay for JS injection in milliseconds"
     )
+    js_slice_max_nodes: int = Field(
+        default=50, description="DOM nodes the page script processes per idle slice"
+    )
+    js_prefetch_margin_px: int = Field(
+        default=800, description="Distance from the viewport within which messages are prefetched"
+    )
+    js_max_concurrent_translations: int = Field(
+        default=8, description="Message translations the page script runs at once"
+    )
+    js_reduced_motion: bool = Field(
+        default=False, description="Disable overlay animations and blur (low-end hosts)"
+    )
+    js_draft_translation: bool = Field(
+        default=True, description="Translate composer drafts speculatively while typing"
+    )
+    js_draft_debounce_ms: int = Field(
+        default=400, description="Typing pause before a draft is translated, in milliseconds"
+    )
+    js_cache_max_entries: int = Field(
+        default=5000, description="Translations kept by the page script (memory and IndexedDB)"
+    )
+    js_translate_transport: str = Field(
+        default="binding",
+        description="How page translations are made: 'binding' (Python) or 'fetch' (direct)",
+    )
 
 
 # Global settings instance
@@ -0,0 +1,218 @@
+"""
+Single-flight request coalescing.
+
+Contract:
+- SingleFlight: concurrent threads calling do() with the same key share
+  one execution of fn; all receive its result or its exception
+- AsyncSingleFlight: the asyncio equivalent, per event loop; a caller
+  being cancelled does not cancel the shared call for the others
+- do_many() runs one call for a group of keys: keys another caller is
+  already running are joined, the rest are led by a single fn(keys)
+- Keys are forgotten as soon as the call completes (no result caching)
+"""
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future, wait
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls made from threads."""
+
+    def __init__(self):
+        """Initialize an empty in-flight table."""
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument callable performing the work
+
+        Returns:
+            Result of fn
+
+        Raises:
+            Exception: Whatever fn raised, re-raised in every caller
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._calls[key] = future
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result()
+
+    def do_many(
+        self, keys: List[Hashable], fn: Callable[[List[Hashable]], Dict[Hashable, T]]
+    ) -> Dict[Hashable, Future]:
+        """Run fn once for the keys no other caller is running; join the rest.
+
+        Args:
+            keys: Distinct identities of the calls
+            fn: Callable taking the keys this caller leads and returning a
+                result for each of them
+
+        Returns:
+            A completed Future per key holding its result or exception
+        """
+        shared: Dict[Hashable, Future] = {}
+        led: List[Hashable] = []
+        with self._lock:
+            for key in keys:
+                future = self._calls.get(key)
+                if future is None:
+                    future = self._calls[key] = Future()
+                    led.append(key)
+                else:
+                    self.coalesced += 1
+                shared[key] = future
+
+        if led:
+            try:
+                values = fn(led)
+                for key in led:
+                    shared[key].set_result(values[key])
+            except BaseException as e:
+                for key in led:
+                    if not shared[key].done():
+                        shared[key].set_exception(e)
+                if not isinstance(e, Exception):
+                    raise
+            finally:
+                with self._lock:
+                    for key in led:
+                        self._calls.pop(key, None)
+        wait(shared.values())
+        return shared
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Coalesces concurrent identical coroutine calls on an event loop."""
+
+    def __init__(self):
+        """Initialize an empty in-flight table (one per event loop)."""
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Running do_many() calls, referenced until done
+        self._tasks: Set[asyncio.Task] = set()
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn() once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument callable returning an awaitable
+
+        Returns:
+            Result of fn()
+
+        Raises:
+            Exception: Whatever fn() raised, re-raised in every caller
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        task = calls.get(key)
+        if task is None:
+            task = loop.create_task(self._run(calls, key, fn))
+            calls[key] = task
+        else:
+            self.coalesced += 1
+        # shield: one caller timing out must not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def do_many(
+        self,
+        keys: List[Hashable],
+        fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, T]]],
+    ) -> Dict[Hashable, "asyncio.Future"]:
+        """Async SingleFlight.do_many(); the led call survives a cancelled caller.
+
+        Returns:
+            A completed future per key holding its result or exception
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        shared: Dict[Hashable, asyncio.Future] = {}
+        led: List[Hashable] = []
+        for key in keys:
+            future = calls.get(key)
+            if future is None:
+                future = calls[key] = loop.create_future()
+                led.append(key)
+            else:
+                self.coalesced += 1
+            shared[key] = future
+        if led:
+            task = loop.create_task(self._run_many(calls, led, shared, fn))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if shared:
+            await asyncio.wait(list(shared.values()))
+        return shared
+
+    @staticmethod
+    async def _run_many(
+        calls: Dict[Hashable, Any],
+        led: List[Hashable],
+        shared: Dict[Hashable, "asyncio.Future"],
+        fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, T]]],
+    ) -> None:
+        try:
+            values = await fn(led)
+            for key in led:
+                shared[key].set_result(values[key])
+        except asyncio.CancelledError:
+            for key in led:
+                shared[key].cancel()
+            raise
+        except Exception as e:
+            for key in led:
+                if not shared[key].done():
+                    shared[key].set_exception(e)
+        finally:
+            for key in led:
+                calls.pop(key, None)
+
+    @staticmethod
+    async def _run(calls: Dict[Hashable, Any], key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await fn()
+        finally:
+            calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        """Number of distinct calls running on the current event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return 0
+        return len(self._calls.get(loop, {}))
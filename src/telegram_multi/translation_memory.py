@@ -0,0 +1,354 @@
+"""
+Fuzzy translation memory with MinHash LSH candidate search.
+
+Contract:
+- TranslationMemory stores (src, dest, source text, translation) and
+  answers near-duplicate lookups with the best stored translation whose
+  Jaccard similarity of character n-grams reaches the threshold
+- Matches carry their exact Jaccard score; stats() reports hit rate and
+  mean score
+- Candidates come from locality-sensitive hashing: a 64-value MinHash
+  signature (one-permutation hashing with densification) split into 8
+  bands of 8 rows; entries sharing any band bucket with the query are
+  verified exactly. Lookup cost depends on bucket sizes, not on the
+  number of entries; recall is probabilistic (about 99% at similarity
+  0.9, falling off steeply below ~0.75)
+- Buckets keep their newest MAX_BUCKET ids, which bounds lookup cost
+  when many similar short texts share a bucket
+- Updates are incremental: add()/remove() touch only the entry's 8
+  buckets; the oldest entries are evicted beyond max_entries and entries
+  expire after ttl like the translation cache
+- Texts shorter than min_chars are never matched fuzzily: a one-character
+  edit in a short text is usually a different message
+- A fuzzy match is refused when the texts differ in numbers or in
+  negation words ("9500" vs "1500", "now" vs "not"): such edits change
+  the meaning however similar the rest is
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+from pydantic import BaseModel
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"\d+")
+_WORD_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+# Negation words of the languages the skip classifier knows
+_NEGATIONS = frozenset(
+    "not no never none nothing nobody cannot can't don't doesn't didn't won't "
+    "isn't aren't wasn't weren't shouldn't wouldn't couldn't haven't hasn't "
+    "nicht kein keine nie niemals ne pas jamais rien non nunca nada nadie ni "
+    "não nem nao mai nessuno не нет ни никогда ні немає".split()
+)
+# CJK negation characters (words are not space-separated there)
+_CJK_NEGATIONS = frozenset("不没沒别別无無未非莫勿否")
+
+# Signature layout: BANDS x ROWS MinHash values over 2**BIN_BITS bins
+BANDS = 8
+ROWS = 8
+BIN_BITS = 6
+_BINS = 1 << BIN_BITS
+# Added per step when an empty bin borrows a neighbour's value
+_DENSIFY_OFFSET = 1 << 60
+# Newest ids kept per bucket; bounds the candidates a lookup verifies
+MAX_BUCKET = 32
+
+Pair = Tuple[str, str]
+# An id, or a list of ids once a bucket is shared
+Bucket = Union[int, List[int]]
+
+
+class MemoryMatch(BaseModel):
+    """A translation reused from memory."""
+
+    source: str
+    translation: str
+    score: float
+
+
+class MemoryStats(BaseModel):
+    """Snapshot of translation memory counters."""
+
+    entries: int = 0
+    lookups: int = 0
+    hits: int = 0
+    exact_hits: int = 0
+    mean_hit_score: float = 0.0
+
+
+def normalize(text: str) -> str:
+    """Case-fold and collapse whitespace."""
+    return _WHITESPACE_RE.sub(" ", text.casefold()).strip()
+
+
+def meaning_differs(a: str, b: str) -> bool:
+    """True if normalized texts differ in numbers or negation words."""
+    if _NUMBER_RE.findall(a) != _NUMBER_RE.findall(b):
+        return True
+    changed = set(_WORD_RE.findall(a)) ^ set(_WORD_RE.findall(b))
+    if not changed.isdisjoint(_NEGATIONS):
+        return True
+    return any(a.count(c) != b.count(c) for c in _CJK_NEGATIONS if c in a or c in b)
+
+
+def ngrams(text: str, n: int = 3) -> FrozenSet[int]:
+    """Hashed character n-grams of normalized text (padded with spaces)."""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return frozenset((hash(padded),))
+    return frozenset(hash(padded[i : i + n]) for i in range(len(padded) - n + 1))
+
+
+def band_keys(grams: FrozenSet[int]) -> List[int]:
+    """LSH bucket keys of a gram set, one per band.
+
+    One-permutation MinHash: each gram hash picks a bin with its low bits
+    and competes for that bin's minimum with the rest. Empty bins take the
+    next non-empty bin's minimum plus an offset per step (rotation
+    densification), which keeps P(bin equal) close to the Jaccard index.
+    """
+    mins: List[Optional[int]] = [None] * _BINS
+    for gram in grams:
+        slot = gram & (_BINS - 1)
+        value = gram >> BIN_BITS
+        current = mins[slot]
+        if current is None or value < current:
+            mins[slot] = value
+    signature = list(mins)
+    for slot in range(_BINS):
+        if signature[slot] is None:
+            step = 1
+            while mins[(slot + step) % _BINS] is None:
+                step += 1
+            signature[slot] = mins[(slot + step) % _BINS] + step * _DENSIFY_OFFSET
+    return [hash((band, *signature[band * ROWS : (band + 1) * ROWS])) for band in range(BANDS)]
+
+
+class _Entry:
+    __slots__ = ("pair", "source", "translation", "size", "keys", "expires_at")
+
+    def __init__(
+        self,
+        pair: Pair,
+        source: str,
+        translation: str,
+        size: int,
+        keys: List[int],
+        expires_at: Optional[float],
+    ):
+        self.pair = pair
+        self.source = source
+        self.translation = translation
+        self.size = size  # number of distinct grams
+        self.keys = keys  # LSH bucket key per band
+        self.expires_at = expires_at
+
+
+class TranslationMemory:
+    """Thread-safe fuzzy translation memory."""
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        max_entries: int = 100_000,
+        n: int = 3,
+        min_chars: int = 16,
+        ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty memory.
+
+        Args:
+            threshold: Minimum Jaccard similarity for a fuzzy match (0-1]
+            max_entries: Entries kept before the oldest are evicted
+            n: Character n-gram size
+            min_chars: Shorter texts only match exactly
+            ttl: Seconds an entry stays usable (<= 0 means no expiry)
+            clock: Monotonic time source
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.n = n
+        self.min_chars = min_chars
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # id -> entry, oldest first
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        # (pair, normalized source) -> id
+        self._by_source: Dict[Tuple[Pair, str], int] = {}
+        # pair -> band bucket key -> entry id(s)
+        self._buckets: Dict[Pair, Dict[int, Bucket]] = {}
+
+        self._lookups = 0
+        self._hits = 0
+        self._exact_hits = 0
+        self._score_total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, text: str, translation: str, src_lang: str, dest_lang: str) -> None:
+        """Store a translation (replacing any for the same normalized text)."""
+        source = normalize(text)
+        if not source:
+            return
+        pair = (src_lang, dest_lang)
+        grams = ngrams(source, self.n)
+        keys = band_keys(grams)
+        expires_at = self._clock() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            existing = self._by_source.get((pair, source))
+            if existing is not None:
+                entry = self._entries[existing]
+                entry.translation = translation
+                entry.expires_at = expires_at
+                self._entries.move_to_end(existing)
+                return
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(
+                pair, source, translation, len(grams), keys, expires_at
+            )
+            self._by_source[(pair, source)] = entry_id
+            buckets = self._buckets.setdefault(pair, {})
+            for key in keys:
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = entry_id
+                elif isinstance(bucket, list):
+                    bucket.append(entry_id)
+                    if len(bucket) > MAX_BUCKET:
+                        del bucket[0]
+                else:
+                    buckets[key] = [bucket, entry_id]
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def remove(self, text: str, src_lang: str, dest_lang: str) -> bool:
+        """Forget the entry for text; True if there was one."""
+        with self._lock:
+            entry_id = self._by_source.get(((src_lang, dest_lang), normalize(text)))
+            if entry_id is None:
+                return False
+            self._remove(entry_id)
+            return True
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_source.clear()
+            self._buckets.clear()
+
+    def lookup(self, text: str, src_lang: str, dest_lang: str) -> Optional[MemoryMatch]:
+        """Best stored translation at or above the threshold.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language code
+            dest_lang: Destination language code
+
+        Returns:
+            MemoryMatch with its similarity score, or None
+        """
+        source = normalize(text)
+        pair = (src_lang, dest_lang)
+        with self._lock:
+            self._lookups += 1
+            now = self._clock()
+            entry_id = self._by_source.get((pair, source))
+            if entry_id is not None:
+                entry = self._entries[entry_id]
+                if not self._expired(entry, now):
+                    self._exact_hits += 1
+                    return self._hit(entry, 1.0)
+                self._remove(entry_id)
+            if len(source) < self.min_chars or pair not in self._buckets:
+                return None
+            best = self._best_fuzzy(pair, source, ngrams(source, self.n), now)
+            if best is None:
+                return None
+            return self._hit(*best)
+
+    def stats(self) -> MemoryStats:
+        """Return a snapshot of memory counters."""
+        with self._lock:
+            return MemoryStats(
+                entries=len(self._entries),
+                lookups=self._lookups,
+                hits=self._hits,
+                exact_hits=self._exact_hits,
+                mean_hit_score=self._score_total / self._hits if self._hits else 0.0,
+            )
+
+    def _hit(self, entry: _Entry, score: float) -> MemoryMatch:
+        self._hits += 1
+        self._score_total += score
+        return MemoryMatch(source=entry.source, translation=entry.translation, score=score)
+
+    @staticmethod
+    def _expired(entry: _Entry, now: float) -> bool:
+        return entry.expires_at is not None and now >= entry.expires_at
+
+    def _best_fuzzy(
+        self, pair: Pair, source: str, grams: FrozenSet[int], now: float
+    ) -> Optional[Tuple[_Entry, float]]:
+        """LSH candidates, length-filtered and verified by exact Jaccard.
+
+        Candidates differing in numbers or negation are never returned.
+        """
+        buckets = self._buckets[pair]
+        candidates = set()
+        for key in band_keys(grams):
+            bucket = buckets.get(key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, list):
+                candidates.update(bucket)
+            else:
+                candidates.add(bucket)
+
+        t = self.threshold
+        size = len(grams)
+        min_size, max_size = t * size, size / t
+        best: Optional[Tuple[_Entry, float]] = None
+        expired: List[int] = []
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if entry.size < min_size or entry.size > max_size:
+                continue
+            if self._expired(entry, now):
+                expired.append(entry_id)
+                continue
+            # Grams are recomputed rather than stored: few candidates survive
+            overlap = len(grams.intersection(ngrams(entry.source, self.n)))
+            score = overlap / (size + entry.size - overlap)
+            if score < t or (best is not None and score <= best[1]):
+                continue
+            if meaning_differs(source, entry.source):
+                continue
+            best = (entry, score)
+        for entry_id in expired:
+            self._remove(entry_id)
+        return best
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        del self._by_source[(entry.pair, entry.source)]
+        buckets = self._buckets[entry.pair]
+        for key in entry.keys:
+            bucket = buckets.get(key)
+            if isinstance(bucket, list):
+                # Already gone if it was pushed out of a full bucket
+                if entry_id in bucket:
+                    bucket.remove(entry_id)
+                if len(bucket) == 1:
+                    buckets[key] = bucket[0]
+            elif bucket == entry_id:
+                del buckets[key]
@@ -4,18 +4,67 @@ Translation abstraction layer and factory.
 Contract:
 - Translator: Abstract interface for translation services
 - TranslatorFactory: Factory for creating translator instances
-- Supports multiple providers (google, deepl, local)
+- Supports multiple providers (google, deepl, local, hedged)
 - Graceful error handling (return original text on failure)
+- Shared bounded LRU+TTL cache for all providers (optionally Redis-tiered)
+- Native asyncio API (translate_async) with non-blocking retries and
+  per-call timeouts
+- Each translator owns a keep-alive HTTP pool, released by close()/aclose()
+  or by using the translator as a (async) context manager
+- Concurrent cache misses for the same key share one upstream call
+- Upstream calls pass a per-provider rate limiter and circuit breaker
+  shared process-wide; while a circuit is open calls fail fast instead
+  of sleeping through retries
+- With config.memory_enabled (off by default), misses consult a fuzzy
+  translation memory before going upstream, so near-duplicates of
+  translated texts reuse their translation
+- translate_segmented splits messages into sentences/lines, translates the
+  distinct segments as one cached batch and restores the original layout
+- Texts longer than config.max_chunk_chars are fetched as sentence-aligned
+  chunks, translated concurrently and retried individually; a chunk that
+  still fails keeps its original text (and the result is not cached)
+- Expired entries within config.cache_stale_ttl are served immediately
+  while one background refresh per key updates them; failed fetches are
+  remembered for config.cache_negative_ttl so repeats skip the retries
+  (calls turned away by the local guard are not failed fetches and are
+  not remembered)
 """
 
-from typing import Dict, List
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent import futures
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from abc import ABC, abstractmethod
+from src.telegram_multi.cache import TranslationCache, build_translation_cache
 from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.http_pool import HttpPool
+from src.telegram_multi.resilience import (
+    CLOSED,
+    CircuitOpenError,
+    ProviderGuard,
+    RateLimitedError,
+    get_provider_guard,
+)
+from src.telegram_multi.segmentation import SegmentedText, chunk_text, split_segments
+from src.telegram_multi.singleflight import AsyncSingleFlight, SingleFlight
+from src.telegram_multi.translation_memory import TranslationMemory
+
+# Local guard rejections: the call never went upstream
+GUARD_REJECTIONS = (CircuitOpenError, RateLimitedError)
 
 
 class Translator(ABC):
     """Abstract base class for translation providers."""
 
+    # Prefix that keeps cache keys of different providers apart
+    cache_namespace: str = "base"
+    max_retries: int = 3
+    backoff_factor: float = 0.5  # Exponential backoff multiplier
+    # Whether upstream calls pass a provider guard (composites guard their parts)
+    guarded: bool = True
+
     def __init__(self, config: TranslationConfig):
         """Initialize translator with configuration.
 
@@ -23,7 +72,60 @@ class Translator(ABC):
             config: TranslationConfig with provider, languages, etc.
         """
         self.config = config
-        self.cache: Dict[str, str] = {}
+        self.cache = self._build_cache()
+        self.http = HttpPool(
+            pool_size=config.http_pool_size,
+            keepalive_expiry=config.http_keepalive_expiry,
+            http2=config.http2,
+            timeout=config.request_timeout,
+        )
+        # Coalesce identical in-flight misses (keyed by cache key)
+        self._inflight = SingleFlight()
+        self._inflight_async = AsyncSingleFlight()
+        # Rate limiter + circuit breaker shared by all instances of the provider
+        self.guard: Optional[ProviderGuard] = self._build_guard()
+        self.memory: Optional[TranslationMemory] = (
+            TranslationMemory(
+                threshold=config.memory_threshold,
+                max_entries=config.memory_max_entries,
+                ttl=config.cache_ttl,
+            )
+            if config.memory_enabled
+            else None
+        )
+        # Keys whose upstream fetch failed recently (cache_negative_ttl)
+        self.negative_cache: Optional[TranslationCache] = (
+            TranslationCache(
+                max_entries=config.cache_max_entries, ttl=config.cache_negative_ttl
+            )
+            if config.cache_negative_ttl > 0
+            else None
+        )
+        # Background refreshes of stale entries, one per key
+        self._refreshing: Set[str] = set()
+        self._refresh_lock = threading.Lock()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        # Worker threads (created on first use): chunks of long texts,
+        # and refreshes of stale entries for sync callers
+        self._chunk_executor: Optional[futures.ThreadPoolExecutor] = None
+        self._refresh_executor: Optional[futures.ThreadPoolExecutor] = None
+
+    def cache_key(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Build the cache key for a translation.
+
+        Uses an MD5 hash of the full text to keep keys short and avoid
+        collisions between long messages sharing a prefix.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language code
+            dest_lang: Destination language code
+
+        Returns:
+            Key of the form "<namespace>:<src>:<dest>:<md5>"
+        """
+        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
+        return f"{self.cache_namespace}:{src_lang}:{dest_lang}:{text_hash}"
 
     @abstractmethod
     def translate(self, text: str, src_lang: str, dest_lang: str) -> str:
@@ -55,10 +157,496 @@ class Translator(ABC):
         """
         pass
 
+    def _build_cache(self) -> Any:
+        """Translation cache built from the config (shared tiers included)."""
+        return build_translation_cache(self.config)
+
+    def _build_guard(self) -> Optional[ProviderGuard]:
+        """The provider's process-wide guard, or None when not guarded."""
+        return get_provider_guard(self.cache_namespace) if self.guarded else None
+
     def clear_cache(self) -> None:
         """Clear the translation cache."""
         self.cache.clear()
 
+    def is_available(self) -> bool:
+        """Whether the provider can make upstream calls (e.g. has credentials)."""
+        return True
+
+    async def translate_async(
+        self, text: str, src_lang: str = None, dest_lang: str = None
+    ) -> str:
+        """Translate text without blocking the event loop.
+
+        Providers with an async HTTP client override this. The default
+        runs the synchronous translate() in a worker thread.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language code
+            dest_lang: Destination language code
+
+        Returns:
+            Translated text, or original text on failure
+        """
+        return await asyncio.to_thread(self.translate, text, src_lang, dest_lang)
+
+    async def batch_translate_async(
+        self, texts: List[str], src_lang: str = None, dest_lang: str = None
+    ) -> List[str]:
+        """Translate multiple texts without blocking the event loop.
+
+        Args:
+            texts: List of texts to translate
+            src_lang: Source language code
+            dest_lang: Destination language code
+
+        Returns:
+            List of translated texts
+        """
+        return await asyncio.to_thread(self.batch_translate, texts, src_lang, dest_lang)
+
+    def translate_segmented(
+        self, text: str, src_lang: str = None, dest_lang: str = None
+    ) -> str:
+        """Translate text sentence by sentence, keeping its layout.
+
+        Each segment is cached on its own, so messages sharing sentences
+        with earlier ones only send the new sentences upstream.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language code
+            dest_lang: Destination language code
+
+        Returns:
+            Translated text with the original whitespace and line breaks
+        """
+        segmented = split_segments(text)
+        if not segmented.segments:
+            return text
+        unique = list(dict.fromkeys(segmented.segments))
+        translated = dict(zip(unique, self.batch_translate(unique, src_lang, dest_lang)))
+        return segmented.join([translated[s] for s in segmented.segments])
+
+    async def translate_segmented_async(
+        self, text: str, src_lang: str = None, dest_lang: str = None
+    ) -> str:
+        """Async translate_segmented().
+
+        Args:
+            text: Text to translate
+            src_lang: Source language code
+            dest_lang: Destination language code
+
+        Returns:
+            Translated text with the original whitespace and line breaks
+        """
+        segmented = split_segments(text)
+        if not segmented.segments:
+            return text
+        unique = list(dict.fromkeys(segmented.segments))
+        results = await self.batch_translate_async(unique, src_lang, dest_lang)
+        translated = dict(zip(unique, results))
+        return segmented.join([translated[s] for s in segmented.segments])
+
+    def close(self) -> None:
+        """Release pooled HTTP connections."""
+        self.http.close()
+        self._shutdown_executors()
+
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections (sync and async)."""
+        await self.http.aclose()
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        self._shutdown_executors()
+
+    def __enter__(self) -> "Translator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "Translator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    # --- Helpers for provider implementations ---
+
+    def _resolve_langs(
+        self, src_lang: Optional[str], dest_lang: Optional[str]
+    ) -> Tuple[str, str]:
+        """Apply config defaults to missing language codes."""
+        return (
+            src_lang or self.config.source_lang,
+            dest_lang or self.config.target_lang,
+        )
+
+    def _fetch(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Perform one upstream translation call (raises on failure)."""
+        raise NotImplementedError
+
+    async def _fetch_async(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Perform one async upstream translation call (raises on failure)."""
+        return await asyncio.to_thread(self._fetch, text, src_lang, dest_lang)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Seconds to wait after the given failed attempt (0-based)."""
+        return self.backoff_factor * (2**attempt)
+
+    def _retry(self, fetch: Callable[[], Any]) -> Any:
+        """Call fetch with exponential backoff; re-raise the final error.
+
+        Each attempt passes the provider guard first (if any). An open
+        circuit or an over-long rate-limit queue raises at once, and
+        retries stop as soon as a failure opens the circuit.
+        """
+        guard = self.guard
+        for attempt in range(self.max_retries):
+            if guard is not None:
+                guard.admit()
+            try:
+                result = fetch()
+            except Exception:
+                if guard is not None:
+                    guard.record_failure()
+                if attempt == self.max_retries - 1 or (
+                    guard is not None and guard.breaker.state != CLOSED
+                ):
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                continue
+            if guard is not None:
+                guard.record_success()
+            return result
+        raise RuntimeError("max_retries must be at least 1")
+
+    async def _retry_async(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Async _retry: each attempt is bounded by config.request_timeout
+        and backoff uses asyncio.sleep so the event loop keeps running."""
+        guard = self.guard
+        for attempt in range(self.max_retries):
+            if guard is not None:
+                await guard.admit_async()
+            try:
+                result = await asyncio.wait_for(
+                    fetch(), timeout=self.config.request_timeout
+                )
+            except asyncio.CancelledError:
+                if guard is not None:
+                    guard.cancel_call()
+                raise
+            except Exception:
+                if guard is not None:
+                    guard.record_failure()
+                if attempt == self.max_retries - 1 or (
+                    guard is not None and guard.breaker.state != CLOSED
+                ):
+                    raise
+                await asyncio.sleep(self._backoff_delay(attempt))
+                continue
+            if guard is not None:
+                guard.record_success()
+            return result
+        raise RuntimeError("max_retries must be at least 1")
+
+    def _translate_uncached(
+        self, text: str, src_lang: str, dest_lang: str, cache_key: str
+    ) -> str:
+        """Fetch with retries and cache the result (original text on failure).
+
+        Concurrent callers for the same cache_key share one upstream call
+        and all see its result or its error. An expired entry still within
+        cache_stale_ttl is returned at once and refreshed in the
+        background; a key that failed within cache_negative_ttl returns
+        the original text without going upstream.
+        """
+        stale = self.cache.get_stale(cache_key)
+        if stale is not None:
+            self._refresh_soon(text, src_lang, dest_lang, cache_key)
+            return stale
+        if self._recently_failed(cache_key):
+            return text
+
+        try:
+            return self._inflight.do(
+                cache_key,
+                lambda: self._fetch_and_cache(text, src_lang, dest_lang, cache_key),
+            )
+        except GUARD_REJECTIONS:
+            return text
+        except Exception:
+            self._record_failure(cache_key)
+            return text
+
+    async def _translate_uncached_async(
+        self, text: str, src_lang: str, dest_lang: str, cache_key: str
+    ) -> str:
+        """Async _translate_uncached (coalesced per event loop)."""
+        stale = self.cache.get_stale(cache_key)
+        if stale is not None:
+            self._refresh_soon_async(text, src_lang, dest_lang, cache_key)
+            return stale
+        if self._recently_failed(cache_key):
+            return text
+
+        try:
+            return await self._inflight_async.do(
+                cache_key,
+                lambda: self._fetch_and_cache_async(text, src_lang, dest_lang, cache_key),
+            )
+        except GUARD_REJECTIONS:
+            return text
+        except Exception:
+            self._record_failure(cache_key)
+            return text
+
+    def _fetch_and_cache(
+        self, text: str, src_lang: str, dest_lang: str, cache_key: str
+    ) -> str:
+        """Memory lookup, else upstream fetch written to cache and memory."""
+        reused = self._memory_lookup(text, src_lang, dest_lang)
+        if reused is not None:
+            return reused
+        translated, complete = self._fetch_chunked(text, src_lang, dest_lang)
+        if complete:
+            self.cache.set(cache_key, translated)
+            self._remember([text], [translated], src_lang, dest_lang)
+        return translated
+
+    async def _fetch_and_cache_async(
+        self, text: str, src_lang: str, dest_lang: str, cache_key: str
+    ) -> str:
+        """Async _fetch_and_cache."""
+        reused = self._memory_lookup(text, src_lang, dest_lang)
+        if reused is not None:
+            return reused
+        translated, complete = await self._fetch_chunked_async(text, src_lang, dest_lang)
+        if complete:
+            await self._cache_set_async({cache_key: translated})
+            self._remember([text], [translated], src_lang, dest_lang)
+        return translated
+
+    # --- Stale-while-revalidate and negative caching ---
+
+    def _recently_failed(self, cache_key: str) -> bool:
+        return self.negative_cache is not None and self.negative_cache.get(cache_key) is not None
+
+    def _record_failure(self, cache_key: str) -> None:
+        if self.negative_cache is not None:
+            self.negative_cache.set(cache_key, "")
+
+    def _claim_refresh(self, cache_key: str) -> bool:
+        """Reserve a background refresh of cache_key (one at a time per key)."""
+        if self._recently_failed(cache_key):
+            return False
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return False
+            self._refreshing.add(cache_key)
+            return True
+
+    def _refresh_soon(self, text: str, src_lang: str, dest_lang: str, cache_key: str) -> None:
+        """Refresh a stale entry on a background thread."""
+        if not self._claim_refresh(cache_key):
+            return
+        if self._refresh_executor is None:
+            self._refresh_executor = futures.ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix=f"{self.cache_namespace}-refresh"
+            )
+        self._refresh_executor.submit(self._refresh, text, src_lang, dest_lang, cache_key)
+
+    def _refresh(self, text: str, src_lang: str, dest_lang: str, cache_key: str) -> None:
+        try:
+            self._inflight.do(
+                cache_key,
+                lambda: self._fetch_and_cache(text, src_lang, dest_lang, cache_key),
+            )
+        except GUARD_REJECTIONS:
+            pass
+        except Exception:
+            self._record_failure(cache_key)
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(cache_key)
+
+    def _refresh_soon_async(
+        self, text: str, src_lang: str, dest_lang: str, cache_key: str
+    ) -> None:
+        """Refresh a stale entry in a background task on the running loop."""
+        if not self._claim_refresh(cache_key):
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._refresh_async(text, src_lang, dest_lang, cache_key)
+        )
+        # Keep a reference until done so the task is not garbage collected
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh_async(
+        self, text: str, src_lang: str, dest_lang: str, cache_key: str
+    ) -> None:
+        try:
+            await self._inflight_async.do(
+                cache_key,
+                lambda: self._fetch_and_cache_async(text, src_lang, dest_lang, cache_key),
+            )
+        except GUARD_REJECTIONS:
+            pass
+        except Exception:
+            self._record_failure(cache_key)
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(cache_key)
+
+    def _chunks(self, text: str) -> Optional[SegmentedText]:
+        """Chunks of text if it exceeds config.max_chunk_chars."""
+        max_chars = self.config.max_chunk_chars
+        if not max_chars or len(text) <= max_chars:
+            return None
+        chunked = chunk_text(text, max_chars)
+        return chunked if len(chunked.segments) > 1 else None
+
+    def _fetch_chunked(
+        self, text: str, src_lang: str, dest_lang: str
+    ) -> Tuple[str, bool]:
+        """Fetch text upstream, in concurrent chunks when it is long.
+
+        Returns:
+            (translation, whether every chunk was translated). Short texts
+            raise on failure like _retry; a failed chunk of a long text
+            keeps its original text instead.
+        """
+        chunked = self._chunks(text)
+        if chunked is None:
+            return self._retry(lambda: self._fetch(text, src_lang, dest_lang)), True
+
+        def fetch_chunk(chunk: str) -> Tuple[str, bool]:
+            try:
+                return self._retry(lambda: self._fetch(chunk, src_lang, dest_lang)), True
+            except Exception:
+                return chunk, False
+
+        if self._chunk_executor is None:
+            self._chunk_executor = futures.ThreadPoolExecutor(
+                max_workers=max(1, self.config.http_pool_size),
+                thread_name_prefix=f"{self.cache_namespace}-chunks",
+            )
+        results = list(self._chunk_executor.map(fetch_chunk, chunked.segments))
+        return chunked.join([r[0] for r in results]), all(r[1] for r in results)
+
+    async def _fetch_chunked_async(
+        self, text: str, src_lang: str, dest_lang: str
+    ) -> Tuple[str, bool]:
+        """Async _fetch_chunked: chunks are fetched as concurrent tasks."""
+        chunked = self._chunks(text)
+        if chunked is None:
+            translated = await self._retry_async(
+                lambda: self._fetch_async(text, src_lang, dest_lang)
+            )
+            return translated, True
+
+        async def fetch_chunk(chunk: str) -> Tuple[str, bool]:
+            try:
+                translated = await self._retry_async(
+                    lambda: self._fetch_async(chunk, src_lang, dest_lang)
+                )
+                return translated, True
+            except Exception:
+                return chunk, False
+
+        results = await asyncio.gather(*(fetch_chunk(c) for c in chunked.segments))
+        return chunked.join([r[0] for r in results]), all(r[1] for r in results)
+
+    def _shutdown_executors(self) -> None:
+        for name in ("_chunk_executor", "_refresh_executor"):
+            executor = getattr(self, name)
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                setattr(self, name, None)
+
+    def _cached_batch_translate(
+        self, texts: List[str], src_lang: str, dest_lang: str
+    ) -> List[str]:
+        """Serve a batch from one get_many call, translating misses once each."""
+        keys = [self.cache_key(text, src_lang, dest_lang) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        results = []
+        for text, key in zip(texts, keys):
+            if key not in cached:
+                cached[key] = self._translate_uncached(text, src_lang, dest_lang, key)
+            results.append(cached[key])
+        return results
+
+    async def _cached_translate_async(
+        self, text: str, src_lang: str, dest_lang: str
+    ) -> str:
+        """Async cache lookup followed by an upstream call on miss."""
+        cache_key = self.cache_key(text, src_lang, dest_lang)
+        cached = (await self._cache_get_many_async([cache_key])).get(cache_key)
+        if cached is not None:
+            return cached
+        return await self._translate_uncached_async(text, src_lang, dest_lang, cache_key)
+
+    async def _cached_batch_translate_async(
+        self, texts: List[str], src_lang: str, dest_lang: str
+    ) -> List[str]:
+        """Async batch: one cache round trip, misses translated concurrently."""
+        keys = [self.cache_key(text, src_lang, dest_lang) for text in texts]
+        cached = await self._cache_get_many_async(keys)
+
+        misses = {key: text for text, key in zip(texts, keys) if key not in cached}
+        if misses:
+            translated = await asyncio.gather(
+                *(
+                    self._translate_uncached_async(text, src_lang, dest_lang, key)
+                    for key, text in misses.items()
+                )
+            )
+            cached.update(zip(misses, translated))
+        return [cached[key] for key in keys]
+
+    async def _cache_get_many_async(self, keys: List[str]) -> Dict[str, str]:
+        """Cache lookup that keeps network tiers off the event loop."""
+        if isinstance(self.cache, TranslationCache):
+            return self.cache.get_many(keys)
+        return await asyncio.to_thread(self.cache.get_many, keys)
+
+    async def _cache_set_async(self, items: Dict[str, str]) -> None:
+        """Cache write that keeps network tiers off the event loop."""
+        if isinstance(self.cache, TranslationCache):
+            self.cache.set_many(items)
+        else:
+            await asyncio.to_thread(self.cache.set_many, items)
+
+    def _memory_lookup(self, text: str, src_lang: str, dest_lang: str) -> Optional[str]:
+        """Translation of a near-duplicate text, if the memory has one.
+
+        Fuzzy matches are not written to the cache, so an exact
+        translation can still replace them there later.
+        """
+        if self.memory is None:
+            return None
+        match = self.memory.lookup(text, src_lang, dest_lang)
+        return match.translation if match is not None else None
+
+    def _remember(
+        self, texts: List[str], translations: List[str], src_lang: str, dest_lang: str
+    ) -> None:
+        """Add upstream translations to the translation memory."""
+        if self.memory is None:
+            return
+        for text, translated in zip(texts, translations):
+            self.memory.add(text, translated, src_lang, dest_lang)
+
+    def _get_async_client(self) -> Any:
+        """Pooled httpx.AsyncClient used by _fetch_async."""
+        return self.http.async_client()
+
 
 class TranslatorFactory:
     """Factory for creating translator instances."""
@@ -105,13 +693,10 @@ def register_builtin_providers():
     """Register built-in translation providers."""
     from src.telegram_multi.translators.google import GoogleTranslator
     from src.telegram_multi.translators.deepl import DeepLTranslator
+    from src.telegram_multi.translators.local import LocalTranslator
+    from src.telegram_multi.translators.composite import HedgedTranslator
 
     TranslatorFactory.register_provider("google", GoogleTranslator)
     TranslatorFactory.register_provider("deepl", DeepLTranslator)
-
-    # Placeholder for future providers
-    # from src.telegram_multi.translators.deepl import DeepLTranslator
-    # TranslatorFactory.register_provider("deepl", DeepLTranslator)
-    #
-    # from src.telegram_multi.translators.local import LocalTranslator
-    # TranslatorFactory.register_provider("local", LocalTranslator)
+    TranslatorFactory.register_provider("local", LocalTranslator)
+    TranslatorFactory.register_provider("hedged", HedgedTranslator)
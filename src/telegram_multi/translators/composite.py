@@ -0,0 +1,435 @@
+"""
+Hedged, latency-aware composite translator.
+
+Contract:
+- HedgedTranslator wraps the providers named in config.hedge_providers
+  (registered as provider "hedged")
+- Each provider has an EWMA of latency and of error rate; requests go to
+  the fastest healthy provider first
+- If the primary has not answered after its p95 latency (config.hedge_delay_ms
+  until enough samples exist), one hedge request goes to the next provider;
+  the first success wins and the loser is cancelled
+- A provider that fails, or whose circuit is open, is replaced by the
+  next one straight away; every call passes that provider's guard, and
+  the composite itself has no guard of its own
+- Results are cached under the "hedged" namespace; routing decisions are
+  exposed via routing_metrics()
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent import futures
+from typing import Callable, Deque, Dict, List, Optional
+from pydantic import BaseModel, Field
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.resilience import OPEN
+from src.telegram_multi.translator import Translator, TranslatorFactory
+
+# Smoothing factor for latency / error-rate EWMAs
+EWMA_ALPHA = 0.2
+# Latency samples kept per provider for the p95 estimate
+LATENCY_WINDOW = 200
+# Samples needed before p95 replaces config.hedge_delay_ms
+MIN_SAMPLES = 10
+# Providers with an error-rate EWMA at or above this are ranked last
+UNHEALTHY_ERROR_RATE = 0.5
+
+
+class ProviderRouteStats(BaseModel):
+    """Routing counters and health of one provider."""
+
+    primary: int = 0
+    hedges: int = 0
+    failovers: int = 0
+    wins: int = 0
+    errors: int = 0
+    cancelled: int = 0
+    latency_ewma_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    error_rate: float = 0.0
+    healthy: bool = True
+
+
+class RoutingMetrics(BaseModel):
+    """Snapshot of HedgedTranslator routing decisions."""
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    failures: int = 0
+    providers: Dict[str, ProviderRouteStats] = Field(default_factory=dict)
+
+
+class ProviderHealth:
+    """Latency and error tracking for one provider (caller holds the lock)."""
+
+    def __init__(self):
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.stats = ProviderRouteStats()
+
+    def record_success(self, latency: float) -> None:
+        self.samples.append(latency)
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += EWMA_ALPHA * (latency - self.latency_ewma)
+        self.error_rate *= 1 - EWMA_ALPHA
+
+    def record_error(self) -> None:
+        self.error_rate += EWMA_ALPHA * (1.0 - self.error_rate)
+        self.stats.errors += 1
+
+    @property
+    def healthy(self) -> bool:
+        return self.error_rate < UNHEALTHY_ERROR_RATE
+
+    def p95(self) -> Optional[float]:
+        """95th percentile latency in seconds, or None with too few samples."""
+        if len(self.samples) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class HedgedTranslator(Translator):
+    """Routes each miss to the fastest healthy provider, hedging slow calls."""
+
+    cache_namespace = "hedged"
+    # Each attempt already tries every provider
+    max_retries = 2
+    # Providers are guarded individually; a composite guard would cap them
+    # all at one provider's rate and open when they all fail together
+    guarded = False
+
+    def __init__(
+        self,
+        config: TranslationConfig,
+        providers: Optional[Dict[str, Translator]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the composite translator.
+
+        Args:
+            config: TranslationConfig; hedge_providers names the providers
+            providers: Pre-built providers by name (default: built through
+                TranslatorFactory from config.hedge_providers)
+            clock: Monotonic time source for latency measurement
+        """
+        super().__init__(config)
+        if providers is None:
+            providers = {}
+            for name in config.hedge_providers:
+                if name == "hedged" or name in providers:
+                    continue
+                provider = TranslatorFactory.create(config.model_copy(update={"provider": name}))
+                if provider.is_available():
+                    providers[name] = provider
+                else:
+                    provider.close()
+        self.providers = providers
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._health = {name: ProviderHealth() for name in providers}
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._failures = 0
+        self._executor: Optional[futures.ThreadPoolExecutor] = None
+
+    def is_available(self) -> bool:
+        """Usable while at least one wrapped provider is."""
+        return bool(self.providers)
+
+    def translate(self, text: str, src_lang: str = None, dest_lang: str = None) -> str:
+        """Translate text via the best provider, hedging slow calls.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language (uses config.source_lang if None)
+            dest_lang: Destination language (uses config.target_lang if None)
+
+        Returns:
+            Translated text, or original text if every provider failed
+        """
+        if not self.config.enabled or not self.providers:
+            return text
+
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+
+        cache_key = self.cache_key(text, src_lang, dest_lang)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        return self._translate_uncached(text, src_lang, dest_lang, cache_key)
+
+    def batch_translate(
+        self, texts: List[str], src_lang: str = None, dest_lang: str = None
+    ) -> List[str]:
+        """Translate multiple texts; each miss is routed and hedged on its own."""
+        if not self.config.enabled or not self.providers:
+            return texts
+
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        return self._cached_batch_translate(texts, src_lang, dest_lang)
+
+    async def translate_async(
+        self, text: str, src_lang: str = None, dest_lang: str = None
+    ) -> str:
+        """Async translate; see translate()."""
+        if not self.config.enabled or not self.providers:
+            return text
+
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        return await self._cached_translate_async(text, src_lang, dest_lang)
+
+    async def batch_translate_async(
+        self, texts: List[str], src_lang: str = None, dest_lang: str = None
+    ) -> List[str]:
+        """Async batch_translate; misses are routed concurrently."""
+        if not self.config.enabled or not self.providers:
+            return texts
+
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        return await self._cached_batch_translate_async(texts, src_lang, dest_lang)
+
+    def routing_metrics(self) -> RoutingMetrics:
+        """Return a snapshot of routing decisions and provider health."""
+        with self._lock:
+            providers = {}
+            for name, health in self._health.items():
+                p95 = health.p95()
+                providers[name] = health.stats.model_copy(
+                    update={
+                        "latency_ewma_ms": (
+                            health.latency_ewma * 1000
+                            if health.latency_ewma is not None
+                            else None
+                        ),
+                        "p95_ms": p95 * 1000 if p95 is not None else None,
+                        "error_rate": health.error_rate,
+                        "healthy": health.healthy,
+                    }
+                )
+            return RoutingMetrics(
+                requests=self._requests,
+                hedged=self._hedged,
+                hedge_wins=self._hedge_wins,
+                failures=self._failures,
+                providers=providers,
+            )
+
+    def close(self) -> None:
+        """Release the wrapped providers and the hedging threads."""
+        super().close()
+        for provider in self.providers.values():
+            provider.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def aclose(self) -> None:
+        """Release the wrapped providers (sync and async clients)."""
+        await super().aclose()
+        for provider in self.providers.values():
+            await provider.aclose()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # --- Routing ---
+
+    def _ranked(self) -> List[str]:
+        """Provider names, healthy first, then by latency EWMA.
+
+        Providers with an open circuit count as unhealthy. Providers
+        without samples sort first so each gets measured.
+        """
+        circuits = {name: p.guard.breaker.state for name, p in self.providers.items()}
+        with self._lock:
+            return sorted(
+                self.providers,
+                key=lambda name: (
+                    not self._health[name].healthy or circuits[name] == OPEN,
+                    self._health[name].latency_ewma or 0.0,
+                ),
+            )
+
+    def _hedge_delay(self, name: str) -> float:
+        """Seconds to wait on a provider before hedging."""
+        with self._lock:
+            p95 = self._health[name].p95()
+        return p95 if p95 is not None else self.config.hedge_delay_ms / 1000.0
+
+    def _note_launch(self, name: str, role: str) -> None:
+        with self._lock:
+            stats = self._health[name].stats
+            if role == "primary":
+                stats.primary += 1
+                self._requests += 1
+            elif role == "hedge":
+                stats.hedges += 1
+                self._hedged += 1
+            else:
+                stats.failovers += 1
+
+    def _note_result(self, name: str, latency: Optional[float], role: str) -> None:
+        """Record a finished attempt; latency None means it failed."""
+        with self._lock:
+            health = self._health[name]
+            if latency is None:
+                health.record_error()
+                return
+            health.record_success(latency)
+            health.stats.wins += 1
+            if role == "hedge":
+                self._hedge_wins += 1
+
+    def _note_cancelled(self, name: str) -> None:
+        with self._lock:
+            self._health[name].stats.cancelled += 1
+
+    def _note_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+
+    def _fetch(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Race providers on worker threads.
+
+        A losing thread cannot be interrupted; its result is discarded.
+        """
+        candidates = deque(self._ranked())
+        if not candidates:
+            raise RuntimeError("No translation provider available")
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(
+                max_workers=max(2, len(self.providers) * self.config.http_pool_size),
+                thread_name_prefix="hedged-translate",
+            )
+
+        running: Dict[futures.Future, tuple] = {}
+        hedged = False
+
+        def launch(role: str) -> None:
+            name = candidates.popleft()
+            self._note_launch(name, role)
+            future = self._executor.submit(self._attempt, name, text, src_lang, dest_lang)
+            running[future] = (name, role)
+
+        launch("primary")
+        delay = self._hedge_delay(next(iter(running.values()))[0])
+        last_error: Optional[BaseException] = None
+        try:
+            while running:
+                timeout = delay if candidates and not hedged else None
+                done, _ = futures.wait(
+                    running, timeout=timeout, return_when=futures.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    launch("hedge")
+                    continue
+                for future in done:
+                    name, role = running.pop(future)
+                    try:
+                        result, latency = future.result()
+                    except Exception as e:
+                        self._note_result(name, None, role)
+                        last_error = e
+                        continue
+                    self._note_result(name, latency, role)
+                    return result
+                if not running and candidates:
+                    launch("failover")
+        finally:
+            for future, (name, _) in running.items():
+                future.cancel()
+                self._note_cancelled(name)
+        self._note_failure()
+        raise last_error or RuntimeError("All translation providers failed")
+
+    async def _fetch_async(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Race providers as tasks; the loser is cancelled."""
+        candidates = deque(self._ranked())
+        if not candidates:
+            raise RuntimeError("No translation provider available")
+
+        loop = asyncio.get_running_loop()
+        running: Dict[asyncio.Task, tuple] = {}
+        hedged = False
+
+        def launch(role: str) -> None:
+            name = candidates.popleft()
+            self._note_launch(name, role)
+            task = loop.create_task(self._attempt_async(name, text, src_lang, dest_lang))
+            running[task] = (name, role)
+
+        launch("primary")
+        delay = self._hedge_delay(next(iter(running.values()))[0])
+        last_error: Optional[BaseException] = None
+        try:
+            while running:
+                timeout = delay if candidates and not hedged else None
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    launch("hedge")
+                    continue
+                for task in done:
+                    name, role = running.pop(task)
+                    try:
+                        result, latency = task.result()
+                    except Exception as e:
+                        self._note_result(name, None, role)
+                        last_error = e
+                        continue
+                    self._note_result(name, latency, role)
+                    return result
+                if not running and candidates:
+                    launch("failover")
+        finally:
+            # Also runs when the caller times out or is cancelled
+            for task, (name, _) in running.items():
+                task.cancel()
+                self._note_cancelled(name)
+        self._note_failure()
+        raise last_error or RuntimeError("All translation providers failed")
+
+    def _attempt(self, name: str, text: str, src_lang: str, dest_lang: str) -> tuple:
+        """One blocking provider call through its guard; returns (translation, latency)."""
+        provider = self.providers[name]
+        src, dest = provider._resolve_langs(src_lang, dest_lang)
+        provider.guard.admit()
+        start = self._clock()
+        try:
+            result = provider._fetch(text, src, dest)
+        except Exception:
+            provider.guard.record_failure()
+            raise
+        provider.guard.record_success()
+        return result, self._clock() - start
+
+    async def _attempt_async(
+        self, name: str, text: str, src_lang: str, dest_lang: str
+    ) -> tuple:
+        """One async provider call through its guard; returns (translation, latency)."""
+        provider = self.providers[name]
+        src, dest = provider._resolve_langs(src_lang, dest_lang)
+        await provider.guard.admit_async()
+        start = self._clock()
+        try:
+            result = await provider._fetch_async(text, src, dest)
+        except asyncio.CancelledError:
+            provider.guard.cancel_call()
+            raise
+        except Exception:
+            provider.guard.record_failure()
+            raise
+        provider.guard.record_success()
+        return result, self._clock() - start
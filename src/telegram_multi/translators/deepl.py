@@ -1,19 +1,40 @@
 """
 DeepL Translate provider implementation.
+
+Contract:
+- Official /v2/translate API, auth key from settings.deepl_api_key
+- batch_translate sends cache misses as multi-text requests, packed up to
+  the API limits (50 texts, 128 KiB body) and config.batch_max_chars
+- Each request has its own retry ladder; a failed request falls back to
+  the original texts of that request only
+- Batch misses share the single-text machinery: stale entries are served
+  and refreshed in the background, recently failed keys are not retried
+  until cache_negative_ttl passes, keys already in flight are joined
+  rather than sent again, and texts over max_chunk_chars are fetched in
+  chunks on their own
+- Requests go through the translator's keep-alive HttpPool
+- Near-duplicates found in the translation memory are not sent upstream
 """
 
-import hashlib
-import time
-import requests
-from typing import List, Optional
-from src.telegram_multi.translator import Translator
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote_plus
+from src.telegram_multi.translator import GUARD_REJECTIONS, Translator
 from src.telegram_multi.config import TranslationConfig
 from src.telegram_multi.settings import settings
 
+# DeepL API limits for a single /v2/translate request
+MAX_TEXTS_PER_REQUEST = 50
+MAX_REQUEST_BYTES = 128 * 1024
+# Room left for auth_key, target_lang and other form fields
+_REQUEST_OVERHEAD_BYTES = 1024
+
 
 class DeepLTranslator(Translator):
     """DeepL Translate provider using official API."""
 
+    cache_namespace = "deepl"
+
     def __init__(self, config: TranslationConfig):
         """Initialize DeepL Translator.
 
@@ -40,57 +61,307 @@ class DeepLTranslator(Translator):
         if not self.config.enabled or not self.api_key:
             return text
 
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+
+        cache_key = self.cache_key(text, src_lang, dest_lang)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        return self._translate_uncached(text, src_lang, dest_lang, cache_key)
+
+    def batch_translate(
+        self, texts: List[str], src_lang: str = None, dest_lang: str = None
+    ) -> List[str]:
+        """Translate multiple texts with as few API requests as possible.
+
+        Cache lookups for the whole batch are done in one get_many call;
+        distinct misses are packed into multi-text requests and the
+        results spliced back in input order.
+        """
+        if not self.config.enabled or not self.api_key:
+            return texts
+
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        keys = [self.cache_key(t, src_lang, dest_lang) for t in texts]
+        results = self.cache.get_many(keys)
+
+        pending, oversized = self._split_misses(
+            _distinct_misses(texts, keys, results),
+            results,
+            src_lang,
+            dest_lang,
+            self._refresh_soon,
+        )
+        for key, text in oversized.items():
+            results[key] = self._translate_uncached(text, src_lang, dest_lang, key)
+        for group in self._plan_requests(pending):
+            results.update(self._translate_group(group, src_lang, dest_lang))
+
+        return [results.get(key, text) for text, key in zip(texts, keys)]
+
+    async def translate_async(
+        self, text: str, src_lang: str = None, dest_lang: str = None
+    ) -> str:
+        """Async translate; see translate()."""
+        if not self.config.enabled or not self.api_key:
+            return text
+
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        return await self._cached_translate_async(text, src_lang, dest_lang)
+
+    async def batch_translate_async(
+        self, texts: List[str], src_lang: str = None, dest_lang: str = None
+    ) -> List[str]:
+        """Async batch_translate; the packed requests run concurrently."""
+        if not self.config.enabled or not self.api_key:
+            return texts
+
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        keys = [self.cache_key(t, src_lang, dest_lang) for t in texts]
+        results = await self._cache_get_many_async(keys)
+
+        pending, oversized = self._split_misses(
+            _distinct_misses(texts, keys, results),
+            results,
+            src_lang,
+            dest_lang,
+            self._refresh_soon_async,
+        )
+        groups = self._plan_requests(pending)
+        for translated in await asyncio.gather(
+            *(self._translate_group_async(g, src_lang, dest_lang) for g in groups)
+        ):
+            results.update(translated)
+        if oversized:
+            translated = await asyncio.gather(
+                *(
+                    self._translate_uncached_async(text, src_lang, dest_lang, key)
+                    for key, text in oversized.items()
+                )
+            )
+            results.update(zip(oversized, translated))
+
+        return [results.get(key, text) for text, key in zip(texts, keys)]
+
+    def is_available(self) -> bool:
+        """DeepL needs an API key."""
+        return bool(self.api_key)
+
+    def _resolve_langs(self, src_lang: Optional[str], dest_lang: Optional[str]):
+        """Apply config defaults and DeepL language code adjustments."""
         src_lang = src_lang or self.config.source_lang
         dest_lang = dest_lang or self.config.target_lang
-        
+
         # DeepL specific language code adjustments (e.g., EN -> EN-US)
         if dest_lang.upper() == "EN":
             dest_lang = "EN-US"
         if dest_lang.upper() == "ZH":
             dest_lang = "ZH"
+        return src_lang, dest_lang
+
+    def _split_misses(
+        self,
+        misses: Dict[str, tuple],
+        results: Dict[str, str],
+        src_lang: str,
+        dest_lang: str,
+        refresh: Callable[[str, str, str, str], None],
+    ) -> Tuple[List[tuple], Dict[str, str]]:
+        """Settle what misses can be settled locally; sort the rest.
 
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        cache_key = f"deepl:{src_lang}:{dest_lang}:{text_hash}"
-
-        now = time.time()
-        if cache_key in self.cache:
-            entry = self.cache[cache_key]
-            if isinstance(entry, tuple) and len(entry) == 2:
-                trans_text, timestamp = entry
-                if now - timestamp < self.config.cache_ttl:
-                    return trans_text
-
-        # Try translation with retries
-        for attempt in range(self.max_retries):
-            try:
-                params = {
-                    "auth_key": self.api_key,
-                    "text": text,
-                    "target_lang": dest_lang.upper(),
-                }
-                if src_lang and src_lang.lower() != "auto":
-                    params["source_lang"] = src_lang.upper()
-
-                response = requests.post(self.base_url, data=params, timeout=10)
-                response.raise_for_status()
-                
-                result = response.json()
-                if "translations" in result and len(result["translations"]) > 0:
-                    trans_text = result["translations"][0]["text"]
-                    self.cache[cache_key] = (trans_text, now)
-                    return trans_text
-
-            except Exception as e:
-                if attempt < self.max_retries - 1:
-                    wait_time = self.backoff_factor * (2**attempt)
-                    time.sleep(wait_time)
+        Stale entries (refreshed via refresh), recently failed keys and
+        translation-memory matches are written to results.
+
+        Returns:
+            ((key, text) items to pack into requests, {key: text} of texts
+            too long for one request, to be fetched in chunks)
+        """
+        pending: List[tuple] = []
+        oversized: Dict[str, str] = {}
+        for key, (_, text) in misses.items():
+            stale = self.cache.get_stale(key)
+            if stale is not None:
+                refresh(text, src_lang, dest_lang, key)
+                results[key] = stale
+            elif self._recently_failed(key):
+                results[key] = text
+            elif self._chunks(text) is not None:
+                oversized[key] = text
+            else:
+                reused = self._memory_lookup(text, src_lang, dest_lang)
+                if reused is None:
+                    pending.append((key, text))
                 else:
-                    return text
+                    results[key] = reused
+        return pending, oversized
 
-        return text
+    def _plan_requests(self, items: List[tuple]) -> List[List[tuple]]:
+        """Pack (key, text) items into request-sized groups, keeping order.
 
-    def batch_translate(
-        self, texts: List[str], src_lang: str = None, dest_lang: str = None
+        A group closes when adding the next text would exceed the text
+        count, the encoded body size, or config.batch_max_chars. A single
+        text over a limit still gets a request of its own.
+        """
+        max_chars = self.config.batch_max_chars
+        max_bytes = MAX_REQUEST_BYTES - _REQUEST_OVERHEAD_BYTES
+
+        groups: List[List[tuple]] = []
+        current: List[tuple] = []
+        chars = size = 0
+        for key, text in items:
+            # "&text=" plus the form-encoded value
+            text_size = len(quote_plus(text)) + 6
+            if current and (
+                len(current) >= MAX_TEXTS_PER_REQUEST
+                or size + text_size > max_bytes
+                or (max_chars is not None and chars + len(text) > max_chars)
+            ):
+                groups.append(current)
+                current, chars, size = [], 0, 0
+            current.append((key, text))
+            chars += len(text)
+            size += text_size
+        if current:
+            groups.append(current)
+        return groups
+
+    def _translate_group(
+        self, group: List[tuple], src_lang: str, dest_lang: str
+    ) -> Dict[str, str]:
+        """Translate one packed request; originals if all retries fail.
+
+        Keys another caller is already fetching are joined instead of
+        being sent again.
+        """
+        texts = dict(group)
+        shared = self._inflight.do_many(
+            list(texts),
+            lambda keys: self._fetch_group(
+                {key: texts[key] for key in keys}, src_lang, dest_lang
+            ),
+        )
+        return self._settle(shared, texts)
+
+    async def _translate_group_async(
+        self, group: List[tuple], src_lang: str, dest_lang: str
+    ) -> Dict[str, str]:
+        """Async _translate_group."""
+        texts = dict(group)
+        shared = await self._inflight_async.do_many(
+            list(texts),
+            lambda keys: self._fetch_group_async(
+                {key: texts[key] for key in keys}, src_lang, dest_lang
+            ),
+        )
+        return self._settle(shared, texts)
+
+    def _fetch_group(
+        self, group: Dict[str, str], src_lang: str, dest_lang: str
+    ) -> Dict[str, str]:
+        """One request for {key: text}, written to cache and memory (raises on failure)."""
+        texts = list(group.values())
+        translated = self._retry(lambda: self._fetch_many(texts, src_lang, dest_lang))
+        results = dict(zip(group, translated))
+        self.cache.set_many(results)
+        self._remember(texts, translated, src_lang, dest_lang)
+        return results
+
+    async def _fetch_group_async(
+        self, group: Dict[str, str], src_lang: str, dest_lang: str
+    ) -> Dict[str, str]:
+        """Async _fetch_group."""
+        texts = list(group.values())
+        translated = await self._retry_async(
+            lambda: self._fetch_many_async(texts, src_lang, dest_lang)
+        )
+        results = dict(zip(group, translated))
+        await self._cache_set_async(results)
+        self._remember(texts, translated, src_lang, dest_lang)
+        return results
+
+    def _settle(self, shared: Dict[str, object], texts: Dict[str, str]) -> Dict[str, str]:
+        """Results of completed per-key calls; failed keys keep their text.
+
+        Upstream failures are recorded in the negative cache; guard
+        rejections are not.
+        """
+        results = {}
+        for key, future in shared.items():
+            if future.cancelled():
+                results[key] = texts[key]
+                continue
+            error = future.exception()
+            if error is None:
+                results[key] = future.result()
+                continue
+            if not isinstance(error, GUARD_REJECTIONS):
+                self._record_failure(key)
+            results[key] = texts[key]
+        return results
+
+    def _build_params(
+        self, texts: List[str], src_lang: str, dest_lang: str
+    ) -> Dict[str, object]:
+        """Form fields for a /v2/translate request (one "text" per input)."""
+        params = {
+            "auth_key": self.api_key,
+            "text": texts,
+            "target_lang": dest_lang.upper(),
+        }
+        if src_lang and src_lang.lower() != "auto":
+            params["source_lang"] = src_lang.upper()
+        return params
+
+    def _fetch(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """One blocking DeepL API call for a single text."""
+        return self._fetch_many([text], src_lang, dest_lang)[0]
+
+    async def _fetch_async(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """One non-blocking DeepL API call for a single text."""
+        return (await self._fetch_many_async([text], src_lang, dest_lang))[0]
+
+    def _fetch_many(self, texts: List[str], src_lang: str, dest_lang: str) -> List[str]:
+        """One blocking DeepL API call for several texts."""
+        response = self.http.session().post(
+            self.base_url,
+            data=self._build_params(texts, src_lang, dest_lang),
+            timeout=self.config.request_timeout,
+        )
+        response.raise_for_status()
+        return _translations(response.json(), len(texts))
+
+    async def _fetch_many_async(
+        self, texts: List[str], src_lang: str, dest_lang: str
     ) -> List[str]:
-        """Translate multiple texts."""
-        return [self.translate(t, src_lang, dest_lang) for t in texts]
+        """One non-blocking DeepL API call for several texts."""
+        response = await self._get_async_client().post(
+            self.base_url, data=self._build_params(texts, src_lang, dest_lang)
+        )
+        response.raise_for_status()
+        return _translations(response.json(), len(texts))
+
+
+def _distinct_misses(
+    texts: List[str], keys: List[str], cached: Dict[str, str]
+) -> Dict[str, tuple]:
+    """Map each uncached key to its (key, text) item, first occurrence only."""
+    misses: Dict[str, tuple] = {}
+    for text, key in zip(texts, keys):
+        if key not in cached and key not in misses:
+            misses[key] = (key, text)
+    return misses
+
+
+def _translations(result: dict, expected: int) -> List[str]:
+    """Extract translations from a DeepL reply, in request order.
+
+    Raises:
+        ValueError: If the reply does not hold one translation per text
+    """
+    translations = result.get("translations") or []
+    if len(translations) != expected:
+        raise ValueError(
+            f"DeepL returned {len(translations)} translations for {expected} texts"
+        )
+    return [item["text"] for item in translations]
@@ -7,18 +7,21 @@ Contract:
 - Caches translations to reduce API calls
 - Gracefully handles failures (returns original text)
 - Implements exponential backoff for rate limiting
+- Async path calls the translate_a endpoint through httpx (no thread hop)
 """
 
-import hashlib
-import time
 from typing import List
 from src.telegram_multi.translator import Translator
 from src.telegram_multi.config import TranslationConfig
 
+GOOGLE_TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+
 
 class GoogleTranslator(Translator):
     """Google Translate provider using googletrans library."""
 
+    cache_namespace = "google"
+
     def __init__(self, config: TranslationConfig):
         """Initialize Google Translator.
 
@@ -28,6 +31,7 @@ class GoogleTranslator(Translator):
         super().__init__(config)
         self.max_retries = 3
         self.backoff_factor = 0.5  # Exponential backoff multiplier
+        self.base_url = GOOGLE_TRANSLATE_URL
 
         # Initialize library once
         from googletrans import Translator as GoogleTransLib
@@ -48,53 +52,23 @@ class GoogleTranslator(Translator):
         if not self.config.enabled:
             return text
 
-        src_lang = src_lang or self.config.source_lang
-        dest_lang = dest_lang or self.config.target_lang
-
-        # Create cache key using MD5 hash of full text to avoid collisions
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        cache_key = f"{src_lang}:{dest_lang}:{text_hash}"
-
-        # Check cache with TTL
-        now = time.time()
-        if cache_key in self.cache:
-            entry = self.cache[cache_key]
-            # entry is expected to be a tuple (translated_text, timestamp)
-            if isinstance(entry, tuple) and len(entry) == 2:
-                trans_text, timestamp = entry
-                if now - timestamp < self.config.cache_ttl:
-                    return trans_text
-
-        # Try translation with retries
-        for attempt in range(self.max_retries):
-            try:
-                result = self._lib.translate(text, src=src_lang, dest=dest_lang)
-                trans_text = (
-                    result.get("text", text)
-                    if isinstance(result, dict)
-                    else result.text
-                )
-
-                # Cache the result with current timestamp
-                self.cache[cache_key] = (trans_text, now)
-                return trans_text
-
-            except Exception:
-                if attempt < self.max_retries - 1:
-                    # Exponential backoff
-                    wait_time = self.backoff_factor * (2**attempt)
-                    time.sleep(wait_time)
-                else:
-                    # Final attempt failed, return original text
-                    return text
-
-        return text
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+
+        cache_key = self.cache_key(text, src_lang, dest_lang)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        return self._translate_uncached(text, src_lang, dest_lang, cache_key)
 
     def batch_translate(
         self, texts: List[str], src_lang: str = None, dest_lang: str = None
     ) -> List[str]:
         """Translate multiple texts.
 
+        Cache lookups for the whole batch are done in one get_many call
+        (a single round trip when a shared tier is configured).
+
         Args:
             texts: List of texts to translate
             src_lang: Source language (uses config.source_lang if None)
@@ -106,9 +80,62 @@ class GoogleTranslator(Translator):
         if not self.config.enabled:
             return texts
 
-        results = []
-        for text in texts:
-            translated = self.translate(text, src_lang, dest_lang)
-            results.append(translated)
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        return self._cached_batch_translate(texts, src_lang, dest_lang)
+
+    async def translate_async(
+        self, text: str, src_lang: str = None, dest_lang: str = None
+    ) -> str:
+        """Async translate; see translate()."""
+        if not self.config.enabled:
+            return text
+
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        return await self._cached_translate_async(text, src_lang, dest_lang)
+
+    async def batch_translate_async(
+        self, texts: List[str], src_lang: str = None, dest_lang: str = None
+    ) -> List[str]:
+        """Async batch_translate; cache misses are fetched concurrently."""
+        if not self.config.enabled:
+            return texts
 
-        return results
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        return await self._cached_batch_translate_async(texts, src_lang, dest_lang)
+
+    def _fetch(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """One googletrans call."""
+        result = self._lib.translate(text, src=src_lang, dest=dest_lang)
+        return result.get("text", text) if isinstance(result, dict) else result.text
+
+    async def _fetch_async(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """One non-blocking call to the translate_a endpoint."""
+        response = await self._get_async_client().get(
+            self.base_url,
+            params={
+                "client": "gtx",
+                "sl": src_lang or "auto",
+                "tl": dest_lang,
+                "dt": "t",
+                "q": text,
+            },
+        )
+        response.raise_for_status()
+        return parse_translate_a_response(response.json())
+
+
+def parse_translate_a_response(data) -> str:
+    """Join the translated sentence fragments of a translate_a reply.
+
+    Args:
+        data: Decoded JSON reply ([[["translated", "original", ...], ...], ...])
+
+    Returns:
+        Translated text
+
+    Raises:
+        ValueError: If the reply has no translation segments
+    """
+    if not data or not data[0]:
+        raise ValueError("Empty translate_a response")
+    return "".join(segment[0] for segment in data[0] if segment and segment[0])
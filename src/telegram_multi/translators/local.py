@@ -0,0 +1,104 @@
+"""
+Offline translation provider backed by a memory-mapped phrase table.
+
+Contract:
+- Table path from config.phrase_table_path (see phrase_table.py and
+  scripts/build_phrase_table.py)
+- Exact match for the whole text first, then longest-phrase segmentation
+- No network calls, caching, retries or rate limiting: a lookup is
+  cheaper than a cache hit
+- Text with no known phrase, or a missing table, is returned unchanged
+"""
+
+import sys
+from typing import List, Optional
+from src.telegram_multi.cache import TranslationCache
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.phrase_table import PhraseTable, open_phrase_table
+from src.telegram_multi.resilience import CircuitBreaker, ProviderGuard, TokenBucket
+from src.telegram_multi.translator import Translator
+
+
+class LocalTranslator(Translator):
+    """Phrase-table provider with zero network cost."""
+
+    cache_namespace = "local"
+
+    def __init__(self, config: TranslationConfig):
+        """Initialize Local Translator.
+
+        Args:
+            config: TranslationConfig with phrase_table_path and languages
+        """
+        super().__init__(config)
+        self.table: Optional[PhraseTable] = None
+        if config.phrase_table_path:
+            try:
+                self.table = open_phrase_table(config.phrase_table_path)
+            except (OSError, ValueError):
+                self.table = None
+
+    def _build_cache(self) -> TranslationCache:
+        """Bare in-memory cache; lookups are not cached, so no shared tiers are opened."""
+        return TranslationCache(max_entries=1)
+
+    def _build_guard(self) -> ProviderGuard:
+        """Private guard: lookups are local, so no rate limit, and a miss is not an outage."""
+        return ProviderGuard(
+            "local",
+            TokenBucket(rate=0, capacity=1),
+            CircuitBreaker(failure_threshold=sys.maxsize),
+        )
+
+    def is_available(self) -> bool:
+        """Available once a phrase table is mapped."""
+        return self.table is not None
+
+    def translate(self, text: str, src_lang: str = None, dest_lang: str = None) -> str:
+        """Translate text from the phrase table.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language (uses config.source_lang if None)
+            dest_lang: Destination language (uses config.target_lang if None)
+
+        Returns:
+            Translated text, or original text if nothing matched
+        """
+        if not self.config.enabled or self.table is None:
+            return text
+
+        src_lang, dest_lang = self._resolve_langs(src_lang, dest_lang)
+        translated = self.table.translate(text, src_lang, dest_lang)
+        return text if translated is None else translated
+
+    def batch_translate(
+        self, texts: List[str], src_lang: str = None, dest_lang: str = None
+    ) -> List[str]:
+        """Translate multiple texts from the phrase table."""
+        return [self.translate(text, src_lang, dest_lang) for text in texts]
+
+    async def translate_async(
+        self, text: str, src_lang: str = None, dest_lang: str = None
+    ) -> str:
+        """Async translate; lookups never block, so no thread hop."""
+        return self.translate(text, src_lang, dest_lang)
+
+    async def batch_translate_async(
+        self, texts: List[str], src_lang: str = None, dest_lang: str = None
+    ) -> List[str]:
+        """Async batch_translate; see translate_async()."""
+        return self.batch_translate(texts, src_lang, dest_lang)
+
+    def _fetch(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Table lookup for composite providers (raises when nothing matched)."""
+        if self.table is None:
+            raise RuntimeError("No phrase table loaded")
+        translated = self.table.translate(text, src_lang, dest_lang)
+        if translated is None:
+            raise LookupError("No phrase of the text is in the table")
+        return translated
+
+    async def _fetch_async(self, text: str, src_lang: str, dest_lang: str) -> str:
+        """Async _fetch without a thread hop."""
+        return self._fetch(text, src_lang, dest_lang)
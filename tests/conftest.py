@@ -0,0 +1,55 @@
+"""
+Shared pytest fixtures.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.resilience import reset_provider_guards
+from src.telegram_multi.translators.google import GoogleTranslator
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def upper(text: str, src: str, dest: str) -> str:
+    return text.upper()
+
+
+@pytest.fixture(autouse=True)
+def fresh_provider_guards():
+    """Keep circuit breaker / rate limiter state from leaking between tests."""
+    reset_provider_guards()
+    yield
+    reset_provider_guards()
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Clock starting at 0; tests move it by setting clock.now."""
+    return FakeClock()
+
+
+@pytest.fixture
+def make_google():
+    """Build GoogleTranslators whose upstream calls are mocks.
+
+    _fetch is a MagicMock and _fetch_async an AsyncMock running fetch /
+    fetch_async (upper-casing by default); retries do not back off.
+    """
+
+    def make(fetch=None, fetch_async=None, **overrides) -> GoogleTranslator:
+        translator = GoogleTranslator(TranslationConfig(enabled=True, **overrides))
+        translator.backoff_factor = 0
+        translator._fetch = MagicMock(side_effect=fetch or upper)
+        translator._fetch_async = AsyncMock(side_effect=fetch_async or fetch or upper)
+        return translator
+
+    return make
@@ -0,0 +1,410 @@
+// Runs the injected page script against a small DOM stub with a virtual
+// clock and prints what a scenario observed as JSON.
+//
+// Usage: node page_harness.js <script.js> <scenario>
+//
+// Driven by tests/test_page_script.py; the stub implements only what the
+// script touches (simple selectors, observers, timers, storage).
+
+const fs = require('fs');
+
+// --- Virtual clock ---
+let now = 0;
+let timerSeq = 0;
+const timers = [];
+
+global.setTimeout = (fn, ms = 0, ...args) => {
+  const id = ++timerSeq;
+  timers.push({ id, at: now + Math.max(0, ms || 0), fn, args });
+  return id;
+};
+global.clearTimeout = (id) => {
+  const i = timers.findIndex(t => t.id === id);
+  if (i >= 0) timers.splice(i, 1);
+};
+global.setInterval = () => 0;
+global.requestAnimationFrame = (fn) => setTimeout(() => fn(now), 16);
+
+// Each idle slice may check timeRemaining() idleChecks times before the
+// idle period is used up
+let idleChecks = Infinity;
+const idleSlices = [];
+global.requestIdleCallback = (fn) => setTimeout(() => {
+  let left = idleChecks;
+  const slice = { checks: 0 };
+  idleSlices.push(slice);
+  fn({ didTimeout: false, timeRemaining: () => (slice.checks++, left-- > 0 ? 5 : 0) });
+}, 1);
+
+async function settle() {
+  for (let i = 0; i < 20; i++) await new Promise(resolve => setImmediate(resolve));
+}
+
+async function advance(ms) {
+  const end = now + ms;
+  await settle();
+  for (;;) {
+    timers.sort((a, b) => a.at - b.at || a.id - b.id);
+    const next = timers[0];
+    if (!next || next.at > end) break;
+    timers.shift();
+    now = Math.max(now, next.at);
+    next.fn(...next.args);
+    await settle();
+  }
+  now = end;
+}
+
+// --- DOM stub ---
+function parseSelector(selector) {
+  return selector.split(',').map(part => {
+    const simple = { tag: null, id: null, classes: [], attrs: [] };
+    const re = /^([a-zA-Z][\w-]*)|#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:([*^]?=)"([^"]*)")?\]/g;
+    let m;
+    while ((m = re.exec(part.trim())) !== null) {
+      if (m[1]) simple.tag = m[1].toLowerCase();
+      else if (m[2]) simple.id = m[2];
+      else if (m[3]) simple.classes.push(m[3]);
+      else simple.attrs.push({ name: m[4], op: m[5], value: m[6] });
+    }
+    return simple;
+  });
+}
+
+function attrValue(el, name) {
+  if (name === 'class') return el.className;
+  if (name === 'id') return el.id;
+  if (name.startsWith('data-')) {
+    const key = name.slice(5).replace(/-(\w)/g, (_, c) => c.toUpperCase());
+    return el.dataset[key];
+  }
+  return el.attributes[name];
+}
+
+function matchesSimple(el, s) {
+  if (s.tag && el.tagName !== s.tag) return false;
+  if (s.id && el.id !== s.id) return false;
+  if (s.classes.some(c => !el.classList.contains(c))) return false;
+  return s.attrs.every(({ name, op, value }) => {
+    const v = attrValue(el, name);
+    if (v === undefined || v === null || v === '') return false;
+    if (op === '=') return v === value;
+    if (op === '*=') return String(v).includes(value);
+    if (op === '^=') return String(v).startsWith(value);
+    return true;
+  });
+}
+
+class El {
+  constructor(tag, opts = {}) {
+    this.nodeType = 1;
+    this.tagName = tag.toLowerCase();
+    this.id = opts.id || '';
+    this.className = opts.cls || '';
+    this.dataset = { ...(opts.dataset || {}) };
+    this.attributes = {};
+    this.style = {};
+    this.children = [];
+    this.parentNode = null;
+    this.ownText = opts.text || '';
+    this.listeners = {};
+    this.detached = false;
+    const el = this;
+    this.classList = {
+      contains: c => el.className.split(/\s+/).includes(c),
+      add: c => { if (!el.classList.contains(c)) el.className = (el.className + ' ' + c).trim(); },
+      remove: c => { el.className = el.className.split(/\s+/).filter(x => x !== c).join(' '); },
+      toggle: (c, on) => (on ?? !el.classList.contains(c))
+        ? el.classList.add(c) : el.classList.remove(c),
+    };
+    (opts.children || []).forEach(child => this.appendChild(child));
+  }
+  get isConnected() {
+    let node = this;
+    while (node.parentNode) node = node.parentNode;
+    return node === document.documentElement && !this.detached;
+  }
+  get textContent() { return this.ownText + this.children.map(c => c.textContent).join(''); }
+  set textContent(value) { this.children = []; this.ownText = String(value); }
+  get innerText() { return this.textContent; }
+  get lastChild() { return this.children[this.children.length - 1] || null; }
+  set innerHTML(html) {
+    // Only elements with an id are materialized (settings panel controls)
+    this.children = [];
+    for (const m of String(html).matchAll(/<(\w+)[^>]*\bid="([^"]+)"/g)) {
+      this.appendChild(new El(m[1], { id: m[2] }));
+    }
+  }
+  get innerHTML() { return ''; }
+  appendChild(child) {
+    if (child.tagName === '#fragment') {
+      child.children.slice().forEach(c => this.appendChild(c));
+      child.children = [];
+      return child;
+    }
+    if (child.parentNode) child.parentNode.children = child.parentNode.children.filter(c => c !== child);
+    child.parentNode = this;
+    this.children.push(child);
+    return child;
+  }
+  insertBefore(child) { return this.appendChild(child); }
+  replaceChildren(...nodes) { this.children = []; nodes.forEach(n => this.appendChild(n)); }
+  remove() {
+    if (this.parentNode) this.parentNode.children = this.parentNode.children.filter(c => c !== this);
+    this.parentNode = null;
+  }
+  cloneNode(deep) {
+    const copy = new El(this.tagName, { id: this.id, cls: this.className, text: this.ownText });
+    if (deep) this.children.forEach(c => copy.appendChild(c.cloneNode ? c.cloneNode(true) : c));
+    return copy;
+  }
+  matches(selector) { return parseSelector(selector).some(s => matchesSimple(this, s)); }
+  closest(selector) {
+    for (let node = this; node && node.nodeType === 1; node = node.parentNode) {
+      if (node.matches(selector)) return node;
+    }
+    return null;
+  }
+  descendants() { return this.children.flatMap(c => (c.nodeType === 1 ? [c, ...c.descendants()] : [])); }
+  querySelectorAll(selector) {
+    // Descendant combinator: "A B" matches B inside A
+    const parts = selector.split(',').map(p => p.trim().split(/\s+/));
+    return this.descendants().filter(el => parts.some(chain => {
+      if (!el.matches(chain[chain.length - 1])) return false;
+      let node = el.parentNode;
+      for (let i = chain.length - 2; i >= 0; i--) {
+        while (node && node.nodeType === 1 && !node.matches(chain[i])) node = node.parentNode;
+        if (!node || node.nodeType !== 1) return false;
+        node = node.parentNode;
+      }
+      return true;
+    }));
+  }
+  querySelector(selector) { return this.querySelectorAll(selector)[0] || null; }
+  addEventListener(type, fn) { (this.listeners[type] = this.listeners[type] || []).push(fn); }
+  removeEventListener() {}
+  setAttribute(name, value) { this.attributes[name] = String(value); }
+  getAttribute(name) { return this.attributes[name] ?? null; }
+  dispatchEvent(event) {
+    Object.defineProperty(event, 'target', { value: this, configurable: true });
+    dispatch(event);
+    return true;
+  }
+  click() { this.dispatchEvent(new Event('click', { bubbles: true })); }
+}
+
+const documentElement = new El('html');
+const head = new El('head');
+const body = new El('body');
+documentElement.appendChild(head);
+documentElement.appendChild(body);
+const documentListeners = {};
+
+function dispatch(event) {
+  (documentListeners[event.type] || []).forEach(fn => fn(event));
+}
+
+let mutationCallback = null;
+global.Node = { ELEMENT_NODE: 1, TEXT_NODE: 3 };
+global.MutationObserver = class {
+  constructor(cb) { mutationCallback = cb; }
+  observe() {}
+  disconnect() {}
+};
+
+const intersectionObservers = [];
+global.IntersectionObserver = class {
+  constructor(cb, options = {}) {
+    this.cb = cb;
+    this.options = options;
+    this.targets = new Set();
+    this.disconnected = false;
+    intersectionObservers.push(this);
+  }
+  observe(el) { this.targets.add(el); }
+  unobserve(el) { this.targets.delete(el); }
+  disconnect() { this.disconnected = true; this.targets.clear(); }
+  fire(elements, isIntersecting) {
+    this.cb(elements.map(target => ({ target, isIntersecting })));
+  }
+};
+
+const storage = new Map();
+global.localStorage = {
+  getItem: k => (storage.has(k) ? storage.get(k) : null),
+  setItem: (k, v) => storage.set(k, String(v)),
+  removeItem: k => storage.delete(k),
+};
+
+const windowListeners = {};
+global.window = global;
+global.location = { hash: '#100' };
+global.addEventListener = (type, fn) => { (windowListeners[type] = windowListeners[type] || []).push(fn); };
+global.console = { ...console, log() {}, warn() {} };
+global.fetch = async () => { throw new Error('no network in the harness'); };
+global.document = {
+  readyState: 'complete',
+  hidden: false,
+  head,
+  body,
+  documentElement,
+  createElement: tag => new El(tag),
+  createDocumentFragment: () => new El('#fragment'),
+  createTextNode: text => ({ nodeType: 3, textContent: String(text), cloneNode() { return { ...this }; } }),
+  addEventListener: (type, fn) => { (documentListeners[type] = documentListeners[type] || []).push(fn); },
+  querySelector: s => documentElement.querySelector(s),
+  querySelectorAll: s => documentElement.querySelectorAll(s),
+};
+
+function navigate(hash) {
+  location.hash = hash;
+  (windowListeners.hashchange || []).forEach(fn => fn({ type: 'hashchange' }));
+}
+
+// --- Page fixture ---
+const chat = new El('div', { id: 'MiddleColumn' });
+body.appendChild(chat);
+
+function message(text, id) {
+  return new El('div', {
+    cls: 'Message',
+    dataset: id === undefined ? {} : { messageId: String(id) },
+    children: [new El('div', { cls: 'text-content', text })],
+  });
+}
+
+// Appends nodes to the chat and reports them as one mutation batch
+function addNodes(...nodes) {
+  nodes.forEach(n => { if (!n.parentNode) chat.appendChild(n); });
+  mutationCallback([{ addedNodes: nodes }]);
+}
+
+function overlayText(el) {
+  const overlay = el.children.find(c => c.classList.contains('tg-apple-overlay'));
+  return overlay ? overlay.lastChild.textContent : null;
+}
+
+const sent = [];
+const events = [];
+let eventBatches = 0;
+window.tgTranslateBatch = async items => {
+  items.forEach(i => sent.push(i.text));
+  // "same" plays a text the provider leaves untranslated
+  return items.map(i => (i.text.startsWith('same') ? null : i.text.toUpperCase()));
+};
+window.onNewMessages = async batch => {
+  eventBatches++;
+  batch.forEach(e => events.push(`${e.chatId}:${e.content}`));
+};
+
+const stats = () => ({ ...window.__tgTranslateQueueStats });
+const [visible, near] = [() => intersectionObservers[0], () => intersectionObservers[1]];
+
+// --- Scenarios ---
+const scenarios = {
+  // Overlapping batches, a node removed before its turn and a container
+  async queue() {
+    const msgs = Array.from({ length: 30 }, (_, i) => message(`hello ${i}`, i));
+    const wrapper = new El('div', { children: msgs.slice(20) });
+    const gone = message('bye', 99);
+    addNodes(...msgs.slice(0, 10));
+    addNodes(...msgs.slice(5, 20), gone);
+    gone.remove();
+    addNodes(wrapper);
+    await advance(2000);
+    const observed = msgs.filter(m => visible().targets.has(m)).length;
+    return { stats: stats(), observed };
+  },
+
+  // Each slice stops at the deadline, containers included
+  async deadline() {
+    idleChecks = 1;
+    const containers = Array.from({ length: 20 }, () => new El('div'));
+    addNodes(...containers);
+    await advance(1000);
+    return { stats: stats(), perSlice: idleSlices.map(s => s.checks) };
+  },
+
+  // Visible first, prefetch next, cancelled when leaving the band
+  async priority() {
+    const msgs = Array.from({ length: 20 }, (_, i) => message(`text ${i}`, i));
+    addNodes(...msgs);
+    await advance(1000);
+    near().fire(msgs, true);
+    visible().fire(msgs.slice(15), true);
+    near().fire(msgs.slice(8, 15), false);
+    await advance(1000);
+    return { sent, stats: stats(), margin: near().options.rootMargin };
+  },
+
+  // A re-rendered node is painted from the index; untranslated texts are
+  // not cached and asked for again
+  async reuse() {
+    const first = [message('good morning', 1), message('same old', 2)];
+    addNodes(...first);
+    await advance(1000);
+    visible().fire(first, true);
+    await advance(1000);
+    const sentBefore = sent.length;
+    first.forEach(m => m.remove());
+    const again = [message('good morning', 1), message('same old', 2)];
+    addNodes(...again);
+    await advance(1000);
+    visible().fire(again.filter(m => visible().targets.has(m)), true);
+    await advance(1000);
+    return {
+      sentBefore,
+      sent,
+      painted: overlayText(again[0]),
+      stats: stats(),
+      events,
+    };
+  },
+
+  // Events are delivered per frame in batches, once per message per chat
+  async events() {
+    addNodes(...Array.from({ length: 30 }, (_, i) => message(`event ${i}`)));
+    await advance(1000);
+    addNodes(message('event 0'));
+    await advance(1000);
+    navigate('#200');
+    addNodes(message('event 0'));
+    await advance(1000);
+    return { batches: eventBatches, events };
+  },
+
+  // Pushed values survive chat switches; panel edits stay per chat
+  async config() {
+    const panel = document.querySelector('.tg-apple-settings-panel');
+    const value = id => panel.querySelector(id).value;
+    localStorage.setItem('tg_apple_translate_config_#300', JSON.stringify({ targetLang: 'fr', displayMode: 'replace' }));
+    panel.querySelector('#tg-apple-display-mode').onchange({ target: { value: 'original' } });
+    const pending = message('not yet', 1);
+    chat.appendChild(pending);
+    window.__tgTranslateApplyConfig({ targetLang: 'ja', prefetchMarginPx: 500 });
+    const chats = {};
+    for (const hash of ['#200', '#300', '#100']) {
+      navigate(hash);
+      chats[hash] = [value('#tg-apple-target-lang'), value('#tg-apple-display-mode')];
+    }
+    return {
+      chats,
+      stored: JSON.parse(localStorage.getItem('tg_apple_translate_config_#100')),
+      margins: intersectionObservers.slice(1).map(o => o.options.rootMargin),
+      oldDisconnected: near().disconnected,
+      rewatched: intersectionObservers[2].targets.has(pending),
+    };
+  },
+};
+
+(async () => {
+  const [scriptPath, name] = process.argv.slice(2);
+  eval(fs.readFileSync(scriptPath, 'utf8'));
+  // startObserver runs 500ms after injection
+  await advance(600);
+  const result = await scenarios[name]();
+  process.stdout.write(JSON.stringify(result));
+})().catch(e => {
+  process.stderr.write(String(e && e.stack || e));
+  process.exit(1);
+});
@@ -0,0 +1,155 @@
+"""
+Tests for the asyncio translator API.
+
+Contract:
+- translate_async/batch_translate_async exist on every Translator
+- Backoff uses asyncio.sleep, so the event loop keeps running
+- Each attempt is bounded by config.request_timeout
+- Failures return the original text
+- MessageInterceptor has async counterparts of its translate methods
+"""
+
+import asyncio
+import time
+from typing import List
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.message_interceptor import Message, MessageInterceptor, MessageType
+from src.telegram_multi.translator import Translator
+from src.telegram_multi.translators.deepl import DeepLTranslator
+from src.telegram_multi.translators.google import parse_translate_a_response
+
+
+class EchoTranslator(Translator):
+    """Sync-only provider relying on the default async implementation."""
+
+    def translate(self, text: str, src_lang: str = None, dest_lang: str = None) -> str:
+        return f"{text}@{dest_lang}"
+
+    def batch_translate(self, texts: List[str], src_lang: str = None, dest_lang: str = None) -> List[str]:
+        return [self.translate(t, src_lang, dest_lang) for t in texts]
+
+
+def hola(text: str, src: str, dest: str) -> str:
+    return "Hola"
+
+
+class TestTranslateAsync:
+    """Contract tests for translate_async."""
+
+    @pytest.mark.asyncio
+    async def test_default_async_runs_sync_provider(self):
+        """Contract: Providers without native async still work."""
+        translator = EchoTranslator(TranslationConfig(enabled=True))
+        assert await translator.translate_async("hi", "en", "es") == "hi@es"
+        assert await translator.batch_translate_async(["a"], "en", "es") == ["a@es"]
+
+    @pytest.mark.asyncio
+    async def test_google_async_caches(self, make_google):
+        """Contract: Second call is served from cache."""
+        translator = make_google(hola)
+        assert await translator.translate_async("Hello", "en", "es") == "Hola"
+        assert await translator.translate_async("Hello", "en", "es") == "Hola"
+        assert translator._fetch_async.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_backoff_uses_asyncio_sleep(self, make_google):
+        """Contract: Retries never call time.sleep."""
+        translator = make_google(hola)
+        translator._fetch_async = AsyncMock(side_effect=[RuntimeError("429"), "Hola"])
+        with patch("time.sleep") as blocking_sleep, patch(
+            "asyncio.sleep", AsyncMock()
+        ) as async_sleep:
+            assert await translator.translate_async("Hello", "en", "es") == "Hola"
+        blocking_sleep.assert_not_called()
+        async_sleep.assert_awaited_once_with(translator.backoff_factor)
+
+    @pytest.mark.asyncio
+    async def test_per_call_timeout_returns_original(self, make_google):
+        """Contract: A hung upstream is cut off by request_timeout."""
+        translator = make_google(hola, request_timeout=0.05)
+        translator.max_retries = 1
+
+        async def hang(*args):
+            await asyncio.sleep(10)
+
+        translator._fetch_async = hang
+        start = time.monotonic()
+        assert await translator.translate_async("Hello", "en", "es") == "Hello"
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked_during_retries(self, make_google):
+        """Contract: Other tasks progress while a translation backs off."""
+        translator = make_google(hola)
+        translator.backoff_factor = 0.05
+        translator._fetch_async = AsyncMock(side_effect=RuntimeError("down"))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        assert await translator.translate_async("Hello", "en", "es") == "Hello"
+        task.cancel()
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_batch_async_splices_hits_and_misses(self, make_google):
+        """Contract: Cached and fetched results come back in input order."""
+        translator = make_google(hola)
+        translator.cache.set(translator.cache_key("b", "en", "es"), "B")
+        translator._fetch_async = AsyncMock(side_effect=lambda text, s, d: text.upper())
+        result = await translator.batch_translate_async(["a", "b", "c", "a"], "en", "es")
+        assert result == ["A", "B", "C", "A"]
+        # "a" is fetched once even though it appears twice
+        assert translator._fetch_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deepl_without_key_returns_original(self):
+        """Contract: DeepL async is a no-op without an API key."""
+        translator = DeepLTranslator(TranslationConfig(enabled=True))
+        translator.api_key = None
+        assert await translator.translate_async("Hello") == "Hello"
+
+    def test_parse_translate_a_response(self):
+        """Contract: Sentence fragments are joined in order."""
+        data = [[["Hola. ", "Hello. "], ["Mundo", "World"]], None, "en"]
+        assert parse_translate_a_response(data) == "Hola. Mundo"
+        with pytest.raises(ValueError):
+            parse_translate_a_response([])
+
+
+class TestInterceptorAsync:
+    """Contract tests for MessageInterceptor async methods."""
+
+    @pytest.mark.asyncio
+    async def test_translate_bidirectional_async_incoming(self):
+        """Contract: Incoming messages go target_lang -> source_lang."""
+        translator = MagicMock()
+        translator.translate_async = AsyncMock(return_value="你好")
+        config = TranslationConfig(enabled=True, source_lang="zh", target_lang="en")
+        interceptor = MessageInterceptor(config, translator)
+
+        msg = Message(message_type=MessageType.INCOMING, content="Hello")
+        result = await interceptor.translate_bidirectional_async(msg)
+
+        assert result.translated_content == "你好"
+        translator.translate_async.assert_awaited_once_with(
+            "Hello", src_lang="en", dest_lang="zh"
+        )
+
+    @pytest.mark.asyncio
+    async def test_translate_message_async_swallows_errors(self):
+        """Contract: Errors leave translated_content unset."""
+        translator = MagicMock()
+        translator.translate_async = AsyncMock(side_effect=RuntimeError("boom"))
+        interceptor = MessageInterceptor(TranslationConfig(enabled=True), translator)
+
+        msg = Message(message_type=MessageType.OUTGOING, content="Hello")
+        result = await interceptor.translate_message_async(msg)
+        assert result.translated_content is None
@@ -0,0 +1,140 @@
+"""
+Tests for the micro-batching translation scheduler.
+
+Contract:
+- Requests within the window are flushed as one batch per language pair
+- A pair reaching max_batch is flushed without waiting for the window
+- Each caller receives its own result
+- Queue depth is bounded
+- Pairs are served round-robin
+- Batch size and queue delay metrics are recorded
+"""
+
+import asyncio
+from typing import List
+import pytest
+from src.telegram_multi.batching import BatchScheduler, QueueFullError
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.message_interceptor import Message, MessageInterceptor, MessageType
+
+
+class RecordingTranslator:
+    """Records batch calls and upper-cases texts."""
+
+    def __init__(self, delay: float = 0):
+        self.calls: List[tuple] = []
+        self.delay = delay
+
+    async def batch_translate_async(self, texts, src_lang, dest_lang):
+        self.calls.append((list(texts), src_lang, dest_lang))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return [f"{t.upper()}:{dest_lang}" for t in texts]
+
+
+class TestBatchScheduler:
+    """Contract tests for BatchScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_window_groups_requests_per_pair(self):
+        """Contract: One batch per language pair within the window."""
+        translator = RecordingTranslator()
+        scheduler = BatchScheduler(translator, window_ms=10)
+
+        results = await asyncio.gather(
+            scheduler.translate("a", "en", "zh"),
+            scheduler.translate("b", "en", "zh"),
+            scheduler.translate("c", "zh", "en"),
+        )
+
+        assert results == ["A:zh", "B:zh", "C:en"]
+        assert sorted(translator.calls) == [
+            (["a", "b"], "en", "zh"),
+            (["c"], "zh", "en"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_immediately(self):
+        """Contract: max_batch items trigger a flush before the window ends."""
+        translator = RecordingTranslator()
+        scheduler = BatchScheduler(translator, window_ms=10_000, max_batch=2)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                scheduler.translate("a", "en", "zh"),
+                scheduler.translate("b", "en", "zh"),
+            ),
+            timeout=1,
+        )
+        assert results == ["A:zh", "B:zh"]
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_is_bounded(self):
+        """Contract: Submissions beyond max_queue are rejected."""
+        scheduler = BatchScheduler(RecordingTranslator(), window_ms=50, max_queue=2)
+        first = scheduler.submit("a", "en", "zh")
+        second = scheduler.submit("b", "en", "zh")
+        with pytest.raises(QueueFullError):
+            scheduler.submit("c", "en", "zh")
+        await scheduler.flush()
+        assert await first == "A:zh"
+        assert await second == "B:zh"
+        assert scheduler.metrics().rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_pairs_served_round_robin(self):
+        """Contract: A busy pair does not starve a quieter one."""
+        translator = RecordingTranslator()
+        scheduler = BatchScheduler(
+            translator, window_ms=10_000, max_batch=2, max_concurrent_batches=1
+        )
+        futures = [scheduler.submit(f"hot{i}", "en", "zh") for i in range(1)]
+        futures += [scheduler.submit("cold", "en", "ru")]
+        futures += [scheduler.submit(f"hot{i}", "en", "zh") for i in range(1, 5)]
+        await scheduler.flush()
+        await asyncio.gather(*futures)
+
+        pairs = [dest for _, _, dest in translator.calls]
+        # The "ru" batch goes out right after the first "zh" batch
+        assert pairs[:2] == ["zh", "ru"]
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_callers(self):
+        """Contract: A failing batch fails each caller's future."""
+
+        class Failing:
+            async def batch_translate_async(self, texts, src, dest):
+                raise RuntimeError("down")
+
+        scheduler = BatchScheduler(Failing(), window_ms=1)
+        with pytest.raises(RuntimeError):
+            await scheduler.translate("a", "en", "zh")
+
+    @pytest.mark.asyncio
+    async def test_metrics(self):
+        """Contract: Batch sizes and queueing delay are tracked."""
+        scheduler = BatchScheduler(RecordingTranslator(), window_ms=5)
+        await asyncio.gather(*(scheduler.translate(t, "en", "zh") for t in "abc"))
+        metrics = scheduler.metrics()
+        assert metrics.batches == 1
+        assert metrics.items == 3
+        assert metrics.avg_batch_size == 3
+        assert metrics.batch_size_histogram == {4: 1}
+        assert metrics.max_queue_delay_ms >= 0
+
+    @pytest.mark.asyncio
+    async def test_interceptor_uses_scheduler(self):
+        """Contract: MessageInterceptor batches through the scheduler."""
+        translator = RecordingTranslator()
+        config = TranslationConfig(enabled=True, source_lang="zh", target_lang="en")
+        scheduler = BatchScheduler.from_config(translator, config)
+        interceptor = MessageInterceptor(config, translator, scheduler=scheduler)
+
+        messages = [
+            Message(message_type=MessageType.INCOMING, content=c) for c in ("hi", "yo")
+        ]
+        results = await asyncio.gather(
+            *(interceptor.translate_bidirectional_async(m) for m in messages)
+        )
+        assert [m.translated_content for m in results] == ["HI:zh", "YO:zh"]
+        assert len(translator.calls) == 1
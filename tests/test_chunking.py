@@ -0,0 +1,115 @@
+"""
+Tests for long-message chunking.
+
+Contract:
+- chunk_text packs sentences into chunks of at most max_chars and
+  reassembles to the original text
+- Long texts are fetched chunk by chunk and reassembled in order
+- Chunks are retried individually; a failed chunk keeps its original
+  text while the others stay translated, and the result is not cached
+- Async chunks are fetched concurrently
+"""
+
+import asyncio
+import time
+import pytest
+from src.telegram_multi.segmentation import chunk_text
+
+LONG = "First sentence here. Second sentence here.\nThird sentence here. Fourth one."
+
+
+class TestChunkText:
+    """Contract tests for chunk_text."""
+
+    def test_sentences_are_packed_under_the_limit(self):
+        """Contract: Whole sentences fill chunks up to max_chars."""
+        chunked = chunk_text(LONG, 25)
+        assert chunked.segments == [
+            "First sentence here.",
+            "Second sentence here.",
+            "Third sentence here.",
+            "Fourth one.",
+        ]
+        assert chunked.join(chunked.segments) == LONG
+        assert chunk_text("One. Two. Three.", 10).segments == ["One. Two.", "Three."]
+
+    def test_long_sentence_is_cut_at_spaces(self):
+        """Contract: An over-long sentence is split between words."""
+        text = "word " * 9 + "end"
+        chunked = chunk_text(text, 12)
+        assert all(len(chunk) <= 12 for chunk in chunked.segments)
+        assert chunked.join(chunked.segments) == text
+
+    def test_unbroken_text_is_hard_cut(self):
+        """Contract: Without spaces the text is cut at max_chars."""
+        chunked = chunk_text("x" * 25, 10)
+        assert chunked.segments == ["x" * 10, "x" * 10, "x" * 5]
+
+
+class TestChunkedTranslation:
+    """Contract tests for chunked upstream fetches."""
+
+    def test_long_text_is_fetched_in_chunks(self, make_google):
+        """Contract: Each chunk is one call; order and layout are kept."""
+        translator = make_google(max_chunk_chars=25)
+        assert translator.translate(LONG, "en", "de") == LONG.upper()
+        assert translator._fetch.call_count == 4
+
+    def test_short_text_is_one_call(self, make_google):
+        """Contract: Texts within the limit are not chunked."""
+        translator = make_google(max_chunk_chars=25)
+        translator.translate("Short one. Two.", "en", "de")
+        assert translator._fetch.call_count == 1
+
+    def test_failed_chunk_keeps_original(self, make_google):
+        """Contract: One failing chunk does not discard the others."""
+
+        def fetch(text, src, dest):
+            if text.startswith("Third"):
+                raise RuntimeError("too long")
+            return text.upper()
+
+        translator = make_google(fetch, max_chunk_chars=25)
+        result = translator.translate(LONG, "en", "de")
+
+        assert result == (
+            "FIRST SENTENCE HERE. SECOND SENTENCE HERE.\n"
+            "Third sentence here. FOURTH ONE."
+        )
+        # Partial results are not cached
+        translator.translate(LONG, "en", "de")
+        assert translator._fetch.call_count == 2 * (3 + translator.max_retries)
+
+    def test_chunks_are_retried_individually(self, make_google):
+        """Contract: Only the failing chunk is retried."""
+        failures = {"Second sentence here."}
+
+        def fetch(text, src, dest):
+            if text in failures:
+                failures.discard(text)
+                raise RuntimeError("503")
+            return text.upper()
+
+        translator = make_google(fetch, max_chunk_chars=25)
+        assert translator.translate(LONG, "en", "de") == LONG.upper()
+        assert translator._fetch.call_count == 5
+
+    def test_chunking_can_be_disabled(self, make_google):
+        """Contract: max_chunk_chars=0 sends the whole text."""
+        translator = make_google(max_chunk_chars=25)
+        translator.config.max_chunk_chars = 0
+        translator.translate(LONG, "en", "de")
+        assert translator._fetch.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_async_chunks_run_concurrently(self, make_google):
+        """Contract: Async chunk fetches overlap."""
+
+        async def fetch_async(text, src, dest):
+            await asyncio.sleep(0.05)
+            return text.upper()
+
+        translator = make_google(fetch_async=fetch_async, max_chunk_chars=25)
+        start = time.perf_counter()
+        assert await translator.translate_async(LONG, "en", "de") == LONG.upper()
+        assert time.perf_counter() - start < 0.15
@@ -0,0 +1,181 @@
+"""
+Tests for DeepL multi-text batching.
+
+Contract:
+- Cache misses are sent as multi-text requests
+- Requests respect the text-count limit and batch_max_chars
+- Results are spliced back in order with cache hits
+- A failing request falls back to originals for that request only
+- Batch misses are served stale, skipped after a recent failure, joined
+  when already in flight and chunked when oversized, like single texts
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+import pytest
+from src.telegram_multi.cache import TranslationCache
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.translators import deepl
+from src.telegram_multi.translators.deepl import DeepLTranslator
+
+
+def fake_response(texts):
+    response = MagicMock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = {
+        "translations": [{"text": t.upper()} for t in texts]
+    }
+    return response
+
+
+def make_translator(**overrides) -> DeepLTranslator:
+    translator = DeepLTranslator(TranslationConfig(enabled=True, **overrides))
+    translator.api_key = "test-key"
+    translator.backoff_factor = 0
+    return translator
+
+
+class TestDeepLBatching:
+    """Contract tests for DeepLTranslator.batch_translate."""
+
+    def test_misses_sent_in_one_request(self):
+        """Contract: Several misses cost a single HTTP request."""
+        translator = make_translator()
+        translator.cache.set(translator.cache_key("b", "auto", "de"), "cached-b")
+
+        with patch.object(translator.http.session(), "post") as post:
+            post.side_effect = lambda url, data, timeout: fake_response(data["text"])
+            result = translator.batch_translate(["a", "b", "c", "a"], "auto", "de")
+
+        assert result == ["A", "cached-b", "C", "A"]
+        assert post.call_count == 1
+        assert post.call_args.kwargs["data"]["text"] == ["a", "c"]
+
+    def test_text_count_limit_splits_requests(self, monkeypatch):
+        """Contract: No request carries more than the per-request text limit."""
+        monkeypatch.setattr(deepl, "MAX_TEXTS_PER_REQUEST", 2)
+        translator = make_translator()
+
+        with patch.object(translator.http.session(), "post") as post:
+            post.side_effect = lambda url, data, timeout: fake_response(data["text"])
+            result = translator.batch_translate(["a", "b", "c", "d", "e"], "en", "de")
+
+        assert result == ["A", "B", "C", "D", "E"]
+        assert [len(c.kwargs["data"]["text"]) for c in post.call_args_list] == [2, 2, 1]
+
+    def test_batch_max_chars_caps_requests(self):
+        """Contract: batch_max_chars bounds characters per request."""
+        translator = make_translator(batch_max_chars=5)
+        groups = translator._plan_requests(
+            [("k1", "abc"), ("k2", "de"), ("k3", "fgh"), ("k4", "toolongtext")]
+        )
+        assert [[t for _, t in g] for g in groups] == [
+            ["abc", "de"],
+            ["fgh"],
+            ["toolongtext"],
+        ]
+
+    def test_failed_request_keeps_other_results(self, monkeypatch):
+        """Contract: Only the failing request's texts fall back to originals."""
+        monkeypatch.setattr(deepl, "MAX_TEXTS_PER_REQUEST", 1)
+        translator = make_translator()
+
+        def post(url, data, timeout):
+            if data["text"] == ["bad"]:
+                raise ConnectionError("boom")
+            return fake_response(data["text"])
+
+        with patch.object(translator.http.session(), "post", side_effect=post):
+            result = translator.batch_translate(["ok", "bad"], "en", "de")
+
+        assert result == ["OK", "bad"]
+        assert translator.cache.get(translator.cache_key("bad", "en", "de")) is None
+
+    def test_mismatched_reply_is_an_error(self):
+        """Contract: A reply with the wrong number of translations is rejected."""
+        with pytest.raises(ValueError):
+            deepl._translations({"translations": [{"text": "x"}]}, 2)
+
+    @pytest.mark.asyncio
+    async def test_async_batch_packs_requests(self):
+        """Contract: Async batching also sends one request per group."""
+        translator = make_translator()
+        calls = []
+
+        async def fetch_many(texts, src, dest):
+            calls.append(list(texts))
+            return [t.upper() for t in texts]
+
+        translator._fetch_many_async = fetch_many
+        result = await translator.batch_translate_async(["x", "y", "x"], "en", "de")
+        assert result == ["X", "Y", "X"]
+        assert calls == [["x", "y"]]
+
+
+class TestDeepLBatchMisses:
+    """Contract tests for stale, failed, in-flight and oversized batch misses."""
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed(self):
+        """Contract: An expired entry is returned at once and refreshed once."""
+        clock = [0.0]
+        translator = make_translator()
+        translator.cache = TranslationCache(ttl=10, stale_ttl=100, clock=lambda: clock[0])
+        translator.cache.set(translator.cache_key("a", "en", "de"), "old-a")
+        clock[0] = 20
+        calls = []
+
+        async def fetch_many(texts, src, dest):
+            calls.append(list(texts))
+            return [t.upper() for t in texts]
+
+        translator._fetch_many_async = fetch_many
+        assert await translator.batch_translate_async(["a", "b"], "en", "de") == ["old-a", "B"]
+        await asyncio.gather(*translator._refresh_tasks)
+        assert sorted(calls) == [["a"], ["b"]]
+        assert translator.cache.get(translator.cache_key("a", "en", "de")) == "A"
+
+    def test_failed_keys_are_not_retried(self):
+        """Contract: A key whose request failed skips upstream until the negative TTL."""
+        translator = make_translator()
+        translator.max_retries = 1
+
+        with patch.object(translator.http.session(), "post") as post:
+            post.side_effect = ConnectionError("boom")
+            assert translator.batch_translate(["a", "b"], "en", "de") == ["a", "b"]
+            post.side_effect = lambda url, data, timeout: fake_response(data["text"])
+            assert translator.batch_translate(["a", "b", "c"], "en", "de") == ["a", "b", "C"]
+
+        assert post.call_count == 2
+        assert post.call_args.kwargs["data"]["text"] == ["c"]
+
+    @pytest.mark.asyncio
+    async def test_key_in_flight_is_joined(self):
+        """Contract: A batch does not resend a text another caller is fetching."""
+        translator = make_translator()
+        calls = []
+
+        async def fetch_many(texts, src, dest):
+            calls.append(list(texts))
+            await asyncio.sleep(0.01)
+            return [t.upper() for t in texts]
+
+        translator._fetch_many_async = fetch_many
+        single = asyncio.create_task(translator.translate_async("a", "en", "de"))
+        await asyncio.sleep(0)
+        assert await translator.batch_translate_async(["a", "b"], "en", "de") == ["A", "B"]
+        assert await single == "A"
+        assert calls == [["a"], ["b"]]
+
+    def test_oversized_text_is_chunked(self):
+        """Contract: A text over max_chunk_chars is fetched in chunks, not packed."""
+        translator = make_translator(max_chunk_chars=25)
+        long_text = "First sentence here. Second sentence here."
+
+        with patch.object(translator.http.session(), "post") as post:
+            post.side_effect = lambda url, data, timeout: fake_response(data["text"])
+            result = translator.batch_translate(["hi", long_text], "en", "de")
+
+        assert result == ["HI", long_text.upper()]
+        sent = sorted(t for c in post.call_args_list for t in c.kwargs["data"]["text"])
+        assert sent == ["First sentence here.", "Second sentence here.", "hi"]
@@ -0,0 +1,130 @@
+"""
+Tests for speculative translation of composer drafts.
+
+Contract:
+- translate_draft translates a draft as an outgoing message
+  (source_lang -> target_lang), after the on_message_sending callback
+- A newer draft for the same chat cancels the older one (None is
+  returned for it); final drafts are never cancelled
+- The latest result per chat is kept, so sending an unchanged draft
+  needs no new translation
+- The page script gets the draft binding and debounce from the config,
+  and only watches the chat's message composer
+"""
+
+import asyncio
+import json
+from typing import List
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.message_interceptor import DRAFT_BINDING, MessageInterceptor
+
+
+class SlowTranslator:
+    """Tags texts with the language pair after a delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: List[str] = []
+
+    async def translate_async(self, text, src_lang, dest_lang):
+        self.calls.append(text)
+        await asyncio.sleep(self.delay)
+        return f"{text}@{src_lang}>{dest_lang}"
+
+
+def make_interceptor(delay: float = 0.0, **overrides):
+    translator = SlowTranslator(delay)
+    config = TranslationConfig(
+        enabled=True, source_lang="zh", target_lang="en", segment_messages=False,
+        skip_enabled=False, **overrides
+    )
+    return MessageInterceptor(config, translator), translator
+
+
+class TestTranslateDraft:
+    """Contract tests for MessageInterceptor.translate_draft."""
+
+    @pytest.mark.asyncio
+    async def test_draft_is_translated_outgoing(self):
+        """Contract: Drafts go from the user's language to the foreign one."""
+        interceptor, _ = make_interceptor()
+        result = await interceptor.translate_draft(None, {"text": "你好", "chatId": "42"})
+        assert result == "你好@zh>en"
+        assert interceptor.draft_translation("42", "你好") == "你好@zh>en"
+        assert interceptor.draft_translation("42", "你好吗") is None
+
+    @pytest.mark.asyncio
+    async def test_newer_draft_supersedes_older(self):
+        """Contract: Only the latest draft of a chat completes."""
+        interceptor, _ = make_interceptor(delay=0.05)
+        older = asyncio.ensure_future(
+            interceptor.translate_draft(None, {"text": "你", "chatId": "42"})
+        )
+        await asyncio.sleep(0)
+        newer = await interceptor.translate_draft(None, {"text": "你好", "chatId": "42"})
+
+        assert await older is None
+        assert newer == "你好@zh>en"
+
+    @pytest.mark.asyncio
+    async def test_final_draft_is_not_cancelled(self):
+        """Contract: A send in progress survives later typing."""
+        interceptor, _ = make_interceptor(delay=0.05)
+        final = asyncio.ensure_future(
+            interceptor.translate_draft(None, {"text": "你好", "chatId": "42", "final": True})
+        )
+        await asyncio.sleep(0)
+        await interceptor.translate_draft(None, {"text": "再见", "chatId": "42"})
+        assert await final == "你好@zh>en"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_draft_reuses_result(self):
+        """Contract: Sending the translated draft makes no new call."""
+        interceptor, translator = make_interceptor()
+        await interceptor.translate_draft(None, {"text": "你好", "chatId": "42"})
+        result = await interceptor.translate_draft(
+            None, {"text": "你好", "chatId": "42", "final": True}
+        )
+        assert result == "你好@zh>en"
+        assert translator.calls == ["你好"]
+
+    @pytest.mark.asyncio
+    async def test_sending_callback_is_applied(self):
+        """Contract: on_message_sending can rewrite the draft first."""
+        interceptor, _ = make_interceptor()
+
+        def sign(message):
+            message.content = message.content + "!"
+            return message
+
+        interceptor.on_message_sending(sign)
+        assert await interceptor.translate_draft(None, {"text": "你好"}) == "你好!@zh>en"
+
+    @pytest.mark.asyncio
+    async def test_disabled_returns_draft(self):
+        """Contract: Without translation the draft is sent as typed."""
+        interceptor = MessageInterceptor(TranslationConfig(enabled=False))
+        assert await interceptor.translate_draft(None, {"text": "你好"}) == "你好"
+
+
+class TestInjectedDrafts:
+    """Contract tests for draft settings in the injected script."""
+
+    def test_draft_settings_reach_the_page(self):
+        """Contract: Binding name, debounce and the switch come from the config."""
+        interceptor, _ = make_interceptor(js_draft_debounce_ms=250, js_draft_translation=False)
+        script = interceptor.get_injection_script()
+        start = script.index("const DEFAULT_CONFIG = ") + len("const DEFAULT_CONFIG = ")
+        config = json.loads(script[start : script.index(";", start)])
+        assert config["draftBinding"] == DRAFT_BINDING
+        assert config["draftDebounceMs"] == 250
+        assert config["draftTranslation"] is False
+
+    def test_only_the_message_composer_is_watched(self):
+        """Contract: Search fields and other inputs are not composers."""
+        interceptor, _ = make_interceptor()
+        script = interceptor.get_injection_script()
+        assert "const COMPOSER_SELECTOR = '#editable-message-text';" in script
+        assert "input.closest(COMPOSER_CONTAINER_SELECTOR)" in script
+        assert "'textarea" not in script
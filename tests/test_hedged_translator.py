@@ -0,0 +1,150 @@
+"""
+Tests for the hedged composite translator.
+
+Contract:
+- Registered with TranslatorFactory as provider "hedged"
+- The fastest healthy provider is tried first
+- A slow primary gets a hedge request; the first success wins and the
+  loser is cancelled
+- A failing provider is replaced immediately and marked unhealthy
+- Routing decisions show up in routing_metrics()
+"""
+
+import asyncio
+import time
+from typing import List
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.translator import Translator, TranslatorFactory, register_builtin_providers
+from src.telegram_multi.translators.composite import HedgedTranslator
+
+
+class FakeProvider(Translator):
+    """Provider with a fixed delay and optional failure."""
+
+    def __init__(self, config, name: str, delay: float = 0.0, fail: bool = False):
+        # Own namespace, so each fake gets its own provider guard
+        self.cache_namespace = name
+        super().__init__(config)
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    def translate(self, text, src_lang=None, dest_lang=None):
+        return text
+
+    def batch_translate(self, texts: List[str], src_lang=None, dest_lang=None):
+        return texts
+
+    def _fetch(self, text, src_lang, dest_lang):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        return f"{text}@{self.name}"
+
+    async def _fetch_async(self, text, src_lang, dest_lang):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        return f"{text}@{self.name}"
+
+
+def make_hedged(*specs, hedge_delay_ms: int = 20) -> HedgedTranslator:
+    config = TranslationConfig(enabled=True, hedge_delay_ms=hedge_delay_ms)
+    providers = {
+        name: FakeProvider(config, name, delay=delay, fail=fail)
+        for name, delay, fail in specs
+    }
+    translator = HedgedTranslator(config, providers=providers)
+    translator.backoff_factor = 0
+    return translator
+
+
+class TestHedgedTranslator:
+    """Contract tests for HedgedTranslator."""
+
+    def test_registered_with_factory(self):
+        """Contract: provider "hedged" builds a HedgedTranslator."""
+        register_builtin_providers()
+        config = TranslationConfig(enabled=True, provider="hedged", hedge_providers=["google"])
+        translator = TranslatorFactory.create(config)
+        assert isinstance(translator, HedgedTranslator)
+        assert list(translator.providers) == ["google"]
+        translator.close()
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_needs_no_hedge(self):
+        """Contract: No hedge when the primary answers within the delay."""
+        translator = make_hedged(("a", 0.0, False), ("b", 0.0, False))
+        assert await translator.translate_async("hi", "en", "es") == "hi@a"
+        metrics = translator.routing_metrics()
+        assert metrics.requests == 1
+        assert metrics.hedged == 0
+        assert translator.providers["b"].calls == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        """Contract: The hedge wins and the slow primary is cancelled."""
+        translator = make_hedged(("slow", 1.0, False), ("fast", 0.0, False))
+        assert await translator.translate_async("hi", "en", "es") == "hi@fast"
+        await asyncio.sleep(0)
+
+        metrics = translator.routing_metrics()
+        assert metrics.hedged == 1
+        assert metrics.hedge_wins == 1
+        assert metrics.providers["slow"].cancelled == 1
+        assert translator.providers["slow"].cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_routes_to_fastest_provider(self):
+        """Contract: Measured latency decides the primary."""
+        translator = make_hedged(("slow", 0.05, False), ("fast", 0.0, False), hedge_delay_ms=1000)
+        await translator.translate_async("one", "en", "es")
+        await translator.translate_async("two", "en", "es")
+        await translator.translate_async("three", "en", "es")
+        assert translator._ranked()[0] == "fast"
+        assert translator.routing_metrics().providers["fast"].primary >= 2
+
+    @pytest.mark.asyncio
+    async def test_failure_fails_over_and_marks_unhealthy(self):
+        """Contract: A failing primary is replaced without waiting."""
+        translator = make_hedged(("bad", 0.0, True), ("good", 0.0, False), hedge_delay_ms=1000)
+        for i in range(4):
+            assert await translator.translate_async(f"t{i}", "en", "es") == f"t{i}@good"
+        metrics = translator.routing_metrics()
+        assert metrics.providers["good"].failovers >= 1
+        assert metrics.providers["bad"].errors >= 1
+        assert not metrics.providers["bad"].healthy
+        assert translator._ranked() == ["good", "bad"]
+
+    @pytest.mark.asyncio
+    async def test_all_failing_returns_original(self):
+        """Contract: Original text when every provider fails."""
+        translator = make_hedged(("a", 0.0, True), ("b", 0.0, True))
+        assert await translator.translate_async("hi", "en", "es") == "hi"
+        assert translator.routing_metrics().failures == translator.max_retries
+
+    def test_sync_translate_hedges(self):
+        """Contract: The blocking path hedges on worker threads."""
+        translator = make_hedged(("slow", 0.5, False), ("fast", 0.0, False))
+        start = time.monotonic()
+        assert translator.translate("hi", "en", "es") == "hi@fast"
+        assert time.monotonic() - start < 0.4
+        assert translator.routing_metrics().hedge_wins == 1
+        translator.close()
+
+    def test_p95_sets_hedge_delay(self):
+        """Contract: Enough samples replace the configured hedge delay."""
+        translator = make_hedged(("a", 0.0, False), hedge_delay_ms=500)
+        assert translator._hedge_delay("a") == 0.5
+        for _ in range(20):
+            translator._note_result("a", 0.01, "primary")
+        assert translator._hedge_delay("a") == pytest.approx(0.01)
@@ -0,0 +1,85 @@
+"""
+Tests for pooled provider HTTP clients.
+
+Contract:
+- HttpPool reuses one session / async client across calls
+- Pool size and keep-alive settings come from TranslationConfig
+- close()/aclose() release connections and translators close their pool;
+  clients replaced for another event loop are closed as well
+"""
+
+import asyncio
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.http_pool import HttpPool
+from src.telegram_multi.translators.deepl import DeepLTranslator
+
+
+class TestHttpPool:
+    """Contract tests for HttpPool."""
+
+    def test_session_is_reused(self):
+        """Contract: One requests.Session per pool."""
+        pool = HttpPool(pool_size=3)
+        session = pool.session()
+        assert pool.session() is session
+        adapter = session.get_adapter("https://api-free.deepl.com")
+        assert adapter._pool_maxsize == 3
+        pool.close()
+
+    @pytest.mark.asyncio
+    async def test_async_client_is_reused_within_loop(self):
+        """Contract: One httpx.AsyncClient per event loop."""
+        pool = HttpPool()
+        client = pool.async_client()
+        assert pool.async_client() is client
+        await pool.aclose()
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_client_from_another_loop_is_closed(self):
+        """Contract: aclose() also closes the client a new loop replaced."""
+        pool = HttpPool()
+
+        async def first_client():
+            return pool.async_client()
+
+        old = await asyncio.to_thread(asyncio.run, first_client())
+        client = pool.async_client()
+        assert client is not old
+        assert not old.is_closed
+        await pool.aclose()
+        assert old.is_closed
+        assert client.is_closed
+
+    def test_closed_pool_rejects_use(self):
+        """Contract: A closed pool cannot hand out connections."""
+        pool = HttpPool()
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.session()
+
+
+class TestTranslatorPool:
+    """Translators own and release their pool."""
+
+    def test_pool_settings_from_config(self):
+        """Contract: Pool is sized from TranslationConfig."""
+        config = TranslationConfig(http_pool_size=4, http_keepalive_expiry=5.0)
+        translator = DeepLTranslator(config)
+        assert translator.http.pool_size == 4
+        assert translator.http.keepalive_expiry == 5.0
+
+    def test_context_manager_closes_pool(self):
+        """Contract: Leaving the with-block closes the pool."""
+        with DeepLTranslator(TranslationConfig()) as translator:
+            translator.http.session()
+        assert translator.http.closed
+
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes_pool(self):
+        """Contract: Leaving the async with-block closes the async client."""
+        async with DeepLTranslator(TranslationConfig()) as translator:
+            client = translator.http.async_client()
+        assert client.is_closed
+        assert translator.http.closed
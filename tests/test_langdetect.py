@@ -0,0 +1,152 @@
+"""
+Tests for the skip-translation fast path.
+
+Contract:
+- Script histograms count letters per Unicode script
+- Decisive scripts and function words identify the language; a stray
+  function word in a language without a word list does not
+- Emoji/number/URL-only texts and same-language texts are skipped;
+  letters of any script count as text
+- Ambiguous texts inherit the chat's detected language
+- Skips are counted by reason
+- MessageInterceptor returns skipped texts without calling the provider
+"""
+
+from unittest.mock import MagicMock
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.langdetect import (
+    NO_TEXT,
+    OTHER_SCRIPT,
+    SAME_LANGUAGE,
+    SkipClassifier,
+    detect_language,
+    script_histogram,
+)
+from src.telegram_multi.message_interceptor import Message, MessageInterceptor, MessageType
+
+
+class TestDetection:
+    """Contract tests for script histograms and detect_language."""
+
+    def test_script_histogram(self):
+        """Contract: Only letters are counted, per script."""
+        assert script_histogram("Hi 你好 Привет 123 😀") == {
+            "latin": 2, "han": 2, "cyrillic": 6,
+        }
+        assert script_histogram("გამარჯობა!") == {OTHER_SCRIPT: 9}
+
+    @pytest.mark.parametrize(
+        "text, language",
+        [
+            ("你好，今天怎么样？", "zh"),
+            ("今日はいい天気ですね", "ja"),
+            ("안녕하세요", "ko"),
+            ("Привет, как у тебя дела?", "ru"),
+            ("Привіт, як справи?", "uk"),
+            ("Hello, how are you doing today?", "en"),
+            ("Wie geht es dir? Ich bin müde", "de"),
+            ("merci", "fr"),
+            ("ok", None),
+            ("To jest dobry dom", None),
+            ("Is het goed?", None),
+            ("Ik heb het boek gelezen en het was erg mooi", None),
+            ("Hello 你好 Привет", None),
+        ],
+    )
+    def test_detect_language(self, text, language):
+        """Contract: Unambiguous evidence names a language, otherwise None."""
+        assert detect_language(text) == language
+
+
+class TestSkipClassifier:
+    """Contract tests for SkipClassifier."""
+
+    @pytest.mark.parametrize("text", ["😀👍", "12:30", "https://example.com/x @bob", "!!!"])
+    def test_no_text(self, text):
+        """Contract: Nothing to translate once URLs/mentions are removed."""
+        assert SkipClassifier().classify(text, "en") == NO_TEXT
+
+    @pytest.mark.parametrize(
+        "text", ["გამარჯობა, როგორ ხარ?", "வணக்கம், எப்படி இருக்கிறீர்கள்?", "Բարեւ"]
+    )
+    def test_letters_of_unlisted_scripts_are_text(self, text):
+        """Contract: Georgian, Tamil, Armenian... are translated, not skipped."""
+        classifier = SkipClassifier()
+        assert classifier.classify(text, "en") is None
+        assert classifier.classify(text, "en", chat_id="42") is None
+
+    def test_same_language(self):
+        """Contract: Text in the destination language is skipped."""
+        classifier = SkipClassifier()
+        assert classifier.classify("你好，今天怎么样", "zh-CN") == SAME_LANGUAGE
+        assert classifier.classify("你好，今天怎么样", "en") is None
+        assert classifier.classify("Hello, how are you?", "de") is None
+        assert classifier.classify("To jest dobry dom", "en") is None
+
+    def test_chat_language_fallback(self):
+        """Contract: Ambiguous short texts use the chat's language if scripts agree."""
+        classifier = SkipClassifier()
+        assert classifier.classify("ok", "en", chat_id="c1") is None
+        classifier.classify("I will send it to you tomorrow", "ru", chat_id="c1")
+        assert classifier.chat_language("c1") == "en"
+        assert classifier.classify("ok", "en", chat_id="c1") == SAME_LANGUAGE
+        assert classifier.classify("ok", "en", chat_id="c2") is None
+
+    def test_chat_cache_is_bounded(self):
+        """Contract: Oldest chats are forgotten beyond max_chats."""
+        classifier = SkipClassifier(max_chats=1)
+        classifier.classify("你好", "en", chat_id="a")
+        classifier.classify("안녕하세요", "en", chat_id="b")
+        assert classifier.chat_language("a") is None
+        assert classifier.chat_language("b") == "ko"
+
+    def test_stats(self):
+        """Contract: Checks and skips are counted by reason."""
+        classifier = SkipClassifier()
+        classifier.classify("😀", "en")
+        classifier.classify("你好", "zh")
+        classifier.classify("你好", "en")
+        stats = classifier.stats()
+        assert stats.checked == 3
+        assert stats.skipped == 2
+        assert stats.by_reason == {NO_TEXT: 1, SAME_LANGUAGE: 1}
+
+
+class TestInterceptorSkip:
+    """Contract tests for the skip fast path in MessageInterceptor."""
+
+    def test_skipped_message_is_not_sent_upstream(self):
+        """Contract: Emoji-only and same-language messages skip the provider."""
+        translator = MagicMock()
+        config = TranslationConfig(enabled=True, source_lang="zh", target_lang="en")
+        interceptor = MessageInterceptor(config, translator)
+
+        emoji = interceptor.translate_bidirectional(
+            Message(message_type=MessageType.INCOMING, content="👍👍")
+        )
+        chinese = interceptor.translate_bidirectional(
+            Message(message_type=MessageType.INCOMING, content="好的，明天见")
+        )
+
+        assert emoji.translated_content == "👍👍"
+        assert chinese.translated_content == "好的，明天见"
+        translator.translate.assert_not_called()
+        assert interceptor.skip_stats().skipped == 2
+
+    @pytest.mark.asyncio
+    async def test_async_skip_and_disable(self):
+        """Contract: Async paths skip too; skip_enabled=False disables it."""
+        translator = MagicMock()
+        translator.translate_async.return_value = None
+        interceptor = MessageInterceptor(TranslationConfig(enabled=True), translator)
+        msg = await interceptor.translate_message_async(
+            Message(message_type=MessageType.OUTGOING, content="12345")
+        )
+        assert msg.translated_content == "12345"
+        translator.translate_async.assert_not_called()
+
+        disabled = MessageInterceptor(
+            TranslationConfig(enabled=True, skip_enabled=False), translator
+        )
+        assert disabled.skip_stats() is None
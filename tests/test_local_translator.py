@@ -0,0 +1,151 @@
+"""
+Tests for the offline phrase-table provider.
+
+Contract:
+- build_phrase_table/PhraseTable round-trip entries through an mmap file
+- Whole-text exact matches win; otherwise longest-phrase segmentation
+- Unknown text is returned unchanged
+- The "local" provider is registered with TranslatorFactory; it builds
+  no shared cache tiers and no process-wide guard
+- load_entries reads TSV and JSONL sources
+"""
+
+import json
+import pytest
+from src.telegram_multi.cache import TranslationCache
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.phrase_table import (
+    PhraseTable,
+    build_phrase_table,
+    load_entries,
+    open_phrase_table,
+)
+from src.telegram_multi.resilience import get_provider_guard
+from src.telegram_multi.translator import TranslatorFactory, register_builtin_providers
+from src.telegram_multi.translators.local import LocalTranslator
+
+ENTRIES = [
+    ("en", "zh", "good morning", "早上好"),
+    ("en", "zh", "good", "好"),
+    ("en", "zh", "friend", "朋友"),
+    ("en", "zh", "See you tomorrow", "明天见"),
+    ("zh", "en", "你好", "hello"),
+    ("zh", "en", "朋友", "friend"),
+]
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    path = str(tmp_path / "phrases.tgpt")
+    build_phrase_table(ENTRIES, path)
+    return path
+
+
+class TestPhraseTable:
+    """Contract tests for the phrase table file."""
+
+    def test_exact_lookup(self, table_path):
+        """Contract: Lookups are case/whitespace-insensitive."""
+        table = PhraseTable(table_path)
+        assert len(table) == len(ENTRIES)
+        assert table.lookup("Good   Morning", "en", "zh") == "早上好"
+        assert table.lookup("good evening", "en", "zh") is None
+        table.close()
+
+    def test_whole_text_match_wins(self, table_path):
+        """Contract: A stored sentence is returned as-is."""
+        table = PhraseTable(table_path)
+        assert table.translate("see you tomorrow", "en", "zh") == "明天见"
+
+    def test_longest_phrase_segmentation(self, table_path):
+        """Contract: Longest known phrases replace their span."""
+        table = PhraseTable(table_path)
+        assert table.translate("good morning, friend!", "en", "zh") == "早上好, 朋友!"
+        assert table.translate("你好朋友", "zh", "en") == "hello friend"
+
+    def test_unknown_text(self, table_path):
+        """Contract: None when no phrase is known."""
+        assert PhraseTable(table_path).translate("xyz", "en", "zh") is None
+
+    def test_auto_source(self, table_path):
+        """Contract: src "auto" tries each source paired with dest."""
+        assert PhraseTable(table_path).translate("你好", "auto", "en") == "hello"
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Contract: Non-table files raise ValueError."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a phrase table at all")
+        with pytest.raises(ValueError):
+            PhraseTable(str(path))
+
+    def test_shared_per_path(self, table_path):
+        """Contract: One mapping per file in the process."""
+        assert open_phrase_table(table_path) is open_phrase_table(table_path)
+
+
+class TestLoadEntries:
+    """Contract tests for the builder inputs."""
+
+    def test_tsv_and_jsonl(self, tmp_path):
+        """Contract: 2/4-column TSV and JSONL are accepted."""
+        tsv = tmp_path / "a.tsv"
+        tsv.write_text("# comment\nhello\t你好\nen\tru\tyes\tда\n", encoding="utf-8")
+        jsonl = tmp_path / "b.jsonl"
+        jsonl.write_text(json.dumps({"source": "no", "target": "нет", "dest": "ru"}) + "\n")
+
+        assert list(load_entries(str(tsv), "en", "zh")) == [
+            ("en", "zh", "hello", "你好"),
+            ("en", "ru", "yes", "да"),
+        ]
+        assert list(load_entries(str(jsonl), "en")) == [("en", "ru", "no", "нет")]
+
+    def test_missing_pair(self, tmp_path):
+        """Contract: 2-column TSV needs a language pair."""
+        tsv = tmp_path / "a.tsv"
+        tsv.write_text("hello\t你好\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            list(load_entries(str(tsv)))
+
+
+class TestLocalTranslator:
+    """Contract tests for LocalTranslator."""
+
+    def test_factory_creates_local(self, table_path):
+        """Contract: provider "local" no longer crashes the factory."""
+        register_builtin_providers()
+        config = TranslationConfig(
+            enabled=True, provider="local", phrase_table_path=table_path,
+            source_lang="en", target_lang="zh",
+        )
+        translator = TranslatorFactory.create(config)
+        assert isinstance(translator, LocalTranslator)
+        assert translator.translate("good morning") == "早上好"
+        assert translator.batch_translate(["friend", "nope"]) == ["朋友", "nope"]
+
+    def test_missing_table_returns_original(self, tmp_path):
+        """Contract: No table means unchanged text."""
+        translator = LocalTranslator(
+            TranslationConfig(enabled=True, phrase_table_path=str(tmp_path / "none"))
+        )
+        assert not translator.is_available()
+        assert translator.translate("hello", "en", "zh") == "hello"
+
+    def test_no_shared_cache_or_guard_is_built(self, table_path, tmp_path):
+        """Contract: Lookups skip the cache tiers and the process-wide guard."""
+        translator = LocalTranslator(
+            TranslationConfig(
+                enabled=True, phrase_table_path=table_path, store_path=str(tmp_path / "store.db")
+            )
+        )
+        assert isinstance(translator.cache, TranslationCache)
+        assert not (tmp_path / "store.db").exists()
+        assert translator.guard.limiter.rate == 0
+        assert translator.guard is not get_provider_guard("local")
+
+    @pytest.mark.asyncio
+    async def test_async(self, table_path):
+        """Contract: Async API answers from the table."""
+        translator = LocalTranslator(
+            TranslationConfig(enabled=True, phrase_table_path=table_path)
+        )
+        assert await translator.translate_async("你好", "zh", "en") == "hello"
@@ -37,7 +37,8 @@ class TestOptimization:
 
     def test_google_translator_ttl(self):
         """Verify GoogleTranslator respects cache TTL."""
-        config = TranslationConfig(enabled=True, cache_ttl=1)  # 1 second TTL
+        # 1 second TTL; no stale serving so expiry forces a blocking refetch
+        config = TranslationConfig(enabled=True, cache_ttl=1, cache_stale_ttl=0)
         translator = GoogleTranslator(config)
         
         # Mock the library
@@ -0,0 +1,292 @@
+"""
+Tests for the injected page script's DOM processing.
+
+Behaviour is checked by running the script under node against the DOM
+stub in tests/page_harness.js (skipped when node is not installed).
+
+Contract:
+- The slice cap reaches the page config
+- Mutation batches are queued without loss or duplicates and drained in
+  slices that respect the cap and the idle deadline, containers included
+- page_queue_stats() reads the page's queue counters
+- Translation is driven by IntersectionObserver with a prefetch margin
+  and a concurrency cap from the config
+- Messages are keyed by chat and DOM id with a content-hash fallback,
+  and known messages are painted before any translation is requested
+- Message events reach Python in batches and are validated in one pass
+- The script body is minified and built once; push_config() sends new
+  values to a running page, which chat switches do not revert
+- Overlays are written in a batched phase with one mutation per update,
+  contained by CSS, and js_reduced_motion turns animations off
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.message_interceptor import (
+    APPLY_CONFIG_FN,
+    NEW_MESSAGES_BINDING,
+    PAGE_QUEUE_STATS,
+    MessageInterceptor,
+    MessageType,
+    PageQueueStats,
+    _script_template,
+    parse_page_messages,
+)
+
+
+HARNESS = Path(__file__).with_name("page_harness.js")
+NODE = shutil.which("node")
+needs_node = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+
+def script_config(script: str) -> dict:
+    start = script.index("const DEFAULT_CONFIG = ") + len("const DEFAULT_CONFIG = ")
+    return json.loads(script[start : script.index(";", start)])
+
+
+def run_page(tmp_path: Path, scenario: str, **overrides) -> dict:
+    """Run a page_harness.js scenario against the script for a config."""
+    script = tmp_path / "page.js"
+    script.write_text(
+        MessageInterceptor(TranslationConfig(enabled=True, **overrides)).get_injection_script(),
+        encoding="utf-8",
+    )
+    result = subprocess.run(
+        [NODE, str(HARNESS), str(script), scenario],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+class FakePage:
+    """Answers page.evaluate with a fixed value."""
+
+    def __init__(self, value):
+        self.value = value
+        self.expressions = []
+        self.args = []
+
+    async def evaluate(self, expression, arg=None):
+        self.expressions.append(expression)
+        self.args.append(arg)
+        return self.value
+
+
+class TestDomQueue:
+    """Contract tests for the time-sliced DOM queue."""
+
+    def test_slice_settings_reach_the_page(self):
+        """Contract: js_slice_max_nodes caps per-slice work in the page."""
+        script = MessageInterceptor(
+            TranslationConfig(enabled=True, js_slice_max_nodes=20)
+        ).get_injection_script()
+        config = script_config(script)
+        assert config["sliceMaxNodes"] == 20
+        assert config["queueStatsGlobal"] == PAGE_QUEUE_STATS
+
+    @needs_node
+    def test_mutations_are_queued_without_loss(self, tmp_path):
+        """Contract: Overlapping batches, removed nodes and containers are all accounted for."""
+        result = run_page(tmp_path, "queue", js_slice_max_nodes=4)
+        stats = result["stats"]
+        assert result["observed"] == 30
+        assert stats["processed"] == 30
+        assert stats["deduplicated"] == 5
+        assert stats["dropped"] == 1
+        assert stats["pending"] == 0
+        # 30 messages, a removed one and a container, 4 nodes per slice
+        assert stats["slices"] == 8
+
+    @needs_node
+    def test_container_slices_respect_the_deadline(self, tmp_path):
+        """Contract: A slice of container nodes stops when idle time runs out."""
+        result = run_page(tmp_path, "deadline")
+        assert result["stats"]["pending"] == 0
+        assert result["stats"]["slices"] == 10
+        assert max(result["perSlice"]) <= 2
+
+    @pytest.mark.asyncio
+    async def test_page_queue_stats(self):
+        """Contract: Counters come from the page; missing script reads as zero."""
+        interceptor = MessageInterceptor(TranslationConfig(enabled=True))
+        page = FakePage({"queued": 12, "processed": 10, "dropped": 1, "slices": 3, "pending": 1})
+
+        stats = await interceptor.page_queue_stats(page)
+
+        assert stats == PageQueueStats(queued=12, processed=10, dropped=1, slices=3, pending=1)
+        assert PAGE_QUEUE_STATS in page.expressions[0]
+        assert await interceptor.page_queue_stats(FakePage(None)) == PageQueueStats()
+
+
+class TestViewportPriority:
+    """Contract tests for viewport-driven translation."""
+
+    def test_viewport_settings_reach_the_page(self):
+        """Contract: Prefetch margin and concurrency come from the config."""
+        script = MessageInterceptor(
+            TranslationConfig(
+                enabled=True, js_prefetch_margin_px=400, js_max_concurrent_translations=3
+            )
+        ).get_injection_script()
+        config = script_config(script)
+        assert config["prefetchMarginPx"] == 400
+        assert config["maxConcurrentTranslations"] == 3
+
+    @needs_node
+    def test_visible_first_and_cancelled_when_out_of_range(self, tmp_path):
+        """Contract: Visible messages jump the prefetch queue; leaving the band cancels."""
+        result = run_page(
+            tmp_path, "priority", js_max_concurrent_translations=2, js_prefetch_margin_px=300
+        )
+        # Two prefetches were already running when the visible ones arrived
+        assert result["sent"] == [f"text {i}" for i in [0, 1, 15, 16, 17, 18, 19, *range(2, 8)]]
+        assert result["stats"]["cancelled"] == 7
+        assert result["margin"] == "300px 0px 300px 0px"
+
+
+class TestMessageIdentity:
+    """Contract tests for stable message keys."""
+
+    def test_messages_are_keyed_by_dom_id(self):
+        """Contract: DOM ids come before a content hash; both are per chat."""
+        script = MessageInterceptor(TranslationConfig(enabled=True)).get_injection_script()
+        assert "holder.dataset?.messageId || holder.dataset?.mid" in script
+        assert "`${chatId}:h:${text.length}:${hashText(text)}`" in script
+
+    @needs_node
+    def test_rerendered_messages_reuse_the_index(self, tmp_path):
+        """Contract: A re-rendered translated message is painted without a request or event."""
+        result = run_page(tmp_path, "reuse")
+        assert result["painted"] == "good morningGOOD MORNING"
+        assert result["stats"]["reused"] == 1
+        assert result["events"] == ["#100:good morning", "#100:same old"]
+        # The untranslated text was not cached, so it is asked for again
+        assert result["sent"] == ["good morning", "same old", "same old"]
+
+
+class TestMessageEvents:
+    """Contract tests for batched message events."""
+
+    def test_events_are_parsed_in_order(self):
+        """Contract: A page batch becomes Messages in event order."""
+        messages = parse_page_messages(
+            [
+                {"type": "incoming", "content": "ping", "sender": "Bob", "chatId": "42"},
+                {"type": "outgoing", "content": "pong", "timestamp": "2025-01-01T12:00:00"},
+            ]
+        )
+        assert [m.content for m in messages] == ["ping", "pong"]
+        assert messages[0].message_type == MessageType.INCOMING
+        assert messages[0].chat_id == "42"
+        assert messages[1].message_type == MessageType.OUTGOING
+
+    def test_malformed_events_are_dropped(self):
+        """Contract: One bad event does not discard the batch."""
+        messages = parse_page_messages(
+            [
+                {"type": "incoming", "content": "a"},
+                {"type": "sideways", "content": "b"},
+                {"content": "c"},
+                "not an event",
+                {"type": "incoming", "content": "d"},
+            ]
+        )
+        assert [m.content for m in messages] == ["a", "d"]
+
+    def test_page_uses_the_batched_binding(self):
+        """Contract: The binding name reaches the page config."""
+        script = MessageInterceptor(TranslationConfig(enabled=True)).get_injection_script()
+        assert script_config(script)["messagesBinding"] == NEW_MESSAGES_BINDING
+
+    @needs_node
+    def test_events_are_batched_once_per_message_and_chat(self, tmp_path):
+        """Contract: One delivery per frame; a repeat text fires again only in another chat."""
+        result = run_page(tmp_path, "events")
+        assert result["batches"] == 2
+        assert result["events"] == [f"#100:event {i}" for i in range(30)] + ["#200:event 0"]
+
+
+class TestScriptBuild:
+    """Contract tests for the cached script and live config push."""
+
+    def test_body_is_built_once_and_minified(self):
+        """Contract: Calls share the cached body; only the payload differs."""
+        _script_template.cache_clear()
+        en = MessageInterceptor(TranslationConfig(enabled=True, target_lang="en"))
+        de = MessageInterceptor(TranslationConfig(enabled=True, target_lang="de"))
+        en_script, de_script = en.get_injection_script(), de.get_injection_script()
+
+        assert _script_template.cache_info().misses == 1
+        assert script_config(en_script)["targetLang"] == "en"
+        assert script_config(de_script)["targetLang"] == "de"
+        lines = en_script.splitlines()
+        assert all(line == line.strip() and line for line in lines)
+        assert not any(line.startswith("//") for line in lines)
+
+    def test_double_injection_is_guarded(self):
+        """Contract: A second copy applies its config instead of re-initializing."""
+        script = MessageInterceptor(TranslationConfig(enabled=True)).get_injection_script()
+        assert script.index("if (window.__tgTranslateLoaded)") < script.index(
+            "new MutationObserver"
+        )
+        assert script_config(script)["applyConfigFn"] == APPLY_CONFIG_FN
+
+    @pytest.mark.asyncio
+    async def test_push_config(self):
+        """Contract: New values reach the page and replace the local config."""
+        interceptor = MessageInterceptor(TranslationConfig(enabled=True, target_lang="en"))
+        page = FakePage(True)
+
+        applied = await interceptor.push_config(
+            page, TranslationConfig(enabled=True, target_lang="ja", display_mode="replace")
+        )
+
+        assert applied is True
+        assert APPLY_CONFIG_FN in page.expressions[0]
+        assert page.args[0]["targetLang"] == "ja"
+        assert page.args[0]["displayMode"] == "replace"
+        assert interceptor.config.target_lang == "ja"
+        assert await interceptor.push_config(FakePage(False)) is False
+
+    @needs_node
+    def test_pushed_config_survives_chat_switches(self, tmp_path):
+        """Contract: Chats keep only panel edits; a new margin gets a new observer."""
+        result = run_page(tmp_path, "config")
+        assert result["chats"] == {
+            "#200": ["ja", "bilingual"],
+            "#300": ["ja", "replace"],
+            "#100": ["ja", "original"],
+        }
+        assert result["stored"] == {"displayMode": "original"}
+        assert result["margins"] == ["800px 0px 800px 0px", "500px 0px 500px 0px"]
+        assert result["oldDisconnected"] is True
+        assert result["rewatched"] is True
+
+
+class TestOverlayRendering:
+    """Contract tests for layout-friendly overlay rendering."""
+
+    def test_reduced_motion_reaches_the_page(self):
+        """Contract: js_reduced_motion is part of the page config."""
+        default = MessageInterceptor(TranslationConfig(enabled=True)).get_injection_script()
+        lite = MessageInterceptor(
+            TranslationConfig(enabled=True, js_reduced_motion=True)
+        ).get_injection_script()
+        assert script_config(default)["reducedMotion"] is False
+        assert script_config(lite)["reducedMotion"] is True
+        assert "prefers-reduced-motion: reduce" in default
+
+    def test_overlays_are_contained_and_written_in_one_phase(self):
+        """Contract: No innerHTML clearing; writes go through the frame queue."""
+        script = MessageInterceptor(TranslationConfig(enabled=True)).get_injection_script()
+        assert "contain: layout style paint;" in script
+        assert "innerHTML = ''" not in script
+        assert "content.replaceChildren(fragment)" in script
+        assert "scheduleWrite(() => element.appendChild(overlay))" in script
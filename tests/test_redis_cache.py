@@ -0,0 +1,169 @@
+"""
+Tests for the Redis-backed shared translation cache.
+
+Contract:
+- RedisTranslationCache sets TTL server-side and batches reads with MGET
+- Redis failures degrade to misses
+- TieredTranslationCache backfills L1 from shared tiers
+- settings.redis_url switches providers to the tiered cache
+"""
+
+from unittest.mock import MagicMock
+from src.telegram_multi.cache import (
+    RedisTranslationCache,
+    TieredTranslationCache,
+    TranslationCache,
+)
+from src.telegram_multi.cache import redis_cache
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.settings import settings
+from src.telegram_multi.translators.google import GoogleTranslator
+
+
+class FakePipeline:
+    """Buffers commands until execute()."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value, ex))
+
+    def execute(self):
+        self.client.round_trips += 1
+        for key, value, ex in self.commands:
+            self.client.store[key] = value
+            self.client.expiry[key] = ex
+        self.commands = []
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of redis.Redis we use."""
+
+    def __init__(self):
+        self.store = {}
+        self.expiry = {}
+        self.round_trips = 0
+
+    def get(self, key):
+        self.round_trips += 1
+        return self.store.get(key)
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self.store.get(k) for k in keys]
+
+    def set(self, key, value, ex=None):
+        self.round_trips += 1
+        self.store[key] = value
+        self.expiry[key] = ex
+
+    def delete(self, key):
+        self.round_trips += 1
+        self.store.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class TestRedisTranslationCache:
+    """Contract tests for the Redis tier."""
+
+    def test_set_uses_server_side_ttl(self):
+        """Contract: TTL is passed to Redis with SET EX."""
+        client = FakeRedis()
+        cache = RedisTranslationCache(client, ttl=120)
+        cache.set("k", "v")
+        assert client.store["tgtr:k"] == "v"
+        assert client.expiry["tgtr:k"] == 120
+        assert cache.get("k") == "v"
+
+    def test_get_many_single_round_trip(self):
+        """Contract: get_many issues one MGET."""
+        client = FakeRedis()
+        cache = RedisTranslationCache(client)
+        cache.set_many({"a": "1", "b": "2"})
+        client.round_trips = 0
+        assert cache.get_many(["a", "b", "c"]) == {"a": "1", "b": "2"}
+        assert client.round_trips == 1
+
+    def test_decodes_bytes_replies(self):
+        """Contract: Byte replies are returned as str."""
+        client = FakeRedis()
+        client.store["tgtr:k"] = "héllo".encode("utf-8")
+        assert RedisTranslationCache(client).get("k") == "héllo"
+
+    def test_errors_degrade_to_miss(self):
+        """Contract: A failing Redis never raises into the caller."""
+        client = MagicMock()
+        client.get.side_effect = ConnectionError("down")
+        client.mget.side_effect = ConnectionError("down")
+        client.set.side_effect = ConnectionError("down")
+        cache = RedisTranslationCache(client)
+        assert cache.get("k") is None
+        assert cache.get_many(["k"]) == {}
+        cache.set("k", "v")
+        assert cache.errors == 3
+
+
+class TestTieredTranslationCache:
+    """Contract tests for tier composition."""
+
+    def test_l2_hit_backfills_l1(self):
+        """Contract: A shared-tier hit is copied into L1."""
+        l1 = TranslationCache()
+        l2 = RedisTranslationCache(FakeRedis())
+        l2.set("k", "v")
+        cache = TieredTranslationCache([l1, l2])
+        assert cache.get("k") == "v"
+        assert l1.get("k") == "v"
+
+    def test_get_many_only_asks_l2_for_l1_misses(self):
+        """Contract: L2 is queried only for keys L1 does not have."""
+        client = FakeRedis()
+        l1 = TranslationCache()
+        l2 = RedisTranslationCache(client)
+        cache = TieredTranslationCache([l1, l2])
+        l1.set("a", "1")
+        l2.set("b", "2")
+        client.round_trips = 0
+
+        assert cache.get_many(["a", "b", "c"]) == {"a": "1", "b": "2"}
+        assert client.round_trips == 1
+        assert "b" in l1
+        stats = cache.stats()
+        assert stats.hits == 2
+        assert stats.misses == 1
+
+    def test_set_writes_through(self):
+        """Contract: Writes reach every tier."""
+        client = FakeRedis()
+        cache = TieredTranslationCache([TranslationCache(), RedisTranslationCache(client)])
+        cache.set("k", "v")
+        assert "k" in cache
+        assert client.store["tgtr:k"] == "v"
+
+
+class TestRedisUrlWiring:
+    """settings.redis_url selects the shared tier for providers."""
+
+    def test_translators_share_results_through_redis(self, monkeypatch):
+        """Contract: A translation done by one instance is reused by another."""
+        url = "redis://fake:6379/0"
+        fake = FakeRedis()
+        monkeypatch.setattr(settings, "redis_url", url)
+        monkeypatch.setitem(redis_cache._clients, url, fake)
+
+        config = TranslationConfig(enabled=True)
+        first = GoogleTranslator(config)
+        second = GoogleTranslator(config)
+        assert isinstance(first.cache, TieredTranslationCache)
+
+        first._lib = MagicMock()
+        first._lib.translate.return_value.text = "Hola"
+        second._lib = MagicMock()
+
+        assert first.translate("Hello", "en", "es") == "Hola"
+        assert second.batch_translate(["Hello"], "en", "es") == ["Hola"]
+        second._lib.translate.assert_not_called()
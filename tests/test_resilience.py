@@ -0,0 +1,203 @@
+"""
+Tests for per-provider rate limiting and circuit breaking.
+
+Contract:
+- TokenBucket allows bursts up to capacity, then queues callers in
+  arrival order; only a caller facing an over-long queue is refused
+- CircuitBreaker opens after consecutive failures, half-opens after the
+  recovery timeout and closes on a successful probe
+- Guards are shared by all translators of one provider
+- Translators fail fast while the circuit is open (no retry sleeps)
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    ProviderGuard,
+    RateLimitedError,
+    TokenBucket,
+    get_provider_guard,
+)
+from src.telegram_multi.translators.google import GoogleTranslator
+
+
+class TestTokenBucket:
+    """Contract tests for TokenBucket."""
+
+    def test_burst_then_wait(self, clock):
+        """Contract: capacity tokens at once, then 1/rate seconds apart."""
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+        clock.now += 0.5
+        assert bucket.try_acquire() == 0.0
+
+    def test_acquire_gives_up_after_max_wait(self):
+        """Contract: RateLimitedError instead of waiting too long."""
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.acquire(max_wait=0)
+        with pytest.raises(RateLimitedError):
+            bucket.acquire(max_wait=0.1)
+
+    def test_reservations_queue_in_order(self, clock):
+        """Contract: Each reservation lands one interval behind the last."""
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+        delays = [bucket.reserve(max_wait=10) for _ in range(5)]
+        assert delays == pytest.approx([0.0, 0.0, 0.5, 1.0, 1.5])
+        with pytest.raises(RateLimitedError):
+            bucket.reserve(max_wait=1.9)
+        bucket.release()
+        assert bucket.reserve(max_wait=10) == pytest.approx(1.5)
+
+    def test_zero_rate_disables_limit(self):
+        """Contract: rate <= 0 never throttles."""
+        bucket = TokenBucket(rate=0, capacity=1)
+        assert all(bucket.try_acquire() == 0.0 for _ in range(100))
+
+
+class TestCircuitBreaker:
+    """Contract tests for CircuitBreaker."""
+
+    def test_opens_after_threshold(self, clock):
+        """Contract: Consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=clock)
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.rejected == 1
+
+    def test_success_resets_failure_count(self):
+        """Contract: Only consecutive failures count."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe(self, clock):
+        """Contract: One probe after the timeout decides the state."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now = 5
+        assert breaker.state == HALF_OPEN
+
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        clock.now = 10
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+
+class TestTranslatorGuard:
+    """Translators share and respect the provider guard."""
+
+    def test_guard_shared_per_provider(self):
+        """Contract: Instances of one provider share one guard."""
+        first = GoogleTranslator(TranslationConfig(enabled=True))
+        second = GoogleTranslator(TranslationConfig(enabled=True))
+        assert first.guard is second.guard is get_provider_guard("google")
+
+    def test_open_circuit_fails_fast(self):
+        """Contract: No upstream call and no retry sleep while open."""
+        translator = GoogleTranslator(TranslationConfig(enabled=True))
+        translator.guard = ProviderGuard(
+            "google",
+            TokenBucket(rate=0, capacity=1),
+            CircuitBreaker(failure_threshold=2, recovery_timeout=60),
+        )
+        translator._lib = MagicMock()
+        translator._lib.translate.side_effect = Exception("429 Too Many Requests")
+
+        with patch("src.telegram_multi.translator.time.sleep") as sleep:
+            assert translator.translate("one", "en", "es") == "one"
+            # Second failure opened the circuit: retries stopped there
+            assert translator._lib.translate.call_count == 2
+            assert sleep.call_count == 1
+
+            start = time.monotonic()
+            assert translator.translate("two", "en", "es") == "two"
+            assert time.monotonic() - start < 0.05
+        assert translator._lib.translate.call_count == 2
+        stats = translator.guard.stats()
+        assert stats.state == OPEN
+        assert stats.rejected == 1
+
+    def test_rate_limit_paces_calls(self):
+        """Contract: Calls beyond the burst wait for tokens."""
+        translator = GoogleTranslator(TranslationConfig(enabled=True))
+        translator.guard = ProviderGuard(
+            "google", TokenBucket(rate=20, capacity=1), CircuitBreaker(), max_wait=1
+        )
+        translator._lib = MagicMock()
+        translator._lib.translate.return_value = MagicMock(text="x")
+
+        start = time.monotonic()
+        for i in range(3):
+            translator.translate(f"t{i}", "en", "es")
+        assert time.monotonic() - start >= 0.09
+        assert translator.guard.stats().waited_seconds > 0
+
+    @pytest.mark.asyncio
+    async def test_burst_is_queued_not_dropped(self):
+        """Contract: A burst beyond capacity is translated in full, in order."""
+        translator = GoogleTranslator(TranslationConfig(enabled=True))
+        translator.guard = ProviderGuard(
+            "google", TokenBucket(rate=200, capacity=5), CircuitBreaker(), max_wait=0.2
+        )
+
+        async def fetch(text, src_lang, dest_lang):
+            return text.upper()
+
+        translator._fetch_async = fetch
+        texts = [f"t{i}" for i in range(40)]
+        results = await asyncio.gather(
+            *(translator.translate_async(t, "en", "es") for t in texts)
+        )
+
+        assert results == [t.upper() for t in texts]
+        assert translator.guard.stats().rate_limited == 0
+
+    @pytest.mark.asyncio
+    async def test_chat_open_burst_is_not_delayed(self):
+        """Contract: By default a chat's worth of sentences goes out at once."""
+        translator = GoogleTranslator(TranslationConfig(enabled=True))
+
+        async def fetch(text, src_lang, dest_lang):
+            return text.upper()
+
+        translator._fetch_async = fetch
+        texts = [f"sentence {i}" for i in range(150)]
+        assert await translator.batch_translate_async(texts, "en", "es") == [
+            t.upper() for t in texts
+        ]
+        stats = translator.guard.stats()
+        assert stats.waited_seconds == 0
+        assert stats.rate_limited == 0
+
+    def test_composite_has_no_guard_of_its_own(self):
+        """Contract: Only the wrapped providers are rate limited."""
+        from src.telegram_multi.translators.composite import HedgedTranslator
+
+        inner = GoogleTranslator(TranslationConfig(enabled=True))
+        hedged = HedgedTranslator(TranslationConfig(enabled=True), providers={"google": inner})
+        assert hedged.guard is None
+        assert inner.guard is get_provider_guard("google")
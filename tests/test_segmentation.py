@@ -0,0 +1,143 @@
+"""
+Tests for sentence-level segmentation and per-segment translation.
+
+Contract:
+- Segments and separators rebuild the original text exactly
+- Line breaks, sentence ends and CJK terminators split; abbreviations don't
+- Segments without letters are never translated
+- Repeated sentences across messages are fetched upstream once
+- MessageInterceptor translates multi-sentence messages per segment
+"""
+
+import asyncio
+import pytest
+from src.telegram_multi.batching import BatchScheduler
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.message_interceptor import Message, MessageInterceptor, MessageType
+from src.telegram_multi.segmentation import split_segments
+
+TEMPLATE = "Hello {name}!\nYour order has shipped. Thank you for shopping with us."
+
+
+def tag(text: str, src: str, dest: str) -> str:
+    return f"<{text}>"
+
+
+class TestSplitSegments:
+    """Contract tests for split_segments."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Hello there. How are you?\n\n  Order #123 shipped!  ",
+            "你好。今天怎么样？好的",
+            " \n",
+            "",
+            "12345 😀",
+        ],
+    )
+    def test_round_trip(self, text):
+        """Contract: join() of the untranslated segments is the input."""
+        segmented = split_segments(text)
+        assert segmented.join(segmented.segments) == text
+
+    def test_boundaries(self):
+        """Contract: Lines and sentences split, whitespace is kept aside."""
+        segmented = split_segments("Hi there. How are you?\n\nBye!")
+        assert segmented.segments == ["Hi there.", "How are you?", "Bye!"]
+        assert segmented.separators == ["", " ", "\n\n", ""]
+
+    def test_cjk_terminators(self):
+        """Contract: CJK sentence ends need no following space."""
+        assert split_segments("你好。今天怎么样？").segments == ["你好。", "今天怎么样？"]
+
+    def test_abbreviations_and_decimals(self):
+        """Contract: "Mr." and "3.50" do not end a sentence."""
+        segmented = split_segments("Mr. Smith paid 3.50 USD. Thanks!")
+        assert segmented.segments == ["Mr. Smith paid 3.50 USD.", "Thanks!"]
+
+    def test_letterless_segments_are_separators(self):
+        """Contract: Numbers and emoji lines are not translatable."""
+        segmented = split_segments("Total:\n42\n👍")
+        assert segmented.segments == ["Total:"]
+        assert segmented.join(["Итого:"]) == "Итого:\n42\n👍"
+
+
+class TestSegmentedTranslation:
+    """Contract tests for Translator.translate_segmented."""
+
+    def test_layout_is_preserved(self, make_google):
+        """Contract: Translations are placed between the original separators."""
+        translator = make_google(tag)
+        result = translator.translate_segmented("One.  Two?\n\n42", "en", "de")
+        assert result == "<One.>  <Two?>\n\n42"
+
+    def test_shared_sentences_hit_the_cache(self, make_google):
+        """Contract: Only the new sentence of a templated message goes upstream."""
+        translator = make_google(tag)
+        translator.translate_segmented(TEMPLATE.format(name="Ann"), "en", "de")
+        translator._fetch.reset_mock()
+
+        result = translator.translate_segmented(TEMPLATE.format(name="Bob"), "en", "de")
+
+        assert result.startswith("<Hello Bob!>\n")
+        assert [c.args[0] for c in translator._fetch.call_args_list] == ["Hello Bob!"]
+
+    def test_duplicate_segments_translated_once(self, make_google):
+        """Contract: A sentence repeated in one message is requested once."""
+        translator = make_google(tag)
+        assert translator.translate_segmented("Ok.\nOk.", "en", "de") == "<Ok.>\n<Ok.>"
+        assert translator._fetch.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_async(self, make_google):
+        """Contract: The async variant rebuilds the same layout."""
+        translator = make_google(tag)
+        result = await translator.translate_segmented_async("One. Two.", "en", "de")
+        assert result == "<One.> <Two.>"
+
+
+class TestInterceptorSegmentation:
+    """Contract tests for per-segment translation in MessageInterceptor."""
+
+    def test_multi_sentence_message(self, make_google):
+        """Contract: Several sentences go through translate_segmented."""
+        translator = make_google(tag)
+        interceptor = MessageInterceptor(
+            TranslationConfig(enabled=True, source_lang="en", target_lang="de"), translator
+        )
+        msg = interceptor.translate_message(
+            Message(message_type=MessageType.OUTGOING, content="One. Two.")
+        )
+        assert msg.translated_content == "<One.> <Two.>"
+
+    def test_segmentation_can_be_disabled(self, make_google):
+        """Contract: segment_messages=False sends the whole text."""
+        translator = make_google(tag)
+        config = TranslationConfig(
+            enabled=True, source_lang="en", target_lang="de", segment_messages=False
+        )
+        msg = MessageInterceptor(config, translator).translate_message(
+            Message(message_type=MessageType.OUTGOING, content="One. Two.")
+        )
+        assert msg.translated_content == "<One. Two.>"
+
+    @pytest.mark.asyncio
+    async def test_segments_share_scheduler_batches(self, make_google):
+        """Contract: With a scheduler, segments of concurrent messages batch together."""
+        translator = make_google(tag)
+        config = TranslationConfig(enabled=True, source_lang="en", target_lang="de")
+        scheduler = BatchScheduler.from_config(translator, config)
+        interceptor = MessageInterceptor(config, translator, scheduler=scheduler)
+
+        messages = [
+            Message(message_type=MessageType.OUTGOING, content=c)
+            for c in ("A one. A two.", "B one.\nA two.")
+        ]
+        results = await asyncio.gather(*(interceptor.translate_message_async(m) for m in messages))
+
+        assert [m.translated_content for m in results] == [
+            "<A one.> <A two.>",
+            "<B one.>\n<A two.>",
+        ]
+        assert scheduler.metrics().batches == 1
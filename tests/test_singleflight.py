@@ -0,0 +1,187 @@
+"""
+Tests for single-flight coalescing of identical translations.
+
+Contract:
+- Concurrent identical calls share one execution
+- Every caller receives the shared result or the shared error
+- A cancelled caller does not cancel the call for the others
+- do_many() joins keys already in flight and leads the rest in one call
+- Providers coalesce concurrent misses for the same (src, dest, text)
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.singleflight import AsyncSingleFlight, SingleFlight
+from src.telegram_multi.translators.google import GoogleTranslator
+
+
+def run_in_threads(n, target):
+    results = [None] * n
+
+    def worker(i):
+        results[i] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class TestSingleFlight:
+    """Contract tests for the thread-based group."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Contract: N concurrent callers trigger fn once."""
+        group = SingleFlight()
+        calls = 0
+        release = threading.Event()
+
+        def slow():
+            nonlocal calls
+            calls += 1
+            release.wait(1)
+            return "value"
+
+        threading.Timer(0.1, release.set).start()
+        results = run_in_threads(5, lambda: group.do("k", slow))
+        assert results == ["value"] * 5
+        assert calls == 1
+        assert group.coalesced == 4
+        assert group.in_flight() == 0
+
+    def test_error_reaches_every_caller(self):
+        """Contract: The shared exception is raised in each caller."""
+        group = SingleFlight()
+
+        def failing():
+            time.sleep(0.05)
+            raise RuntimeError("upstream down")
+
+        def call():
+            try:
+                group.do("k", failing)
+            except RuntimeError as e:
+                return str(e)
+
+        assert run_in_threads(3, call) == ["upstream down"] * 3
+
+
+    def test_do_many_leads_free_keys_once(self):
+        """Contract: One fn call for every key not already in flight."""
+        group = SingleFlight()
+        led = []
+
+        def fetch_many(keys):
+            led.append(list(keys))
+            return {key: key.upper() for key in keys}
+
+        shared = group.do_many(["a", "b"], fetch_many)
+        assert led == [["a", "b"]]
+        assert {key: f.result() for key, f in shared.items()} == {"a": "A", "b": "B"}
+        assert group.in_flight() == 0
+
+
+class TestAsyncSingleFlight:
+    """Contract tests for the asyncio group."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_awaits_share_one_call(self):
+        """Contract: N concurrent awaits run fn once."""
+        group = AsyncSingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(group.do("k", fetch) for _ in range(5)))
+        assert results == ["value"] * 5
+        assert calls == 1
+        assert group.coalesced == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Contract: The shared call survives one caller's cancellation."""
+        group = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "value"
+
+        first = asyncio.create_task(group.do("k", fetch))
+        second = asyncio.create_task(group.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "value"
+
+    @pytest.mark.asyncio
+    async def test_do_many_joins_keys_in_flight(self):
+        """Contract: A group call only leads the keys nobody else runs."""
+        group = AsyncSingleFlight()
+        led = []
+
+        async def fetch_one():
+            await asyncio.sleep(0.01)
+            return "A"
+
+        async def fetch_many(keys):
+            led.append(list(keys))
+            if "c" in keys:
+                raise RuntimeError("boom")
+            return {key: key.upper() for key in keys}
+
+        single = asyncio.create_task(group.do("a", fetch_one))
+        await asyncio.sleep(0)
+        shared = await group.do_many(["a", "b"], fetch_many)
+        failed = await group.do_many(["c"], fetch_many)
+
+        assert led == [["b"], ["c"]]
+        assert {key: f.result() for key, f in shared.items()} == {"a": "A", "b": "B"}
+        assert isinstance(failed["c"].exception(), RuntimeError)
+        assert await single == "A"
+        assert group.in_flight() == 0
+
+
+class TestProviderCoalescing:
+    """Providers share upstream calls for identical misses."""
+
+    def test_sync_translate_coalesces(self):
+        """Contract: Threads translating the same text make one call."""
+        translator = GoogleTranslator(TranslationConfig(enabled=True))
+        translator._lib = MagicMock()
+
+        def slow_translate(text, src, dest):
+            time.sleep(0.1)
+            return MagicMock(text="Hola")
+
+        translator._lib.translate.side_effect = slow_translate
+        results = run_in_threads(4, lambda: translator.translate("Hello", "en", "es"))
+        assert results == ["Hola"] * 4
+        assert translator._lib.translate.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_async_translate_coalesces(self):
+        """Contract: Concurrent translate_async calls make one call."""
+        translator = GoogleTranslator(TranslationConfig(enabled=True))
+        calls = 0
+
+        async def fetch(text, src, dest):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "Hola"
+
+        translator._fetch_async = fetch
+        results = await asyncio.gather(
+            *(translator.translate_async("Hello", "en", "es") for _ in range(10))
+        )
+        assert results == ["Hola"] * 10
+        assert calls == 1
@@ -0,0 +1,117 @@
+"""
+Tests for the persistent SQLite translation store.
+
+Contract:
+- Translations survive closing and reopening the store
+- Writes are buffered and committed by the background writer
+- Pending writes are visible to reads before they are flushed
+- The database runs in WAL mode
+- config.store_path adds the store as a cache tier for providers
+"""
+
+import sqlite3
+import time
+from unittest.mock import MagicMock
+from src.telegram_multi.cache import SQLiteTranslationStore, TieredTranslationCache
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.translators.google import GoogleTranslator
+
+KEY = "google:en:es:5d41402abc4b2a76b9719d911017c592"
+
+
+class TestSQLiteTranslationStore:
+    """Contract tests for SQLiteTranslationStore."""
+
+    def test_survives_reopen(self, tmp_path):
+        """Contract: Data written before close is readable after reopen."""
+        path = str(tmp_path / "tr.db")
+        store = SQLiteTranslationStore(path)
+        store.set(KEY, "Hola")
+        store.close()
+
+        reopened = SQLiteTranslationStore(path)
+        try:
+            assert reopened.get(KEY) == "Hola"
+        finally:
+            reopened.close()
+
+    def test_write_behind_is_buffered(self, tmp_path):
+        """Contract: set() does not commit synchronously."""
+        store = SQLiteTranslationStore(str(tmp_path / "tr.db"), flush_interval=60)
+        try:
+            store.set(KEY, "Hola")
+            # Visible through the pending buffer...
+            assert store.get(KEY) == "Hola"
+            # ...but not yet on disk
+            assert store.flushed == 0
+            assert store.flush() == 1
+            assert store.flushed == 1
+        finally:
+            store.close()
+
+    def test_background_writer_commits(self, tmp_path):
+        """Contract: The writer thread flushes without explicit calls."""
+        store = SQLiteTranslationStore(str(tmp_path / "tr.db"), flush_interval=0.01)
+        try:
+            store.set(KEY, "Hola")
+            deadline = time.time() + 2
+            while store.flushed == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            assert store.flushed == 1
+        finally:
+            store.close()
+
+    def test_wal_mode(self, tmp_path):
+        """Contract: Database uses WAL journaling."""
+        path = str(tmp_path / "tr.db")
+        SQLiteTranslationStore(path).close()
+        conn = sqlite3.connect(path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+    def test_expired_rows_are_misses(self, tmp_path):
+        """Contract: Rows older than ttl are not returned."""
+        store = SQLiteTranslationStore(str(tmp_path / "tr.db"), ttl=10)
+        try:
+            store.set(KEY, "Hola")
+            store.flush()
+            with store._writer:
+                store._writer.execute("UPDATE translations SET created_at = 0")
+            assert store.get(KEY) is None
+            assert store.purge_expired() == 1
+        finally:
+            store.close()
+
+    def test_get_many_groups_by_language_pair(self, tmp_path):
+        """Contract: get_many returns hits across providers and pairs."""
+        store = SQLiteTranslationStore(str(tmp_path / "tr.db"))
+        try:
+            items = {
+                "google:en:es:aaa": "uno",
+                "google:en:es:bbb": "dos",
+                "deepl:en:DE:aaa": "eins",
+            }
+            store.set_many(items)
+            store.flush()
+            found = store.get_many(list(items) + ["google:en:fr:aaa"])
+            assert found == items
+        finally:
+            store.close()
+
+
+class TestStoreWiring:
+    """config.store_path makes providers read through the store."""
+
+    def test_translation_survives_new_translator(self, tmp_path):
+        """Contract: A fresh translator reuses a persisted translation."""
+        config = TranslationConfig(enabled=True, store_path=str(tmp_path / "tr.db"))
+        first = GoogleTranslator(config)
+        assert isinstance(first.cache, TieredTranslationCache)
+        first._lib = MagicMock()
+        first._lib.translate.return_value.text = "Hola"
+        assert first.translate("Hello", "en", "es") == "Hola"
+
+        second = GoogleTranslator(config)
+        second._lib = MagicMock()
+        assert second.translate("Hello", "en", "es") == "Hola"
+        second._lib.translate.assert_not_called()
@@ -0,0 +1,159 @@
+"""
+Tests for stale-while-revalidate and negative caching.
+
+Contract:
+- TranslationCache keeps expired entries for stale_ttl and serves them
+  through get_stale() only
+- An expired translation is returned at once and refreshed in the
+  background (one refresh per key)
+- A failed fetch is not retried upstream until cache_negative_ttl passes;
+  a call the local guard turned away is not a failed fetch
+- Both are configurable on TranslationConfig
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock
+import pytest
+from src.telegram_multi.cache import TranslationCache
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.resilience import CircuitBreaker, ProviderGuard, TokenBucket
+from src.telegram_multi.translators.google import GoogleTranslator
+
+
+@pytest.fixture
+def translator(make_google, clock):
+    """Google provider answering "v1" with its caches on the test clock."""
+    translator = make_google(lambda text, src, dest: "v1")
+    translator.cache = TranslationCache(ttl=10, stale_ttl=100, clock=clock)
+    translator.negative_cache = TranslationCache(ttl=5, clock=clock)
+    return translator
+
+
+class TestStaleEntries:
+    """Contract tests for TranslationCache.get_stale."""
+
+    def test_expired_entry_is_stale_until_grace_ends(self, clock):
+        """Contract: get() misses after ttl; get_stale() serves until ttl + stale_ttl."""
+        cache = TranslationCache(ttl=10, stale_ttl=20, clock=clock)
+        cache.set("k", "v")
+        assert cache.get_stale("k") is None  # still fresh
+
+        clock.now = 15
+        assert cache.get("k") is None
+        assert cache.get_stale("k") == "v"
+
+        clock.now = 31
+        assert cache.get_stale("k") is None
+        assert len(cache) == 0
+        stats = cache.stats()
+        assert stats.stale_hits == 1
+        assert stats.expirations == 1
+
+    def test_without_stale_ttl_entries_drop_at_expiry(self, clock):
+        """Contract: stale_ttl=0 keeps the old expiry behavior."""
+        cache = TranslationCache(ttl=10, clock=clock)
+        cache.set("k", "v")
+        clock.now = 10
+        assert cache.get("k") is None
+        assert cache.get_stale("k") is None
+        assert len(cache) == 0
+
+    def test_config_wires_stale_ttl(self):
+        """Contract: cache_stale_ttl reaches the provider cache."""
+        translator = GoogleTranslator(TranslationConfig(enabled=True, cache_stale_ttl=42))
+        assert translator.cache.stale_ttl == 42
+
+
+class TestStaleWhileRevalidate:
+    """Contract tests for serving stale translations."""
+
+    def test_stale_value_served_and_refreshed(self, translator, clock):
+        """Contract: The caller gets the stale value; a refresh updates the cache."""
+        assert translator.translate("Hello", "en", "es") == "v1"
+
+        clock.now = 20
+        translator._fetch.side_effect = lambda text, src, dest: "v2"
+        assert translator.translate("Hello", "en", "es") == "v1"
+        translator._refresh_executor.shutdown(wait=True)
+
+        assert translator._fetch.call_count == 2
+        assert translator.translate("Hello", "en", "es") == "v2"
+
+    def test_one_refresh_per_key(self, translator, clock):
+        """Contract: Concurrent stale reads trigger a single refresh."""
+        translator.translate("Hello", "en", "es")
+        clock.now = 20
+
+        release = threading.Event()
+
+        def slow_fetch(text, src, dest):
+            release.wait(1)
+            return "v2"
+
+        translator._fetch.side_effect = slow_fetch
+        for _ in range(5):
+            assert translator.translate("Hello", "en", "es") == "v1"
+        release.set()
+        translator._refresh_executor.shutdown(wait=True)
+        assert translator._fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_refresh(self, translator, clock):
+        """Contract: Async callers refresh in a background task."""
+        translator._fetch_async = AsyncMock(side_effect=["v1", "v2"])
+        assert await translator.translate_async("Hello", "en", "es") == "v1"
+
+        clock.now = 20
+        assert await translator.translate_async("Hello", "en", "es") == "v1"
+        await asyncio.gather(*translator._refresh_tasks)
+        assert await translator.translate_async("Hello", "en", "es") == "v2"
+
+
+class TestNegativeCaching:
+    """Contract tests for remembering failures."""
+
+    def test_failure_not_retried_within_negative_ttl(self, translator, clock):
+        """Contract: Repeats return the original without the retry ladder."""
+        translator._fetch.side_effect = RuntimeError("503")
+
+        assert translator.translate("Hello", "en", "es") == "Hello"
+        assert translator.translate("Hello", "en", "es") == "Hello"
+        assert translator._fetch.call_count == translator.max_retries
+
+        clock.now = 6
+        translator._fetch.side_effect = lambda text, src, dest: "Hola"
+        assert translator.translate("Hello", "en", "es") == "Hola"
+
+    def test_negative_caching_can_be_disabled(self, make_google):
+        """Contract: cache_negative_ttl=0 retries every call."""
+        translator = make_google(RuntimeError("503"), cache_negative_ttl=0)
+        translator.max_retries = 2  # stay below the circuit breaker threshold
+        translator.translate("Hello", "en", "es")
+        translator.translate("Hello", "en", "es")
+        assert translator.negative_cache is None
+        assert translator._fetch.call_count == 2 * translator.max_retries
+
+    @pytest.mark.asyncio
+    async def test_async_failure_is_remembered(self, translator):
+        """Contract: The async path shares the negative cache."""
+        translator._fetch_async = AsyncMock(side_effect=RuntimeError("503"))
+        assert await translator.translate_async("Hello", "en", "es") == "Hello"
+        assert await translator.translate_async("Hello", "en", "es") == "Hello"
+        assert translator._fetch_async.await_count == translator.max_retries
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_is_not_remembered(self, translator):
+        """Contract: A local limiter rejection does not block the next call."""
+        translator.guard = ProviderGuard(
+            "google", TokenBucket(rate=0.001, capacity=1), CircuitBreaker(), max_wait=0
+        )
+        translator._fetch_async = AsyncMock(return_value="Hola")
+        translator.guard.limiter.reserve(max_wait=0)  # drain the only token
+
+        assert await translator.translate_async("Hello", "en", "es") == "Hello"
+        assert translator.guard.stats().rate_limited == 1
+        assert not translator._recently_failed(translator.cache_key("Hello", "en", "es"))
+
+        translator.guard.limiter.release()
+        assert await translator.translate_async("Hello", "en", "es") == "Hola"
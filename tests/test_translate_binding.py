@@ -0,0 +1,146 @@
+"""
+Tests for the page-to-Python translation binding.
+
+Contract:
+- translate_binding answers a page batch in item order
+- Items of one batch share the scheduler's upstream batches
+- Skipped, disabled and failed texts come back as None, so the page
+  never caches an original as its translation
+- The injected script uses the binding unless js_transport is "fetch"
+- The page cache is bounded by js_cache_max_entries and expires with
+  cache_ttl
+"""
+
+import json
+from typing import List
+import pytest
+from pydantic import ValidationError
+from src.telegram_multi.batching import BatchScheduler
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.message_interceptor import TRANSLATE_BINDING, MessageInterceptor
+
+
+class RecordingTranslator:
+    """Records batch calls and tags texts with the destination language."""
+
+    def __init__(self):
+        self.calls: List[tuple] = []
+
+    async def batch_translate_async(self, texts, src_lang, dest_lang):
+        self.calls.append((list(texts), src_lang, dest_lang))
+        return [f"{t}@{dest_lang}" for t in texts]
+
+
+def make_interceptor(**overrides):
+    translator = RecordingTranslator()
+    config = TranslationConfig(enabled=True, source_lang="auto", target_lang="ru", **overrides)
+    scheduler = BatchScheduler.from_config(translator, config)
+    return MessageInterceptor(config, translator, scheduler=scheduler), translator
+
+
+class TestTranslateBinding:
+    """Contract tests for MessageInterceptor.translate_binding."""
+
+    @pytest.mark.asyncio
+    async def test_batch_is_answered_in_order(self):
+        """Contract: One page batch becomes one upstream batch."""
+        interceptor, translator = make_interceptor()
+        items = [
+            {"text": "Hello", "sourceLang": "auto", "targetLang": "ru"},
+            {"text": "Good night", "sourceLang": "auto", "targetLang": "ru"},
+        ]
+
+        results = await interceptor.translate_binding(None, items)
+
+        assert results == ["Hello@ru", "Good night@ru"]
+        assert translator.calls == [(["Hello", "Good night"], "auto", "ru")]
+
+    @pytest.mark.asyncio
+    async def test_skipped_texts_are_returned_unchanged(self):
+        """Contract: Emoji-only and same-language texts make no call and answer None."""
+        interceptor, translator = make_interceptor()
+        results = await interceptor.translate_binding(
+            None,
+            [{"text": "👍👍", "targetLang": "ru"}, {"text": "Привет, как дела?", "targetLang": "ru"}],
+        )
+        assert results == [None, None]
+        assert translator.calls == []
+
+    @pytest.mark.asyncio
+    async def test_defaults_and_disabled(self):
+        """Contract: Missing languages use the config; disabled answers None."""
+        interceptor, translator = make_interceptor()
+        assert await interceptor.translate_binding(None, [{"text": "Hello"}]) == ["Hello@ru"]
+
+        disabled = MessageInterceptor(TranslationConfig(enabled=False), translator)
+        assert await disabled.translate_binding(None, [{"text": "Hello"}]) == [None]
+
+    @pytest.mark.asyncio
+    async def test_failed_translation_answers_none(self):
+        """Contract: A provider that returns the original is reported as untranslated."""
+
+        class EchoTranslator:
+            async def batch_translate_async(self, texts, src_lang, dest_lang):
+                return list(texts)
+
+        config = TranslationConfig(enabled=True, source_lang="auto", target_lang="ru")
+        interceptor = MessageInterceptor(
+            config, EchoTranslator(), scheduler=BatchScheduler.from_config(EchoTranslator(), config)
+        )
+        assert await interceptor.translate_binding(None, [{"text": "Hello"}]) == [None]
+
+
+class TestInjectedTransport:
+    """Contract tests for the transport in the injected script."""
+
+    @staticmethod
+    def script_config(interceptor: MessageInterceptor) -> dict:
+        script = interceptor.get_injection_script()
+        start = script.index("const DEFAULT_CONFIG = ") + len("const DEFAULT_CONFIG = ")
+        return json.loads(script[start : script.index(";", start)])
+
+    def test_binding_is_the_default(self):
+        """Contract: The page calls the Python binding by default."""
+        config = self.script_config(MessageInterceptor(TranslationConfig(enabled=True)))
+        assert config["transport"] == "binding"
+        assert config["translateBinding"] == TRANSLATE_BINDING
+
+    def test_fetch_fallback(self):
+        """Contract: js_transport="fetch" keeps direct calls."""
+        config = self.script_config(
+            MessageInterceptor(TranslationConfig(enabled=True, js_transport="fetch"))
+        )
+        assert config["transport"] == "fetch"
+
+    def test_rejects_unknown_transport(self):
+        """Contract: Only binding and fetch are accepted."""
+        with pytest.raises(ValidationError):
+            TranslationConfig(js_transport="websocket")
+
+
+class TestInjectedCache:
+    """Contract tests for the page's persistent translation cache."""
+
+    def test_cache_settings_reach_the_page(self):
+        """Contract: The page cache shares cache_ttl and is bounded."""
+        config = TestInjectedTransport.script_config(
+            MessageInterceptor(
+                TranslationConfig(enabled=True, cache_ttl=600, js_cache_max_entries=50)
+            )
+        )
+        assert config["cacheTtl"] == 600
+        assert config["cacheMaxEntries"] == 50
+
+    def test_cache_is_persisted_to_indexeddb(self):
+        """Contract: Lookups fall back to IndexedDB before the network."""
+        script = MessageInterceptor(TranslationConfig(enabled=True)).get_injection_script()
+        assert "indexedDB.open(CACHE_DB_NAME" in script
+        assert script.index("await cacheGet(cacheKey)") < script.index(
+            "await translateViaBinding(text, targetLang)"
+        )
+
+    def test_untranslated_texts_are_not_cached(self):
+        """Contract: Echoed originals are neither stored nor served from storage."""
+        script = MessageInterceptor(TranslationConfig(enabled=True)).get_injection_script()
+        assert "if (!translated || translated === text) return null;" in script
+        assert "isEcho(key, record.value)" in script
@@ -0,0 +1,115 @@
+"""
+Tests for the shared translation cache.
+
+Contract:
+- TranslationCache bounds entries and bytes with LRU eviction
+- Entries expire lazily after ttl
+- Hit/miss/eviction/expiration counters are tracked
+- Providers store translations through the shared cache
+"""
+
+from unittest.mock import MagicMock
+from src.telegram_multi.cache import TranslationCache
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.translators.google import GoogleTranslator
+
+
+class TestTranslationCache:
+    """Contract tests for TranslationCache."""
+
+    def test_get_set_roundtrip(self):
+        """Contract: Stored values are returned and counted as hits."""
+        cache = TranslationCache()
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+        assert cache.get("missing") is None
+        stats = cache.stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+
+    def test_lru_eviction_by_entry_count(self):
+        """Contract: Least recently used entry is evicted first."""
+        cache = TranslationCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", "3")
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.stats().evictions == 1
+
+    def test_eviction_by_byte_budget(self):
+        """Contract: Byte budget is enforced."""
+        cache = TranslationCache(max_entries=100, max_bytes=10)
+        cache.set("a", "1234")  # 5 bytes
+        cache.set("b", "1234")  # 5 bytes
+        cache.set("c", "1234")  # forces eviction of "a"
+        assert len(cache) == 2
+        assert cache.stats().bytes <= 10
+        assert "a" not in cache
+
+    def test_oversized_value_not_cached(self):
+        """Contract: A value larger than the whole budget is skipped."""
+        cache = TranslationCache(max_bytes=4)
+        cache.set("k", "too large")
+        assert len(cache) == 0
+
+    def test_lazy_ttl_expiry(self, clock):
+        """Contract: Expired entries are dropped on access."""
+        cache = TranslationCache(ttl=10, clock=clock)
+        cache.set("k", "v")
+        clock.now = 9.9
+        assert cache.get("k") == "v"
+        clock.now = 10.0
+        assert cache.get("k") is None
+        stats = cache.stats()
+        assert stats.expirations == 1
+        assert stats.entries == 0
+
+    def test_zero_ttl_never_expires(self, clock):
+        """Contract: ttl <= 0 disables expiry."""
+        cache = TranslationCache(ttl=0, clock=clock)
+        cache.set("k", "v")
+        clock.now = 1e9
+        assert cache.get("k") == "v"
+
+    def test_get_many_omits_misses(self):
+        """Contract: get_many returns only found keys."""
+        cache = TranslationCache()
+        cache.set_many({"a": "1", "b": "2"})
+        assert cache.get_many(["a", "x", "b"]) == {"a": "1", "b": "2"}
+
+
+class TestProviderCacheIntegration:
+    """Providers use the shared cache component."""
+
+    def test_translator_cache_built_from_config(self):
+        """Contract: Cache limits come from TranslationConfig."""
+        config = TranslationConfig(
+            enabled=True, cache_ttl=5, cache_max_entries=3, cache_max_bytes=1000
+        )
+        translator = GoogleTranslator(config)
+        assert isinstance(translator.cache, TranslationCache)
+        assert translator.cache.max_entries == 3
+        assert translator.cache.max_bytes == 1000
+        assert translator.cache.ttl == 5
+
+    def test_cache_keys_are_namespaced_per_provider(self):
+        """Contract: Cache keys carry the provider namespace."""
+        translator = GoogleTranslator(TranslationConfig(enabled=True))
+        key = translator.cache_key("Hello", "en", "es")
+        assert key.startswith("google:en:es:")
+
+    def test_google_translator_bounded_cache(self):
+        """Contract: Provider cache never exceeds max_entries."""
+        config = TranslationConfig(enabled=True, cache_max_entries=2)
+        translator = GoogleTranslator(config)
+        translator._lib = MagicMock()
+        translator._lib.translate.return_value.text = "x"
+
+        for text in ["one", "two", "three", "four"]:
+            translator.translate(text, "en", "es")
+
+        assert len(translator.cache) == 2
+        assert translator.cache.stats().evictions == 2
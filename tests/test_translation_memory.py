@@ -0,0 +1,163 @@
+"""
+Tests for the fuzzy translation memory.
+
+Contract:
+- Near-duplicates at or above the threshold reuse a stored translation
+- Matches report their similarity score
+- Dissimilar and short texts do not match fuzzily
+- Texts differing in numbers or negation never match fuzzily
+- The memory is off unless memory_enabled is set
+- Entries are evicted beyond max_entries and expire after ttl
+- Providers consult the memory before calling upstream
+"""
+
+from unittest.mock import MagicMock, patch
+import pytest
+from src.telegram_multi.config import TranslationConfig
+from src.telegram_multi.translation_memory import TranslationMemory
+from src.telegram_multi.translators.deepl import DeepLTranslator
+from src.telegram_multi.translators.google import GoogleTranslator
+
+QUESTION = "Hello, is this still available?"
+
+
+class TestTranslationMemory:
+    """Contract tests for TranslationMemory."""
+
+    def test_near_duplicate_reuses_translation(self):
+        """Contract: Small variations hit with their score."""
+        memory = TranslationMemory(threshold=0.8)
+        memory.add(QUESTION, "你好，这个还有吗？", "en", "zh")
+
+        match = memory.lookup("hello,  is this STILL available??", "en", "zh")
+        assert match is not None
+        assert match.translation == "你好，这个还有吗？"
+        assert 0.8 <= match.score <= 1.0
+
+    def test_exact_normalized_match_scores_one(self):
+        """Contract: Same text modulo case/whitespace scores 1.0."""
+        memory = TranslationMemory()
+        memory.add(QUESTION, "t", "en", "zh")
+        assert memory.lookup(" hello, IS this still available? ", "en", "zh").score == 1.0
+
+    def test_dissimilar_text_misses(self):
+        """Contract: Below-threshold texts do not match."""
+        memory = TranslationMemory(threshold=0.8)
+        memory.add(QUESTION, "t", "en", "zh")
+        assert memory.lookup("Where do you ship this item from?", "en", "zh") is None
+
+    def test_language_pair_is_part_of_the_key(self):
+        """Contract: Entries never cross language pairs."""
+        memory = TranslationMemory(threshold=0.8)
+        memory.add(QUESTION, "t", "en", "zh")
+        assert memory.lookup(QUESTION + "?", "en", "ru") is None
+
+    def test_short_texts_only_match_exactly(self):
+        """Contract: A changed short message is a different message."""
+        memory = TranslationMemory(threshold=0.5, min_chars=16)
+        memory.add("I have 5 apples", "t", "en", "zh")
+        assert memory.lookup("I have 6 apples", "en", "zh") is None
+
+    def test_eviction_and_removal(self):
+        """Contract: Oldest entries go first; remove() is incremental."""
+        memory = TranslationMemory(max_entries=2)
+        memory.add("first message text here", "1", "en", "zh")
+        memory.add("second message text here", "2", "en", "zh")
+        memory.add("third message text here!", "3", "en", "zh")
+        assert len(memory) == 2
+        assert memory.lookup("first message text here", "en", "zh") is None
+        assert memory.remove("second message text here", "en", "zh")
+        assert len(memory) == 1
+
+    def test_ttl(self, clock):
+        """Contract: Entries expire like cache entries."""
+        memory = TranslationMemory(ttl=10, clock=clock)
+        memory.add(QUESTION, "t", "en", "zh")
+        clock.now = 11
+        assert memory.lookup(QUESTION, "en", "zh") is None
+        assert len(memory) == 0
+
+    def test_stats(self):
+        """Contract: Hit counts and mean score are reported."""
+        memory = TranslationMemory(threshold=0.8)
+        memory.add(QUESTION, "t", "en", "zh")
+        memory.lookup(QUESTION, "en", "zh")
+        memory.lookup("Hello, is this still available??", "en", "zh")
+        memory.lookup("Something else entirely here", "en", "zh")
+        stats = memory.stats()
+        assert stats.lookups == 3
+        assert stats.hits == 2
+        assert stats.exact_hits == 1
+        assert 0.8 < stats.mean_hit_score < 1.0
+
+    @pytest.mark.parametrize(
+        "stored, query, translation",
+        [
+            (
+                "Please transfer 1500 USD to the account today",
+                "Please transfer 9500 USD to the account today",
+                "请今天转账1500美元",
+            ),
+            ("The meeting starts at 10:30 tomorrow", "The meeting starts at 11:30 tomorrow", "10:30"),
+            (
+                "I will definitely not be able to attend",
+                "I will definitely now be able to attend",
+                "我肯定无法参加",
+            ),
+            ("我们这个周末可以在公园门口见面吗，朋友们", "我们这个周末不可以在公园门口见面吗，朋友们", "x"),
+        ],
+    )
+    def test_numbers_and_negation_block_fuzzy_match(self, stored, query, translation):
+        """Contract: Similar texts with a different number or negation miss."""
+        memory = TranslationMemory(threshold=0.75, min_chars=8)
+        memory.add(stored, translation, "en", "zh")
+        assert memory.lookup(query, "en", "zh") is None
+        assert memory.lookup(stored + "!", "en", "zh") is not None
+
+    def test_rejects_bad_threshold(self):
+        """Contract: Threshold must be in (0, 1]."""
+        with pytest.raises(ValueError):
+            TranslationMemory(threshold=0)
+
+
+class TestProviderMemory:
+    """Providers reuse near-duplicate translations."""
+
+    def test_google_skips_upstream_for_near_duplicate(self):
+        """Contract: Second, slightly different text makes no call."""
+        translator = GoogleTranslator(
+            TranslationConfig(enabled=True, memory_enabled=True, memory_threshold=0.8)
+        )
+        translator._lib = MagicMock()
+        translator._lib.translate.return_value = MagicMock(text="你好，这个还有吗？")
+
+        assert translator.translate(QUESTION, "en", "zh") == "你好，这个还有吗？"
+        assert translator.translate(QUESTION + "?", "en", "zh") == "你好，这个还有吗？"
+        assert translator._lib.translate.call_count == 1
+
+    def test_memory_is_off_by_default(self):
+        """Contract: Without memory_enabled every text goes upstream."""
+        translator = GoogleTranslator(TranslationConfig(enabled=True))
+        translator._lib = MagicMock()
+        translator._lib.translate.return_value = MagicMock(text="x")
+        translator.translate(QUESTION, "en", "zh")
+        translator.translate(QUESTION + "?", "en", "zh")
+        assert translator.memory is None
+        assert translator._lib.translate.call_count == 2
+
+    def test_deepl_batch_drops_near_duplicates(self):
+        """Contract: Batch misses found in memory are not requested."""
+        translator = DeepLTranslator(
+            TranslationConfig(enabled=True, memory_enabled=True, memory_threshold=0.8)
+        )
+        translator.api_key = "test-key"
+        translator.memory.add(QUESTION, "还有吗", "en", "de")
+
+        response = MagicMock()
+        response.json.return_value = {"translations": [{"text": "Hallo"}]}
+        with patch.object(translator.http.session(), "post", return_value=response) as post:
+            results = translator.batch_translate([QUESTION + "?", "Hello"], "en", "de")
+
+        assert results == ["还有吗", "Hallo"]
+        assert post.call_count == 1
+        assert post.call_args.kwargs["data"]["text"] == ["Hello"]